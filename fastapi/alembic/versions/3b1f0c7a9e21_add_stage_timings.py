@@ -0,0 +1,31 @@
+"""Add stage timings to generated videos
+
+Revision ID: 3b1f0c7a9e21
+Revises: d6e70af859f8
+Create Date: 2026-10-19 09:12:04.118392
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b1f0c7a9e21"
+down_revision: Union[str, Sequence[str], None] = "d6e70af859f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "generated_videos", sa.Column("stage_timings", sa.JSON(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("generated_videos", "stage_timings")
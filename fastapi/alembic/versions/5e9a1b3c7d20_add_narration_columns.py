@@ -0,0 +1,34 @@
+"""Add narration columns to generated videos
+
+Revision ID: 5e9a1b3c7d20
+Revises: 8c4d2e6f1a07
+Create Date: 2026-10-19 14:41:12.284503
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e9a1b3c7d20"
+down_revision: Union[str, Sequence[str], None] = "8c4d2e6f1a07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "generated_videos",
+        sa.Column("narration", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.add_column("generated_videos", sa.Column("voice", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("generated_videos", "voice")
+    op.drop_column("generated_videos", "narration")
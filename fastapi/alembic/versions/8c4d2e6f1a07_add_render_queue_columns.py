@@ -0,0 +1,55 @@
+"""Add render queue columns to generated videos
+
+Revision ID: 8c4d2e6f1a07
+Revises: 3b1f0c7a9e21
+Create Date: 2026-10-19 10:02:47.530716
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4d2e6f1a07"
+down_revision: Union[str, Sequence[str], None] = "3b1f0c7a9e21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "generated_videos", sa.Column("worker_id", sa.String(), nullable=True)
+    )
+    op.add_column(
+        "generated_videos", sa.Column("lease_expires_at", sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        "generated_videos", sa.Column("heartbeat_at", sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        "generated_videos",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("generated_videos", sa.Column("error", sa.Text(), nullable=True))
+    op.create_index(
+        "ix_generated_videos_status_created_at",
+        "generated_videos",
+        ["status", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_generated_videos_status_created_at", table_name="generated_videos"
+    )
+    op.drop_column("generated_videos", "error")
+    op.drop_column("generated_videos", "attempts")
+    op.drop_column("generated_videos", "heartbeat_at")
+    op.drop_column("generated_videos", "lease_expires_at")
+    op.drop_column("generated_videos", "worker_id")
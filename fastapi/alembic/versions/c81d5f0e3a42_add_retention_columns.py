@@ -0,0 +1,50 @@
+"""Add retention columns to generated videos
+
+Revision ID: c81d5f0e3a42
+Revises: a4f7c2e9b316
+Create Date: 2026-10-19 16:38:45.120774
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c81d5f0e3a42"
+down_revision: Union[str, Sequence[str], None] = "a4f7c2e9b316"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # size_bytes of existing videos is backfilled by the retention sweeper
+    op.add_column(
+        "generated_videos", sa.Column("size_bytes", sa.BigInteger(), nullable=True)
+    )
+    op.add_column(
+        "generated_videos", sa.Column("last_accessed_at", sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        "generated_videos",
+        sa.Column("storage_tier", sa.String(), nullable=False, server_default="hot"),
+    )
+    op.create_index(
+        "ix_generated_videos_user_id_last_accessed_at",
+        "generated_videos",
+        ["user_id", "last_accessed_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_generated_videos_user_id_last_accessed_at", table_name="generated_videos"
+    )
+    op.drop_column("generated_videos", "storage_tier")
+    op.drop_column("generated_videos", "last_accessed_at")
+    op.drop_column("generated_videos", "size_bytes")
@@ -0,0 +1,39 @@
+"""Add learned throughput columns to generated videos
+
+Revision ID: e3a95b1d7c64
+Revises: c81d5f0e3a42
+Create Date: 2026-10-19 18:04:12.538210
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a95b1d7c64"
+down_revision: Union[str, Sequence[str], None] = "c81d5f0e3a42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "generated_videos", sa.Column("render_profile", sa.String(), nullable=True)
+    )
+    op.add_column(
+        "generated_videos", sa.Column("render_fps", sa.Float(), nullable=True)
+    )
+    op.add_column(
+        "generated_videos", sa.Column("peak_rss_bytes", sa.BigInteger(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("generated_videos", "peak_rss_bytes")
+    op.drop_column("generated_videos", "render_fps")
+    op.drop_column("generated_videos", "render_profile")
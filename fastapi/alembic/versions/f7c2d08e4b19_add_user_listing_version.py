@@ -0,0 +1,32 @@
+"""Add listing version to users
+
+Revision ID: f7c2d08e4b19
+Revises: e3a95b1d7c64
+Create Date: 2026-10-19 19:21:48.306915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f7c2d08e4b19"
+down_revision: Union[str, Sequence[str], None] = "e3a95b1d7c64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("listing_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "listing_version")
@@ -4,7 +4,13 @@ from sqlalchemy.orm import Session
 from starlette.requests import Request
 
 from app.dependencies import get_db
-from app.models.schemas import UserCreate, UserResponse, Token, LoginRequest
+from app.models.schemas import (
+    UserCreate,
+    UserResponse,
+    Token,
+    LoginRequest,
+    RefreshRequest,
+)
 from app.services.user_service import UserService
 from app.core.oauth.base import (
     oauth,
@@ -34,7 +40,25 @@ def login(login_request: LoginRequest, db: Session = Depends(get_db)):
     user_service = UserService(db)
     user = user_service.authenticate(login_request.email, login_request.password)
     access_token = user_service.create_auth_token(user)
-    return {"access_token": access_token, "token_type": "bearer"}
+    refresh_token = user_service.create_refresh_token(user)
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(refresh_request: RefreshRequest, db: Session = Depends(get_db)):
+    # Short-lived access tokens are renewed here instead of through /login,
+    # which would cost a bcrypt check each time
+    user_service = UserService(db)
+    access_token = user_service.refresh_auth_token(refresh_request.refresh_token)
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_request.refresh_token,
+    }
 
 
 @router.get("/oauth/google")
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_db
+from app.dependencies import get_read_db
 from app.models.schemas import UserResponse
 from app.models.user import User
 from app.core.security import get_current_active_user
@@ -22,7 +22,7 @@ async def get_current_user_info(
 async def get_user(
     user_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     # Only allow users to view their own profile
     if current_user.id != user_id:
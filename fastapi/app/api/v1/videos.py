@@ -1,52 +1,176 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+    BackgroundTasks,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_db
-from app.models.schemas import VideoGenerationRequest, VideoGenerationResponse
+from app.config import settings
+from app.dependencies import get_db, get_video_service, open_read_session
+from app.models.schemas import (
+    VideoGenerationRequest,
+    VideoGenerationResponse,
+    VideoResponse,
+)
 from app.models.user import User
 from app.models.video import GeneratedVideo
+from app.core.cache.singleflight import SingleFlight
 from app.core.security import get_current_active_user
-from app.core.video_generation.service import VideoGenerationService
+from app.core.video_generation.service import (
+    VideoGenerationService,
+    RENDER_STAGE_SECONDS,
+)
+from app.core.video_generation.renditions import RENDITIONS, RenditionService
+from app.services.estimates import RenderEstimator
+from app.services.idempotency import IdempotencyService
+from app.services.listings import ListingVersionService
+from app.services.render_queue import RenderQueueService
+from app.services.retention import RetentionService
+from app.services.throughput import render_fps, render_profile
 
 
 router = APIRouter(prefix="/videos", tags=["videos"])
 
+listing_versions = SingleFlight("listing_versions")
+video_listings = SingleFlight("video_listings")
+
+# Listing selects plain columns so rows serialize straight to JSON without
+# loading and reflecting ORM instances
+VIDEO_LISTING_COLUMNS = [
+    getattr(GeneratedVideo, name) for name in VideoResponse.model_fields
+]
+
+
+def _replay(
+    http_response: Response, idempotency: IdempotencyService, video: GeneratedVideo
+) -> VideoGenerationResponse:
+    http_response.headers["Idempotent-Replayed"] = "true"
+    return idempotency.replay(video)
+
+
+def _replay_concurrent(
+    http_response: Response,
+    idempotency: IdempotencyService,
+    user_id: int,
+    key: Optional[str],
+    request: VideoGenerationRequest,
+) -> Optional[VideoGenerationResponse]:
+    # A concurrent retry with the same key committed its job first
+    idempotency.db.rollback()
+    existing = idempotency.find(user_id, key, request) if key else None
+    return _replay(http_response, idempotency, existing) if existing else None
+
 
 @router.post("/generate", response_model=VideoGenerationResponse)
 async def generate_video(
     request: VideoGenerationRequest,
     background_tasks: BackgroundTasks,
+    http_response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
+    video_service: VideoGenerationService = Depends(get_video_service),
 ):
-    try:
-        # Initialize video service
-        video_service = VideoGenerationService()
+    video_id = str(uuid.uuid4())
 
-        # Generate video
-        response = video_service.generate_video(request)
-
-        # Save to database
-        video_record = GeneratedVideo(
-            video_id=response.video_id,
-            user_id=current_user.id,
-            prompt=request.prompt,
-            duration=request.duration,
-            resolution=request.resolution,
-            style=request.style,
-            fps=request.fps,
-            video_path=f"generated_videos/{response.video_id}.mp4",
-            status=response.status,
+    # Retries carrying the key of an earlier call get that job's current state
+    idempotency = IdempotencyService(db)
+    if idempotency_key:
+        existing = idempotency.find(current_user.id, idempotency_key, request)
+        if existing is not None:
+            return _replay(http_response, idempotency, existing)
+
+    estimate = RenderEstimator(db).estimate(request)
+
+    if settings.RENDER_QUEUE_ENABLED:
+        # Render workers pick the job up from the database
+        try:
+            job = RenderQueueService(db).enqueue(
+                current_user.id, request, video_id, idempotency_key=idempotency_key
+            )
+        except IntegrityError:
+            replayed = _replay_concurrent(
+                http_response, idempotency, current_user.id, idempotency_key, request
+            )
+            if replayed is None:
+                raise
+            return replayed
+        return VideoGenerationResponse(
+            video_id=job.video_id,
+            status=job.status,
+            message="Video generation queued",
+            created_at=job.created_at,
+            estimate=estimate,
         )
 
-        db.add(video_record)
+    # Record the job first so a failed render is visible as such, and so a
+    # retry arriving mid-render finds it through its idempotency key
+    video_record = GeneratedVideo(
+        video_id=video_id,
+        user_id=current_user.id,
+        prompt=request.prompt,
+        duration=request.duration,
+        resolution=request.resolution,
+        style=request.style,
+        fps=request.fps,
+        narration=request.narration,
+        voice=request.voice,
+        video_path=video_service.storage.video_path(video_id),
+        status="processing",
+    )
+    db.add(video_record)
+    listings = ListingVersionService(db)
+    listings.bump_user(current_user.id)
+    if idempotency_key:
+        idempotency.claim(current_user.id, idempotency_key, request, video_id)
+    try:
         db.commit()
+    except IntegrityError:
+        replayed = _replay_concurrent(
+            http_response, idempotency, current_user.id, idempotency_key, request
+        )
+        if replayed is None:
+            raise
+        return replayed
 
+    try:
+        # Generate video
+        response = video_service.generate_video(request, video_id=video_id)
+
+        video_record.status = response.status
+        video_record.stage_timings = response.stage_timings
+        video_record.render_profile = render_profile()
+        video_record.render_fps = render_fps(request.frames, response.stage_timings)
+        video_record.size_bytes = video_service.storage.size(video_id)
+        video_record.last_accessed_at = datetime.utcnow()
+        listings.bump_user(current_user.id)
+        with RENDER_STAGE_SECONDS.time(stage="db_commit"):
+            db.commit()
+
+        response.estimate = estimate
         return response
 
     except Exception as e:
         db.rollback()
+        db.query(GeneratedVideo).filter(GeneratedVideo.video_id == video_id).update(
+            {"status": "failed", "error": str(e)}
+        )
+        listings.bump_user(current_user.id)
+        db.commit()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Video generation failed: {str(e)}",
@@ -56,32 +180,98 @@ async def generate_video(
 @router.get("/{video_id}")
 async def get_video(
     video_id: str,
+    format: str = Query("mp4", description="mp4, webm, gif or webp"),
     current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    video_service: VideoGenerationService = Depends(get_video_service),
 ):
-    # Check if user has access to this video
-    video_service = VideoGenerationService()
-    video_path = video_service.get_video_path(video_id)
+    rendition = RENDITIONS.get(format)
+    if rendition is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format, expected one of: {', '.join(RENDITIONS)}",
+        )
+
+    # Other users' videos are reported missing rather than forbidden, and
+    # never cost an encode or a retention touch
+    owner_id = (
+        db.query(GeneratedVideo.user_id)
+        .filter(GeneratedVideo.video_id == video_id)
+        .scalar()
+    )
+    db.commit()
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Video not found",
+        )
+
+    try:
+        # Derived formats are encoded from the master on first request
+        video_path = await run_in_threadpool(
+            RenditionService(video_service.storage).path_for, video_id, format
+        )
+    except IOError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Could not encode {format} rendition: {str(e)}",
+        )
 
     if not video_path:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Video not found",
         )
+    # Downloads drive LRU retention
+    RetentionService(db, video_service.storage).touch(video_id)
 
-    # In production, check database for ownership
-    # For now, return the file
     return FileResponse(
         video_path,
-        media_type="video/mp4",
-        filename=f"{video_id}.mp4",
+        media_type=rendition.media_type,
+        filename=f"{video_id}.{rendition.ext}",
     )
 
 
-@router.get("/user/{user_id}")
+# Coalesced reads run on sessions of their own: a flight outlives the
+# request that started it if that client disconnects
+
+
+def _listing_version(request_state, user_id: int) -> int:
+    db = open_read_session(request_state)
+    try:
+        return ListingVersionService(db).version(user_id)
+    finally:
+        db.close()
+
+
+def _list_videos(request_state, user_id: int) -> bytes:
+    db = open_read_session(request_state)
+    try:
+        rows = (
+            db.query(*VIDEO_LISTING_COLUMNS)
+            .filter(GeneratedVideo.user_id == user_id)
+            .all()
+        )
+        db.commit()
+    finally:
+        db.close()
+    return orjson.dumps([row._asdict() for row in rows])
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+@router.get("/user/{user_id}", response_model=List[VideoResponse])
 async def get_user_videos(
     user_id: int,
+    request: Request,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
 ):
     # Only allow users to view their own videos
     if current_user.id != user_id:
@@ -90,5 +280,24 @@ async def get_user_videos(
             detail="Not authorized to view these videos",
         )
 
-    videos = db.query(GeneratedVideo).filter(GeneratedVideo.user_id == user_id).all()
-    return videos
+    # Dashboards poll in bursts: concurrent identical reads share one query
+    version = await listing_versions.do(
+        user_id,
+        lambda: run_in_threadpool(_listing_version, request.state, user_id),
+    )
+    etag = f'W/"{user_id}.{version}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"private, max-age={settings.VIDEO_LISTING_MAX_AGE_SECONDS}, "
+            "must-revalidate"
+        ),
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = await video_listings.do(
+        (user_id, version),
+        lambda: run_in_threadpool(_list_videos, request.state, user_id),
+    )
+    return Response(body, media_type="application/json", headers=headers)
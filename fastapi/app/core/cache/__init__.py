@@ -0,0 +1,53 @@
+import threading
+from typing import Dict, Optional
+
+from app.config import settings
+from app.core.cache.base import CacheBackend, CacheBackendError
+from app.core.cache.local import LocalCache
+from app.core.cache.tiered import Cache
+
+
+_backend: Optional[CacheBackend] = None
+_caches: Dict[str, Cache] = {}
+_lock = threading.Lock()
+
+
+def make_backend(url: Optional[str]) -> Optional[CacheBackend]:
+    """Shared tier for CACHE_URL: "redis://host:port/db", "memory://" or None."""
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        from app.core.cache.memory import MemoryBackend
+
+        return MemoryBackend()
+    from app.core.cache.redis import RedisBackend
+
+    return RedisBackend(url, timeout=settings.CACHE_TIMEOUT_SECONDS)
+
+
+def get_cache(name: str, ttl: float) -> Cache:
+    """The process-wide cache called ``name``, created on first use."""
+    global _backend
+    with _lock:
+        cache = _caches.get(name)
+        if cache is None:
+            if _backend is None:
+                _backend = make_backend(settings.CACHE_URL)
+            cache = _caches[name] = Cache(
+                name,
+                ttl,
+                backend=_backend,
+                l1_ttl=settings.CACHE_L1_TTL_SECONDS,
+                max_entries=settings.CACHE_L1_MAX_ENTRIES,
+                lock_timeout=settings.CACHE_LOCK_SECONDS,
+            )
+        return cache
+
+
+def close_caches() -> None:
+    global _backend
+    with _lock:
+        if _backend is not None:
+            _backend.close()
+        _backend = None
+        _caches.clear()
@@ -0,0 +1,34 @@
+from typing import Callable, Optional
+
+
+class CacheBackendError(Exception):
+    """The shared cache is unreachable or answered with an error."""
+
+
+class CacheBackend:
+    """
+    Shared (L2) cache store with pub/sub, as exposed by Redis. Values are
+    opaque bytes; ``ttl`` is in seconds.
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float, only_if_missing=False) -> bool:
+        """Store ``value``; with ``only_if_missing``, False if the key exists."""
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def publish(self, channel: str, message: bytes) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, channel: str, callback: Callable[[bytes], None]) -> None:
+        """Call ``callback`` with every message published on ``channel``."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
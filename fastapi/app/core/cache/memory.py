@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.cache.base import CacheBackend
+
+
+class MemoryBackend(CacheBackend):
+    """
+    In-process stand-in for Redis: every cache in the process shares it the
+    way replicas share a Redis server, and published messages are delivered
+    synchronously to subscribers.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[bytes, float]] = {}
+        self._subscribers: Dict[str, List[Callable[[bytes], None]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._values[key]
+                return None
+            return entry[0]
+
+    def set(self, key: str, value: bytes, ttl: float, only_if_missing=False) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if only_if_missing:
+                entry = self._values.get(key)
+                if entry is not None and entry[1] > now:
+                    return False
+            self._values[key] = (value, now + ttl)
+            return True
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def publish(self, channel: str, message: bytes) -> None:
+        with self._lock:
+            callbacks = list(self._subscribers.get(channel, ()))
+        for callback in callbacks:
+            callback(message)
+
+    def subscribe(self, channel: str, callback: Callable[[bytes], None]) -> None:
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(callback)
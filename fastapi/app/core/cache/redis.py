@@ -0,0 +1,219 @@
+import logging
+import queue
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from app.core.cache.base import CacheBackend, CacheBackendError
+
+
+logger = logging.getLogger(__name__)
+
+
+def encode_command(*args) -> bytes:
+    """A command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        elif not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def read_reply(reader):
+    line = reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise CacheBackendError("Connection closed by the cache server")
+    prefix, body = line[:1], line[1:-2]
+    if prefix == b"+":
+        return body
+    if prefix == b"-":
+        raise CacheBackendError(body.decode(errors="replace"))
+    if prefix == b":":
+        return int(body)
+    if prefix == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = reader.read(length + 2)
+        if len(data) != length + 2:
+            raise CacheBackendError("Connection closed by the cache server")
+        return data[:-2]
+    if prefix == b"*":
+        count = int(body)
+        if count < 0:
+            return None
+        return [read_reply(reader) for _ in range(count)]
+    raise CacheBackendError(f"Unexpected reply from the cache server: {line!r}")
+
+
+class RedisConnection:
+    """One socket to the server, speaking RESP2."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
+        try:
+            self.sock = socket.create_connection((host, port), timeout=timeout)
+        except OSError as e:
+            raise CacheBackendError(f"Cannot connect to {host}:{port}: {e}")
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        if password:
+            self.execute("AUTH", password)
+        if db:
+            self.execute("SELECT", db)
+
+    def send(self, *args) -> None:
+        try:
+            self.sock.sendall(encode_command(*args))
+        except OSError as e:
+            raise CacheBackendError(str(e))
+
+    def read(self):
+        try:
+            return read_reply(self.reader)
+        except OSError as e:
+            raise CacheBackendError(str(e))
+
+    def execute(self, *args):
+        self.send(*args)
+        return self.read()
+
+    def close(self) -> None:
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.reader.close()
+        self.sock.close()
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis (or any server speaking its protocol) as the shared cache, over a
+    small pool of blocking connections. Subscriptions share one extra
+    connection, read by a daemon thread that reconnects and resubscribes
+    after a disconnect.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, pool_size: int = 16, timeout: float = 1.0):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported cache URL: {url}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[RedisConnection]" = queue.LifoQueue(pool_size)
+        self._subscribers: Dict[str, List[Callable[[bytes], None]]] = {}
+        self._subscriber: Optional[RedisConnection] = None
+        self._subscriber_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self, timeout: Optional[float]) -> RedisConnection:
+        return RedisConnection(self.host, self.port, self.db, self.password, timeout)
+
+    def _execute(self, *args):
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = self._connect(self.timeout)
+        try:
+            reply = connection.execute(*args)
+        except CacheBackendError:
+            # The connection may be mid-reply; never hand it out again
+            connection.close()
+            raise
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+        return reply
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._execute("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: float, only_if_missing=False) -> bool:
+        args = ["SET", key, value, "PX", max(int(ttl * 1000), 1)]
+        if only_if_missing:
+            args.append("NX")
+        return self._execute(*args) is not None
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._execute("DEL", *keys)
+
+    def publish(self, channel: str, message: bytes) -> None:
+        self._execute("PUBLISH", channel, message)
+
+    def subscribe(self, channel: str, callback: Callable[[bytes], None]) -> None:
+        with self._lock:
+            callbacks = self._subscribers.setdefault(channel, [])
+            callbacks.append(callback)
+            if self._subscriber_thread is None:
+                self._subscriber_thread = threading.Thread(
+                    target=self._listen, name="cache-subscriber", daemon=True
+                )
+                self._subscriber_thread.start()
+            elif len(callbacks) == 1 and self._subscriber is not None:
+                try:
+                    self._subscriber.send("SUBSCRIBE", channel)
+                except CacheBackendError:
+                    pass  # the listener resubscribes everything on reconnect
+
+    def _listen(self) -> None:
+        delay = 0.1
+        while not self._closed:
+            connection = None
+            try:
+                connection = self._connect(None)
+                with self._lock:
+                    self._subscriber = connection
+                    channels = list(self._subscribers)
+                connection.send("SUBSCRIBE", *channels)
+                delay = 0.1
+                while not self._closed:
+                    reply = connection.read()
+                    if isinstance(reply, list) and reply[0] == b"message":
+                        self._dispatch(reply[1].decode(), reply[2])
+            except CacheBackendError as e:
+                if self._closed:
+                    return
+                if connection is not None:
+                    connection.close()
+                logger.warning("Cache subscription lost: %s", e)
+                time.sleep(delay)
+                delay = min(delay * 2, 5.0)
+
+    def _dispatch(self, channel: str, message: bytes) -> None:
+        with self._lock:
+            callbacks = list(self._subscribers.get(channel, ()))
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception:
+                logger.exception("Cache invalidation callback failed")
+
+    def close(self) -> None:
+        self._closed = True
+        if self._subscriber is not None:
+            self._subscriber.close()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.core.metrics import registry
+
+
+SINGLEFLIGHT_CALLS_TOTAL = registry.counter(
+    "slopengine_singleflight_calls_total",
+    "Coalesced read calls by name and role (leader ran it, shared awaited it)",
+    ["name", "role"],
+)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls within one event loop: while a call
+    for ``key`` is in flight, callers with the same key await its result
+    instead of running their own. Nothing is kept once the call completes;
+    longer-lived reuse is the Cache's job.
+
+    The call runs as its own task, so a caller that is cancelled (a client
+    that disconnected) does not cancel it for the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = asyncio.ensure_future(call())
+            flight.add_done_callback(lambda _: self._forget(key, flight))
+            SINGLEFLIGHT_CALLS_TOTAL.inc(name=self.name, role="leader")
+        else:
+            SINGLEFLIGHT_CALLS_TOTAL.inc(name=self.name, role="shared")
+        return await asyncio.shield(flight)
+
+    def _forget(self, key: Hashable, flight: asyncio.Future) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,221 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+
+from app.core.cache.base import CacheBackend, CacheBackendError
+from app.core.cache.local import MISSING, LocalCache
+from app.core.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS_TOTAL = registry.counter(
+    "slopengine_cache_requests_total",
+    "Cache lookups by cache and the tier that answered (miss: loaded)",
+    ["cache", "result"],
+)
+CACHE_LOAD_SECONDS = registry.histogram(
+    "slopengine_cache_load_seconds",
+    "Time spent in the loader on a cache miss",
+    ["cache"],
+)
+CACHE_INVALIDATIONS_TOTAL = registry.counter(
+    "slopengine_cache_invalidations_total",
+    "Keys dropped from the local tier, by where the invalidation came from",
+    ["cache", "source"],
+)
+CACHE_BACKEND_ERRORS_TOTAL = registry.counter(
+    "slopengine_cache_backend_errors_total",
+    "Shared cache operations that failed and were skipped",
+    ["operation"],
+)
+
+INVALIDATION_CHANNEL = "slopengine:cache:invalidate"
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = MISSING
+        self.error: Optional[BaseException] = None
+
+
+class Cache:
+    """
+    Two-tier cache for JSON-serializable values: a per-process LRU (L1) in
+    front of an optional shared backend (L2).
+
+    Concurrent misses on one key run the loader once per process; with a
+    backend, a short lease in L2 also makes other processes wait for the
+    first one's result instead of loading the same value. Invalidations are
+    published so every process drops its L1 copy, and L1 entries expire
+    after ``l1_ttl`` in case a message is missed. A failing backend is
+    logged and bypassed, never surfaced to callers.
+
+    ``None`` is never cached, so a loader can return it for "not found".
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        backend: Optional[CacheBackend] = None,
+        l1_ttl: Optional[float] = None,
+        max_entries: int = 10000,
+        lock_timeout: float = 10.0,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend
+        # Without a shared tier there is nobody else to miss an invalidation
+        self.l1_ttl = ttl if backend is None or l1_ttl is None else min(l1_ttl, ttl)
+        self.lock_timeout = lock_timeout
+        self.local = LocalCache(max_entries)
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        if backend is not None:
+            backend.subscribe(INVALIDATION_CHANNEL, self._on_invalidation)
+
+    def _shared_key(self, key: str) -> str:
+        return f"slopengine:{self.name}:{key}"
+
+    def _backend_call(self, operation: str, *args, default=None):
+        try:
+            return getattr(self.backend, operation)(*args)
+        except CacheBackendError as e:
+            CACHE_BACKEND_ERRORS_TOTAL.inc(operation=operation)
+            logger.warning("Cache %s %s failed: %s", self.name, operation, e)
+            return default
+
+    def _get_shared(self, key: str) -> Any:
+        if self.backend is None:
+            return MISSING
+        data = self._backend_call("get", self._shared_key(key))
+        return MISSING if data is None else orjson.loads(data)
+
+    def get(self, key: str) -> Any:
+        """The cached value, or None."""
+        value = self.local.get(key)
+        if value is MISSING:
+            value = self._get_shared(key)
+            if value is not MISSING:
+                self.local.set(key, value, self.l1_ttl)
+        return None if value is MISSING else value
+
+    def peek(self, key: str) -> Any:
+        """The value in this process's tier, or None. Never waits on the backend."""
+        value = self.local.get(key)
+        if value is MISSING:
+            return None
+        CACHE_REQUESTS_TOTAL.inc(cache=self.name, result="l1_hit")
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if value is None:
+            return
+        ttl = ttl or self.ttl
+        self.local.set(key, value, min(self.l1_ttl, ttl))
+        if self.backend is not None:
+            self._backend_call("set", self._shared_key(key), orjson.dumps(value), ttl)
+
+    def invalidate(self, key: str) -> None:
+        """Drop ``key`` here, in the shared tier and in every other process."""
+        self.local.delete(key)
+        CACHE_INVALIDATIONS_TOTAL.inc(cache=self.name, source="local")
+        if self.backend is not None:
+            self._backend_call("delete", self._shared_key(key))
+            self._backend_call(
+                "publish", INVALIDATION_CHANNEL, f"{self.name}\0{key}".encode()
+            )
+
+    def _on_invalidation(self, message: bytes) -> None:
+        name, _, key = message.decode().partition("\0")
+        if name == self.name:
+            self.local.delete(key)
+            CACHE_INVALIDATIONS_TOTAL.inc(cache=self.name, source="remote")
+
+    def get_or_load(
+        self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None
+    ) -> Any:
+        """
+        The cached value, calling ``loader`` on a miss. Blocks while another
+        thread (or, with a backend, another process) loads the same key.
+        """
+        value = self.local.get(key)
+        if value is not MISSING:
+            CACHE_REQUESTS_TOTAL.inc(cache=self.name, result="l1_hit")
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            CACHE_REQUESTS_TOTAL.inc(cache=self.name, result="coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._load(key, loader, ttl)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _load(self, key: str, loader: Callable[[], Any], ttl: Optional[float]) -> Any:
+        value = self._get_shared(key)
+        if value is not MISSING:
+            CACHE_REQUESTS_TOTAL.inc(cache=self.name, result="l2_hit")
+            self.local.set(key, value, self.l1_ttl)
+            return value
+
+        lease = None
+        if self.backend is not None:
+            lease = self._shared_key(key) + ":lease"
+            acquired = self._backend_call(
+                "set", lease, b"1", self.lock_timeout, True, default=True
+            )
+            if not acquired:
+                lease = None
+                value = self._wait_for_shared(key)
+                if value is not MISSING:
+                    CACHE_REQUESTS_TOTAL.inc(cache=self.name, result="l2_hit")
+                    self.local.set(key, value, self.l1_ttl)
+                    return value
+
+        CACHE_REQUESTS_TOTAL.inc(cache=self.name, result="miss")
+        try:
+            with CACHE_LOAD_SECONDS.time(cache=self.name):
+                value = loader()
+            self.set(key, value, ttl)
+        finally:
+            if lease is not None:
+                self._backend_call("delete", lease)
+        return value
+
+    def _wait_for_shared(self, key: str) -> Any:
+        # Another process holds the lease: poll for its result, and load it
+        # ourselves if it does not show up before the lease would expire
+        deadline = time.monotonic() + self.lock_timeout
+        delay = 0.002
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            value = self._get_shared(key)
+            if value is not MISSING:
+                return value
+            if self._backend_call("get", self._shared_key(key) + ":lease") is None:
+                return self._get_shared(key)
+            delay = min(delay * 2, 0.05)
+        return MISSING
@@ -0,0 +1,111 @@
+import gzip
+from typing import Optional
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = ("application/json",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", accepted.get("*", 0)) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+class JSONCompressionMiddleware:
+    """
+    Pure ASGI middleware compressing JSON responses only. Media responses
+    (MP4 files are already compressed) and bodies below the minimum size are
+    passed through untouched, as are streamed bodies.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = (
+            settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = choose_encoding(value.decode("latin-1"))
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", ()))
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if (
+                    content_type.split(";")[0].strip() in COMPRESSIBLE_TYPES
+                    and b"content-encoding" not in headers
+                ):
+                    # Hold the start message until the body size is known
+                    start_message = message
+                    return
+                await send(message)
+                return
+
+            if start_message is None:
+                await send(message)
+                return
+
+            held, start_message = start_message, None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(held)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            headers = [
+                (name, value)
+                for name, value in held.get("headers", ())
+                if name not in (b"content-length", b"vary")
+            ]
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**held, "headers": headers})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
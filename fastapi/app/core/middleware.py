@@ -0,0 +1,107 @@
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from app.config import settings
+from app.core.metrics import registry
+from app.database.query_stats import QueryStats, current_query_stats
+
+
+logger = logging.getLogger(__name__)
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "slopengine_http_request_seconds",
+    "HTTP request latency by route",
+    ["method", "route"],
+)
+HTTP_REQUESTS_TOTAL = registry.counter(
+    "slopengine_http_requests_total",
+    "HTTP requests by route and status code",
+    ["method", "route", "status"],
+)
+
+
+class RequestTimingMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, attaching an
+    ``X-Request-ID`` header and logging slow requests with their DB usage.
+    """
+
+    def __init__(self, app, slow_request_ms: Optional[float] = None):
+        self.app = app
+        self.slow_request_ms = (
+            settings.SLOW_REQUEST_MS if slow_request_ms is None else slow_request_ms
+        )
+        self._route_paths: Optional[Dict] = None
+
+    def _route_path(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "<unmatched>"
+        if self._route_paths is None:
+            self._route_paths = {
+                getattr(r, "endpoint", None): r.path for r in scope["app"].routes
+            }
+        return self._route_paths.get(endpoint, "<unmatched>")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+        request_id_header = (b"x-request-id", request_id.encode("latin-1"))
+
+        stats = QueryStats()
+        stats_token = current_query_stats.set(stats)
+        request_id_token = request_id_var.set(request_id)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", ())) + [
+                    request_id_header
+                ]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_query_stats.reset(stats_token)
+            request_id_var.reset(request_id_token)
+
+            method = scope["method"]
+            route = self._route_path(scope)
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=method, route=route)
+            HTTP_REQUESTS_TOTAL.inc(method=method, route=route, status=status_code)
+
+            if elapsed * 1000 >= self.slow_request_ms:
+                logger.warning(
+                    "Slow request %s %s (%s) status=%s duration=%.1fms "
+                    "db_queries=%d db_time=%.1fms request_id=%s",
+                    method,
+                    scope["path"],
+                    route,
+                    status_code,
+                    elapsed * 1000,
+                    stats.count,
+                    stats.total_seconds * 1000,
+                    request_id,
+                )
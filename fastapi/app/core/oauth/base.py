@@ -1,5 +1,8 @@
+import asyncio
+import secrets
 from typing import Optional, Dict, Any
-from authlib.integrations.starlette_client import OAuth
+
+import httpx
 from starlette.config import Config
 from sqlalchemy.orm import Session
 
@@ -7,10 +10,26 @@ from app.config import settings
 from app.models.user import User
 from app.models.schemas import OAuthUserInfo
 from app.core.security import get_password_hash, create_access_token
+from app.core.oauth.client import CachingOAuth, SharedAsyncTransport
+from app.services.user_service import UserService
 
 
 config = Config(".env")
-oauth = OAuth(config)
+oauth = CachingOAuth(config)
+
+# Every outbound provider call (discovery, JWKS, token exchange, profile)
+# goes through one keep-alive connection pool
+oauth_transport = SharedAsyncTransport(
+    limits=httpx.Limits(max_connections=settings.OAUTH_HTTP_MAX_CONNECTIONS)
+)
+
+
+def _client_kwargs(scope: str) -> Dict[str, Any]:
+    return {
+        "scope": scope,
+        "transport": oauth_transport,
+        "timeout": settings.OAUTH_HTTP_TIMEOUT_SECONDS,
+    }
 
 
 def register_oauth_providers():
@@ -19,8 +38,8 @@ def register_oauth_providers():
             name="google",
             client_id=settings.GOOGLE_CLIENT_ID,
             client_secret=settings.GOOGLE_CLIENT_SECRET,
-            server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-            client_kwargs={"scope": "openid email profile"},
+            server_metadata_url=settings.GOOGLE_METADATA_URL,
+            client_kwargs=_client_kwargs("openid email profile"),
         )
 
     if settings.GITHUB_CLIENT_ID and settings.GITHUB_CLIENT_SECRET:
@@ -28,15 +47,19 @@ def register_oauth_providers():
             name="github",
             client_id=settings.GITHUB_CLIENT_ID,
             client_secret=settings.GITHUB_CLIENT_SECRET,
-            access_token_url="https://github.com/login/oauth/access_token",
-            authorize_url="https://github.com/login/oauth/authorize",
-            api_base_url="https://api.github.com/",
-            client_kwargs={"scope": "user:email"},
+            access_token_url=settings.GITHUB_ACCESS_TOKEN_URL,
+            authorize_url=settings.GITHUB_AUTHORIZE_URL,
+            api_base_url=settings.GITHUB_API_BASE_URL,
+            client_kwargs=_client_kwargs("user:email"),
         )
 
 
 async def get_google_user_info(token: Dict[str, Any]) -> OAuthUserInfo:
-    user_info = await oauth.google.userinfo(token=token)
+    # authorize_access_token already verified the ID token and put its claims
+    # in token["userinfo"]; only call the userinfo endpoint without them
+    user_info = token.get("userinfo")
+    if not user_info or not user_info.get("email"):
+        user_info = await oauth.google.userinfo(token=token)
     return OAuthUserInfo(
         email=user_info.get("email"),
         name=user_info.get("name"),
@@ -46,20 +69,23 @@ async def get_google_user_info(token: Dict[str, Any]) -> OAuthUserInfo:
 
 
 async def get_github_user_info(token: Dict[str, Any]) -> OAuthUserInfo:
-    async with oauth.github.get("user", token=token) as resp:
-        user_info = await resp.json()
-
-    # Get email from GitHub
-    async with oauth.github.get("user/emails", token=token) as resp:
-        emails = await resp.json()
-        primary_email = next(
-            (
-                email["email"]
-                for email in emails
-                if email.get("primary") and email.get("verified")
-            ),
-            None,
-        )
+    # Profile and emails are independent, fetch them concurrently
+    user_resp, emails_resp = await asyncio.gather(
+        oauth.github.get("user", token=token),
+        oauth.github.get("user/emails", token=token),
+    )
+    user_resp.raise_for_status()
+    user_info = user_resp.json()
+
+    emails = emails_resp.json() if emails_resp.is_success else []
+    primary_email = next(
+        (
+            email["email"]
+            for email in emails
+            if email.get("primary") and email.get("verified")
+        ),
+        None,
+    )
 
     return OAuthUserInfo(
         email=primary_email or user_info.get("email"),
@@ -70,18 +96,18 @@ async def get_github_user_info(token: Dict[str, Any]) -> OAuthUserInfo:
 
 
 def get_or_create_user_from_oauth(db: Session, oauth_user: OAuthUserInfo) -> User:
+    # Returning users are the common case: a single SELECT
     user = db.query(User).filter(User.email == oauth_user.email).first()
+    if user is not None:
+        return user
 
-    if not user:
-        # Create new user with random password for OAuth users
-        user = User(
-            email=oauth_user.email,
-            password_hash=get_password_hash("oauth_user_temp_password"),
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-
+    # First login: OAuth accounts get an unguessable password. The insert is
+    # a no-op if a concurrent callback created the account first.
+    user = UserService(db).insert_user(
+        oauth_user.email, get_password_hash(secrets.token_urlsafe(32))
+    )
+    if user is None:
+        user = db.query(User).filter(User.email == oauth_user.email).one()
     return user
 
 
@@ -0,0 +1,90 @@
+import asyncio
+import time
+import weakref
+
+import httpx
+from authlib.integrations.starlette_client import OAuth, StarletteOAuth2App
+
+from app.config import settings
+
+
+class SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    Connection pool shared by every HTTP client authlib builds. authlib opens
+    (and closes) a new client for each outbound call; routing them all through
+    this transport keeps TCP/TLS connections to the providers alive between
+    callbacks. The pool is per event loop, since connections are bound to the
+    loop that opened them, and closing a client leaves it open.
+    """
+
+    def __init__(self, **transport_kwargs):
+        self._transport_kwargs = transport_kwargs
+        self._pools: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def _pool(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = self._pools[loop] = httpx.AsyncHTTPTransport(
+                **self._transport_kwargs
+            )
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # Owned by the application, see close()
+        pass
+
+    async def close(self) -> None:
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
+
+
+class CachingOAuth2App(StarletteOAuth2App):
+    """
+    authlib keeps discovery metadata and the JWKS for the life of the process.
+    Refresh them after OAUTH_METADATA_TTL_SECONDS / OAUTH_JWKS_TTL_SECONDS so
+    key rotations are picked up, and let a single coroutine do the refetch.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metadata_lock = asyncio.Lock()
+        self._jwks_lock = asyncio.Lock()
+        self._jwks_loaded_at = 0.0
+
+    def _metadata_fresh(self) -> bool:
+        loaded_at = self.server_metadata.get("_loaded_at")
+        return (
+            loaded_at is not None
+            and time.time() - loaded_at < settings.OAUTH_METADATA_TTL_SECONDS
+        )
+
+    async def load_server_metadata(self):
+        if not self._server_metadata_url or self._metadata_fresh():
+            return self.server_metadata
+        async with self._metadata_lock:
+            if not self._metadata_fresh():
+                self.server_metadata.pop("_loaded_at", None)
+                await super().load_server_metadata()
+        return self.server_metadata
+
+    async def fetch_jwk_set(self, force=False):
+        expired = time.time() - self._jwks_loaded_at >= settings.OAUTH_JWKS_TTL_SECONDS
+        if not force and not expired and self.server_metadata.get("jwks"):
+            return self.server_metadata["jwks"]
+        loaded_at = self._jwks_loaded_at
+        async with self._jwks_lock:
+            # Another coroutine refreshed it while we waited
+            if self._jwks_loaded_at != loaded_at:
+                return self.server_metadata["jwks"]
+            jwk_set = await super().fetch_jwk_set(force=True)
+            self._jwks_loaded_at = time.time()
+        return jwk_set
+
+
+class CachingOAuth(OAuth):
+    oauth2_client_cls = CachingOAuth2App
@@ -0,0 +1,93 @@
+"""
+Opt-in sampling profiler that writes collapsed stacks (``a;b;c <count>``)
+consumable by flamegraph.pl, speedscope or inferno.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler:
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                )
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def write_collapsed(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile_if_slow(
+    name: str,
+    threshold: Optional[float] = None,
+    output_dir: Optional[str] = None,
+) -> Iterator[None]:
+    """
+    Sample the current thread while the block runs and dump the stacks only
+    if it took longer than ``threshold`` seconds. Disabled when no threshold
+    is configured.
+    """
+    if threshold is None:
+        threshold = settings.PROFILE_SLOW_JOBS_SECONDS
+    if threshold is None:
+        yield
+        return
+
+    profiler = SamplingProfiler(interval=settings.PROFILE_SAMPLE_INTERVAL)
+    profiler.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        elapsed = time.perf_counter() - start
+        if elapsed >= threshold:
+            path = os.path.join(
+                output_dir or settings.PROFILE_OUTPUT_DIR, f"{name}.folded"
+            )
+            profiler.write_collapsed(path)
+            logger.warning(
+                "Slow job %s took %.2fs, profile written to %s", name, elapsed, path
+            )
@@ -1,19 +1,25 @@
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
 import bcrypt
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, Request, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.dependencies import get_db
+from app.core.cache import get_cache
+from app.core.cache.singleflight import SingleFlight
+from app.dependencies import open_read_session
 from app.models.user import User
 from app.models.schemas import TokenData
+from app.core.tokens import TokenError, create_token, decode_token
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+user_lookups = SingleFlight("users")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # bcrypt has a 72 byte limit, truncate if necessary
@@ -30,24 +36,24 @@ def get_password_hash(password: str) -> str:
     if len(password.encode("utf-8")) > 72:
         password = password[:72]
     # Generate salt and hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed.decode("utf-8")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+    if not expires_delta:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return create_token(data, "access", expires_delta)
+
+
+def create_refresh_token(data: dict) -> str:
+    # jti keeps refresh tokens issued within the same second distinct
+    return create_token(
+        {**data, "jti": uuid.uuid4().hex},
+        "refresh",
+        timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
     )
-    return encoded_jwt
 
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
@@ -59,8 +65,32 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     return user
 
 
+def _load_user(request_state, email: str) -> Optional[dict]:
+    # Only the public columns are cached, never the password hash. Accounts
+    # are not renamed or deleted through the API; one removed by hand stays
+    # usable until CACHE_USER_TTL_SECONDS runs out.
+    db = open_read_session(request_state)
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if user is None and db.on_replica:
+            # A replica may not have the account yet (sign-up from another
+            # process)
+            db.use_primary()
+            user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            return None
+        return {
+            "id": user.id,
+            "email": user.email,
+            "created_at": user.created_at.isoformat(),
+        }
+    finally:
+        db.close()
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    request: Request,
+    token: str = Depends(oauth2_scheme),
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,20 +98,37 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
         token_data = TokenData(email=email)
-    except JWTError:
+    except TokenError:
         raise credentials_exception
-
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
+    # Routes this request's reads and attributes its writes to the user
+    request.state.subject = token_data.email
+
+    users = get_cache("users", settings.CACHE_USER_TTL_SECONDS)
+    cached = users.peek(token_data.email)
+    if cached is None:
+        # Off the event loop, and once for a burst of requests by one user;
+        # the lookup has its own session as it outlives a cancelled leader
+        cached = await user_lookups.do(
+            token_data.email,
+            lambda: run_in_threadpool(
+                users.get_or_load,
+                token_data.email,
+                lambda: _load_user(request.state, token_data.email),
+            ),
+        )
+    if cached is None:
         raise credentials_exception
-    return user
+    # Detached copy: endpoints only read the public columns
+    return User(
+        id=cached["id"],
+        email=cached["email"],
+        created_at=datetime.fromisoformat(cached["created_at"]),
+    )
 
 
 async def get_current_active_user(
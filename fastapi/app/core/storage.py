@@ -0,0 +1,86 @@
+import os
+import shutil
+from typing import Optional
+
+from app.config import settings
+
+
+class LocalStorage:
+    """
+    Filesystem storage for rendered videos and in-progress render checkpoints.
+    In production this would be backed by S3 or similar.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, cold_dir: Optional[str] = None):
+        self.base_dir = base_dir or settings.VIDEO_STORAGE_DIR
+        # Videos nobody watched for a while are re-encoded into the cold tier,
+        # which can be mounted on cheaper disks
+        self.cold_dir = (
+            cold_dir
+            or settings.VIDEO_COLD_STORAGE_DIR
+            or os.path.join(self.base_dir, "cold")
+        )
+
+    def video_path(self, video_id: str, ext: str = "mp4", tier: str = "hot") -> str:
+        base = self.cold_dir if tier == "cold" else self.base_dir
+        return os.path.join(base, f"{video_id}.{ext}")
+
+    def find_video(self, video_id: str, ext: str = "mp4") -> Optional[str]:
+        for tier in ("hot", "cold"):
+            path = self.video_path(video_id, ext, tier)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def size(self, video_id: str, ext: str = "mp4") -> Optional[int]:
+        path = self.find_video(video_id, ext)
+        try:
+            return os.path.getsize(path) if path else None
+        except FileNotFoundError:
+            return None
+
+    def rendition_path(self, video_id: str, ext: str) -> str:
+        return os.path.join(self.base_dir, "renditions", f"{video_id}.{ext}")
+
+    def checkpoint_root(self) -> str:
+        return os.path.join(self.base_dir, ".checkpoints")
+
+    def checkpoint_dir(self, video_id: str) -> str:
+        return os.path.join(self.checkpoint_root(), video_id)
+
+    def tts_cache_dir(self) -> str:
+        return os.path.join(self.base_dir, ".tts-cache")
+
+    def exists(self, video_id: str, ext: str = "mp4") -> bool:
+        return self.find_video(video_id, ext) is not None
+
+    def save_video(self, video_id: str, source_path: str, ext: str = "mp4") -> str:
+        destination = self.video_path(video_id, ext)
+        os.makedirs(self.base_dir, exist_ok=True)
+        # Move next to the destination first so the final rename is atomic
+        partial = f"{destination}.partial"
+        shutil.move(source_path, partial)
+        os.replace(partial, destination)
+        return destination
+
+    def delete_video(self, video_id: str, ext: str = "mp4") -> None:
+        for tier in ("hot", "cold"):
+            try:
+                os.remove(self.video_path(video_id, ext, tier))
+            except FileNotFoundError:
+                pass
+        self.delete_renditions(video_id)
+
+    def delete_renditions(self, video_id: str) -> None:
+        """Remove the derived renditions of a video and their encode locks."""
+        directory = os.path.join(self.base_dir, "renditions")
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.startswith(f"{video_id}."):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,209 @@
+import base64
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+from app.config import settings
+
+
+ALGORITHMS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+class TokenError(ValueError):
+    """Malformed, badly signed, expired or wrong-type token."""
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+@lru_cache(maxsize=64)
+def _parse_header(segment: bytes) -> Tuple[Optional[str], Optional[str]]:
+    # Only a handful of distinct headers exist (one per kid), parse each once
+    header = orjson.loads(_b64decode(segment))
+    if not isinstance(header, dict):
+        raise TokenError("Malformed token header")
+    algorithm, kid = header.get("alg"), header.get("kid")
+    if not isinstance(algorithm, (str, type(None))) or not isinstance(
+        kid, (str, type(None))
+    ):
+        raise TokenError("Malformed token header")
+    return algorithm, kid
+
+
+class Keyring:
+    """
+    HMAC keys by ``kid``. Tokens are signed with the active key and verified
+    with whichever key their header names, so a new key can be rolled out
+    while tokens signed with the previous one stay valid. Tokens without a
+    ``kid`` (issued before key rotation existed) use ``legacy_key``, and
+    are rejected without one.
+
+    The HMAC key schedule is computed once per key; signing and verifying
+    copy the prepared object instead of re-deriving it.
+    """
+
+    def __init__(
+        self,
+        keys: Dict[str, str],
+        active_kid: str,
+        algorithm: str = "HS256",
+        legacy_key: Optional[str] = None,
+    ):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+        if active_kid not in keys:
+            raise ValueError(f"Active JWT key {active_kid!r} is not in the keyring")
+        digest = ALGORITHMS[algorithm]
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self._macs = {
+            kid: hmac.new(secret.encode(), digestmod=digest)
+            for kid, secret in keys.items()
+        }
+        self._legacy_mac = (
+            hmac.new(legacy_key.encode(), digestmod=digest) if legacy_key else None
+        )
+        self._header = _b64encode(
+            orjson.dumps({"alg": algorithm, "typ": "JWT", "kid": active_kid})
+        )
+
+    @classmethod
+    def from_settings(cls) -> "Keyring":
+        keys = settings.JWT_KEYS or {"default": settings.SECRET_KEY}
+        return cls(
+            keys,
+            settings.JWT_ACTIVE_KID or next(iter(keys)),
+            settings.ALGORITHM,
+            legacy_key=(
+                settings.SECRET_KEY if settings.JWT_ACCEPT_LEGACY_TOKENS else None
+            ),
+        )
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        signing_input = self._header + b"." + _b64encode(orjson.dumps(claims))
+        mac = self._macs[self.active_kid].copy()
+        mac.update(signing_input)
+        return (signing_input + b"." + _b64encode(mac.digest())).decode()
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Check signature and expiry and return the claims."""
+        try:
+            signing_input, _, signature = token.encode("ascii").rpartition(b".")
+            header, _, payload = signing_input.partition(b".")
+            algorithm, kid = _parse_header(header)
+            signature = _b64decode(signature)
+        except ValueError:
+            raise TokenError("Malformed token")
+        if algorithm != self.algorithm:
+            raise TokenError("Unexpected token algorithm")
+
+        base = self._macs.get(kid) if kid is not None else self._legacy_mac
+        if base is None:
+            raise TokenError("Unknown signing key")
+        mac = base.copy()
+        mac.update(signing_input)
+        if not hmac.compare_digest(mac.digest(), signature):
+            raise TokenError("Invalid token signature")
+
+        try:
+            claims = orjson.loads(_b64decode(payload))
+        except ValueError:
+            raise TokenError("Malformed token payload")
+        if not isinstance(claims, dict):
+            raise TokenError("Malformed token payload")
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            raise TokenError("Token expired")
+        return claims
+
+
+class ClaimsCache:
+    """
+    Bounded LRU of verified claims, keyed by a digest of the token so raw
+    bearer tokens are not kept in memory. Entries die with the token's
+    ``exp``.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, key: bytes, claims: Dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_keyring: Optional[Keyring] = None
+_claims_cache = ClaimsCache(settings.JWT_CLAIMS_CACHE_SIZE)
+
+
+def get_keyring() -> Keyring:
+    global _keyring
+    if _keyring is None:
+        _keyring = Keyring.from_settings()
+    return _keyring
+
+
+def create_token(
+    claims: Dict[str, Any], token_type: str, expires_delta: timedelta
+) -> str:
+    to_encode = dict(claims)
+    to_encode["type"] = token_type
+    to_encode["exp"] = int(time.time() + expires_delta.total_seconds())
+    return get_keyring().sign(to_encode)
+
+
+def decode_token(token: str, token_type: str = "access") -> Dict[str, Any]:
+    """
+    Claims of a valid token of ``token_type``. Tokens issued before refresh
+    tokens existed carry no type and count as access tokens.
+    """
+    key = ClaimsCache.key(token)
+    claims = _claims_cache.get(key)
+    if claims is None:
+        claims = get_keyring().verify(token)
+        _claims_cache.put(key, claims)
+    if claims.get("type", "access") != token_type:
+        raise TokenError("Wrong token type")
+    return claims
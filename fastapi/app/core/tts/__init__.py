@@ -0,0 +1,16 @@
+from app.config import settings
+from app.core.tts.base import TTSClient, TTSError
+from app.core.tts.cache import TTSCache
+
+
+def get_tts_client() -> TTSClient:
+    """Client for the configured TTS_PROVIDER ("elevenlabs" or "fake")."""
+    if settings.TTS_PROVIDER == "fake":
+        from app.core.tts.fake import FakeTTSClient
+
+        return FakeTTSClient()
+    if settings.TTS_PROVIDER == "elevenlabs":
+        from app.core.tts.elevenlabs import ElevenLabsClient
+
+        return ElevenLabsClient()
+    raise ValueError(f"Unknown TTS_PROVIDER: {settings.TTS_PROVIDER}")
@@ -0,0 +1,20 @@
+class TTSError(Exception):
+    """Speech synthesis failed (provider error, timeout, bad response)."""
+
+
+class TTSClient:
+    """
+    Text-to-speech provider. ``synthesize`` returns encoded audio in the
+    client's ``extension`` format.
+    """
+
+    name = "base"
+    extension = "mp3"
+
+    @property
+    def cache_namespace(self) -> str:
+        """Anything besides (text, voice) that changes the audio produced."""
+        return self.name
+
+    def synthesize(self, text: str, voice: str) -> bytes:
+        raise NotImplementedError
@@ -0,0 +1,66 @@
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+from app.core.metrics import registry
+from app.core.tts.base import TTSClient
+
+
+TTS_CACHE_TOTAL = registry.counter(
+    "slopengine_tts_cache_total",
+    "Narration lookups by cache result",
+    ["result"],
+)
+TTS_SYNTHESIS_SECONDS = registry.histogram(
+    "slopengine_tts_synthesis_seconds",
+    "Time spent waiting on the TTS provider per cache miss",
+    ["provider"],
+)
+
+
+class TTSCache:
+    """
+    Synthesised audio on disk, keyed by provider, voice and text. Files are
+    written to a temp name and renamed so concurrent renders of the same
+    narration never see a partial file.
+    """
+
+    def __init__(self, client: TTSClient, directory: str):
+        self.client = client
+        self.directory = directory
+
+    def path_for(self, text: str, voice: str) -> str:
+        key = "\0".join([self.client.cache_namespace, voice, text])
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(
+            self.directory, digest[:2], f"{digest}.{self.client.extension}"
+        )
+
+    def get(self, text: str, voice: str) -> Optional[str]:
+        path = self.path_for(text, voice)
+        return path if os.path.exists(path) else None
+
+    def audio_for(self, text: str, voice: str) -> str:
+        """Path of the narration audio, synthesising it on a cache miss."""
+        cached = self.get(text, voice)
+        if cached is not None:
+            TTS_CACHE_TOTAL.inc(result="hit")
+            return cached
+
+        TTS_CACHE_TOTAL.inc(result="miss")
+        with TTS_SYNTHESIS_SECONDS.time(provider=self.client.name):
+            audio = self.client.synthesize(text, voice)
+
+        path = self.path_for(text, voice)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, partial = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".partial")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return path
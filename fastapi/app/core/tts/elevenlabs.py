@@ -0,0 +1,47 @@
+from urllib.parse import quote
+
+import httpx
+
+from app.config import settings
+from app.core.tts.base import TTSClient, TTSError
+
+
+class ElevenLabsClient(TTSClient):
+    name = "elevenlabs"
+    extension = "mp3"
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = None,
+        model_id: str = None,
+        timeout: float = None,
+    ):
+        self.api_key = api_key or settings.ELEVENLABS_API_KEY
+        if not self.api_key:
+            raise ValueError("ELEVENLABS_API_KEY is required for narration")
+        self.model_id = model_id or settings.ELEVENLABS_MODEL_ID
+        self.client = httpx.Client(
+            base_url=base_url or settings.ELEVENLABS_BASE_URL,
+            timeout=timeout or settings.TTS_TIMEOUT_SECONDS,
+            headers={"xi-api-key": self.api_key, "Accept": "audio/mpeg"},
+        )
+
+    @property
+    def cache_namespace(self) -> str:
+        return f"{self.name}:{self.model_id}"
+
+    def synthesize(self, text: str, voice: str) -> bytes:
+        try:
+            response = self.client.post(
+                # Never let the voice id add path segments or a query string
+                f"/v1/text-to-speech/{quote(voice, safe='')}",
+                json={"text": text, "model_id": self.model_id},
+            )
+        except httpx.HTTPError as e:
+            raise TTSError(f"ElevenLabs request failed: {e}") from e
+        if response.status_code != 200:
+            raise TTSError(
+                f"ElevenLabs returned {response.status_code}: {response.text[:200]}"
+            )
+        return response.content
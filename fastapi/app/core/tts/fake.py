@@ -0,0 +1,48 @@
+import io
+import time
+import wave
+
+import numpy as np
+
+from app.core.tts.base import TTSClient
+
+
+class FakeTTSClient(TTSClient):
+    """
+    Offline stand-in: a short tone per word instead of speech, with optional
+    artificial latency to mimic a remote provider.
+    """
+
+    name = "fake"
+    extension = "wav"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        seconds_per_word: float = 0.3,
+        sample_rate: int = 22050,
+    ):
+        self.latency = latency
+        self.seconds_per_word = seconds_per_word
+        self.sample_rate = sample_rate
+        self.calls = 0
+
+    def synthesize(self, text: str, voice: str) -> bytes:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        # Pitch depends on the voice so different voices produce different audio
+        frequency = 220 + sum(map(ord, voice)) % 220
+        words = max(len(text.split()), 1)
+        frames = int(words * self.seconds_per_word * self.sample_rate)
+        t = np.arange(frames) / self.sample_rate
+        samples = (8000 * np.sin(2 * np.pi * frequency * t)).astype("<i2")
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(samples.tobytes())
+        return buffer.getvalue()
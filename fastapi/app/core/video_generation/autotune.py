@@ -0,0 +1,285 @@
+"""
+Render worker autoscaling: sizes the pool of worker processes on a node from
+the queue, the CPU load and the memory available, using the peak RSS learned
+from completed jobs so a burst of 1080p renders cannot run the node out of
+memory.
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.core.metrics import registry
+from app.database.session import SessionLocal
+from app.services.render_queue import RenderQueueService
+from app.services.throughput import ThroughputService
+
+
+logger = logging.getLogger(__name__)
+
+WORKER_PROCESSES = registry.gauge(
+    "slopengine_worker_processes",
+    "Render worker processes running on this node",
+)
+WORKER_PROCESSES_TARGET = registry.gauge(
+    "slopengine_worker_processes_target",
+    "Render worker processes the autotuner last decided to run",
+)
+WORKER_AUTOTUNE_DECISIONS_TOTAL = registry.counter(
+    "slopengine_worker_autotune_decisions_total",
+    "Autotuner decisions by the limit that set the target",
+    ["limit"],
+)
+WORKER_JOB_RSS_BYTES = registry.gauge(
+    "slopengine_worker_job_rss_bytes",
+    "Peak RSS budgeted per worker for the largest queued or running job",
+)
+WORKER_MEMORY_AVAILABLE_BYTES = registry.gauge(
+    "slopengine_worker_memory_available_bytes",
+    "MemAvailable of the node at the last autotuner decision",
+)
+
+
+def memory_available() -> Optional[int]:
+    """MemAvailable from /proc/meminfo, or None where it cannot be read."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _rss(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _children() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    try:
+        pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return children
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # The command name may contain spaces; fields resume after ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(pid)
+    return children
+
+
+def process_tree_rss(pid: Optional[int] = None) -> int:
+    """RSS of ``pid`` and its descendants (ffmpeg, the render process)."""
+    children = _children()
+    pending = [pid or os.getpid()]
+    total = 0
+    while pending:
+        current = pending.pop()
+        total += _rss(current)
+        pending.extend(children.get(current, ()))
+    return total
+
+
+class RssSampler:
+    """Records the peak RSS of this process tree while the block runs."""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or settings.WORKER_RSS_SAMPLE_SECONDS
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="rss-sampler", daemon=True
+        )
+
+    def __enter__(self):
+        self.peak = process_tree_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, process_tree_rss())
+
+
+class Headroom(NamedTuple):
+    cpus: int
+    load: float
+    # None where /proc/meminfo is unavailable: memory does not limit
+    available_bytes: Optional[int]
+    # Current RSS of the pool's own workers, reclaimable if they stop
+    workers_rss: int
+
+
+def read_headroom(worker_pids: List[int]) -> Headroom:
+    return Headroom(
+        cpus=os.cpu_count() or 1,
+        load=os.getloadavg()[0],
+        available_bytes=memory_available(),
+        workers_rss=sum(process_tree_rss(pid) for pid in worker_pids),
+    )
+
+
+class Decision(NamedTuple):
+    target: int
+    # Which limit set the target: queue, cpu, memory, max or min
+    limit: str
+
+
+class ConcurrencyTuner:
+    def __init__(
+        self,
+        min_processes: Optional[int] = None,
+        max_processes: Optional[int] = None,
+        max_load_per_cpu: Optional[float] = None,
+        memory_reserve_bytes: Optional[int] = None,
+    ):
+        self.min_processes = min_processes or settings.WORKER_MIN_PROCESSES
+        self.max_processes = (
+            max_processes or settings.WORKER_MAX_PROCESSES or os.cpu_count() or 1
+        )
+        self.max_load_per_cpu = max_load_per_cpu or settings.WORKER_MAX_LOAD_PER_CPU
+        self.memory_reserve_bytes = (
+            settings.WORKER_MEMORY_RESERVE_BYTES
+            if memory_reserve_bytes is None
+            else memory_reserve_bytes
+        )
+
+    def decide(
+        self, running: int, active: int, job_rss: int, headroom: Headroom
+    ) -> Decision:
+        # ``active`` counts jobs in flight plus claimable ones, so the pool
+        # shrinks back once the queue drains and workers sit idle
+        limits = {"max": self.max_processes, "queue": active}
+
+        # A render keeps about one core busy; load counts our workers too
+        spare_cpu = self.max_load_per_cpu * headroom.cpus - headroom.load
+        limits["cpu"] = (
+            running + math.floor(spare_cpu) if spare_cpu >= 0 else running - 1
+        )
+
+        # Every worker may reach job_rss at once: their current RSS comes
+        # back if they stop, the rest must fit in what the node has left
+        if headroom.available_bytes is not None and job_rss > 0:
+            budget = (
+                headroom.available_bytes
+                + headroom.workers_rss
+                - self.memory_reserve_bytes
+            )
+            limits["memory"] = budget // job_rss
+
+        limit = min(limits, key=limits.get)
+        target = limits[limit]
+        if target < self.min_processes:
+            return Decision(self.min_processes, "min")
+        return Decision(target, limit)
+
+
+class WorkerPool:
+    """
+    Runs ``target(worker_id)`` in as many processes as the tuner allows,
+    adjusting every WORKER_AUTOTUNE_INTERVAL_SECONDS. Surplus workers get
+    SIGTERM and drain their current job before exiting.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[str], None],
+        prefix: str,
+        tuner: Optional[ConcurrencyTuner] = None,
+        interval: Optional[float] = None,
+    ):
+        self.target = target
+        self.prefix = prefix
+        self.tuner = tuner or ConcurrencyTuner()
+        self.interval = interval or settings.WORKER_AUTOTUNE_INTERVAL_SECONDS
+        self.processes: List[multiprocessing.Process] = []
+        self.draining: List[multiprocessing.Process] = []
+        self._spawned = 0
+        self._context = multiprocessing.get_context("spawn")
+
+    def _demand(self) -> Tuple[int, int]:
+        db = SessionLocal()
+        try:
+            # Running jobs count too: a 1080p render in flight still needs
+            # its memory after the queue drains
+            active = RenderQueueService(db).active_resolutions()
+            throughput = ThroughputService(db)
+            job_rss = max(
+                (throughput.job_rss(resolution) for resolution in active), default=0
+            )
+            return sum(active.values()), job_rss
+        finally:
+            db.close()
+
+    def adjust(self) -> Decision:
+        self.processes = [p for p in self.processes if p.is_alive()]
+        self.draining = [p for p in self.draining if p.is_alive()]
+        active, job_rss = self._demand()
+        headroom = read_headroom([p.pid for p in self.processes + self.draining])
+        decision = self.tuner.decide(len(self.processes), active, job_rss, headroom)
+
+        while len(self.processes) < decision.target:
+            worker_id = f"{self.prefix}-{self._spawned}"
+            self._spawned += 1
+            process = self._context.Process(target=self.target, args=(worker_id,))
+            process.start()
+            self.processes.append(process)
+        while len(self.processes) > decision.target:
+            # Newest first, so long-lived workers keep their warm caches
+            process = self.processes.pop()
+            process.terminate()
+            self.draining.append(process)
+
+        WORKER_PROCESSES.set(len(self.processes))
+        WORKER_PROCESSES_TARGET.set(decision.target)
+        WORKER_AUTOTUNE_DECISIONS_TOTAL.inc(limit=decision.limit)
+        WORKER_JOB_RSS_BYTES.set(job_rss)
+        if headroom.available_bytes is not None:
+            WORKER_MEMORY_AVAILABLE_BYTES.set(headroom.available_bytes)
+        logger.info(
+            "Autotune: %d worker(s), limited by %s (active=%d, load=%.2f, "
+            "available=%s, job_rss=%d)",
+            decision.target,
+            decision.limit,
+            active,
+            headroom.load,
+            headroom.available_bytes,
+            job_rss,
+        )
+        return decision
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                self.adjust()
+            except Exception:
+                logger.exception("Autotune iteration failed")
+            stop.wait(self.interval)
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        for process in self.processes + self.draining:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes + self.draining:
+            process.join()
+        self.processes, self.draining = [], []
+        WORKER_PROCESSES.set(0)
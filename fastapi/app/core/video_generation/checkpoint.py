@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_OWNER_FILE = "owner"
+
+
+class RenderCheckpoint:
+    """
+    Tracks the encoded segments of one render. A segment file only appears
+    under its final name once it is completely encoded, so a retried job can
+    skip every segment already present and resume from the next one.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.manifest: Dict[str, Any] = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.directory, self.MANIFEST)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, self.MANIFEST)
+        with open(f"{path}.partial", "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(f"{path}.partial", path)
+
+    @property
+    def enhanced_prompt(self) -> Optional[str]:
+        return self.manifest.get("enhanced_prompt")
+
+    def save_enhanced_prompt(self, prompt: str) -> None:
+        # Reused on retry so resumed segments match the ones already encoded
+        self.manifest["enhanced_prompt"] = prompt
+        self._save()
+
+    def start(self, params: Dict[str, Any]) -> None:
+        """Keep existing segments only if they were rendered with ``params``."""
+        if self.manifest.get("params") != params:
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.startswith("seg_"):
+                        os.remove(os.path.join(self.directory, name))
+            self.manifest["params"] = params
+            self._save()
+
+    def segment_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"seg_{index:05d}.mp4")
+
+    def partial_segment_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"seg_{index:05d}.partial.mp4")
+
+    def has_segment(self, index: int) -> bool:
+        return os.path.exists(self.segment_path(index))
+
+    def commit_segment(self, index: int) -> None:
+        os.replace(self.partial_segment_path(index), self.segment_path(index))
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _process_start_time(pid: int) -> Optional[str]:
+    """Start time of ``pid`` in clock ticks since boot, where /proc has it."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces; fields resume after ")"
+            return f.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+
+
+def make_temp_dir() -> str:
+    """Create a scratch directory tagged with its owner process for later GC."""
+    temp_dir = tempfile.mkdtemp(prefix=settings.RENDER_TEMP_PREFIX)
+    pid = os.getpid()
+    owner = f"{socket.gethostname()} {pid}"
+    start_time = _process_start_time(pid)
+    if start_time is not None:
+        owner += f" {start_time}"
+    with open(os.path.join(temp_dir, _OWNER_FILE), "w") as f:
+        f.write(owner)
+    return temp_dir
+
+
+def _owner_alive(temp_dir: str) -> Optional[bool]:
+    """
+    Whether the process that created ``temp_dir`` still runs, or None when
+    that cannot be told and the directory's age decides.
+    """
+    try:
+        with open(os.path.join(temp_dir, _OWNER_FILE)) as f:
+            hostname, pid, *start_time = f.read().split()
+        pid = int(pid)
+    except (OSError, ValueError):
+        return None
+    if hostname != socket.gethostname():
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    # After a container restart the renderer often gets its old pid back;
+    # only the same pid with the same start time is the same process
+    if not start_time:
+        return None
+    current = _process_start_time(pid)
+    if current is None:
+        return None
+    return current == start_time[0]
+
+
+def cleanup_orphaned_temp_dirs(max_age_seconds: Optional[float] = None) -> int:
+    """
+    Remove render scratch directories whose owning process is gone, or that
+    carry no owner and are older than ``max_age_seconds``.
+    """
+    if max_age_seconds is None:
+        max_age_seconds = settings.RENDER_TEMP_MAX_AGE_SECONDS
+    root = tempfile.gettempdir()
+    now = time.time()
+    removed = 0
+    for name in os.listdir(root):
+        if not name.startswith(settings.RENDER_TEMP_PREFIX):
+            continue
+        path = os.path.join(root, name)
+        if not os.path.isdir(path):
+            continue
+        alive = _owner_alive(path)
+        if alive is None:
+            try:
+                alive = now - os.path.getmtime(path) < max_age_seconds
+            except OSError:
+                continue
+        if not alive:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    if removed:
+        logger.info("Removed %d orphaned render temp directories", removed)
+    return removed
@@ -0,0 +1,254 @@
+import os
+import subprocess
+from typing import List, Optional, Sequence
+
+import numpy as np
+from moviepy.config import get_setting
+
+
+# Each skipped run adds a term to the setpts expression; past this many the
+# segment is simply encoded at a constant frame rate
+MAX_VFR_RUNS = 256
+
+
+def ffmpeg_binary() -> str:
+    return get_setting("FFMPEG_BINARY")
+
+
+def vfr_setpts(frame_indices: Sequence[int]) -> Optional[str]:
+    """
+    setpts expression giving the N-th written frame the timestamp of source
+    frame ``frame_indices[N]``, or None when the skips are too fragmented.
+    """
+    terms = []
+    skipped = 0
+    for n, index in enumerate(frame_indices):
+        if index - n > skipped:
+            terms.append(f"if(gte(N\\,{n})\\,{index - n - skipped}\\,0)")
+            skipped = index - n
+    if len(terms) > MAX_VFR_RUNS:
+        return None
+    return "setpts=(N" + "".join(f"+{term}" for term in terms) + ")/(FRAME_RATE*TB)"
+
+
+class FrameEncoder:
+    """
+    Streams raw RGB frames to an ffmpeg process. Unlike moviepy's writer it
+    hands ffmpeg the frame buffer directly instead of a ``tobytes()`` copy.
+
+    ``frame_indices`` switches to variable frame rate output: only those
+    source frames are written, each one held until the next.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        width: int,
+        height: int,
+        fps: float,
+        codec: str = "libx264",
+        preset: str = "medium",
+        ffmpeg_params: Optional[Sequence[str]] = None,
+        frame_indices: Optional[Sequence[int]] = None,
+    ):
+        self.path = path
+        cmd = [
+            ffmpeg_binary(),
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-vcodec",
+            "rawvideo",
+            "-s",
+            f"{width}x{height}",
+            "-pix_fmt",
+            "rgb24",
+            "-r",
+            f"{fps:.02f}",
+            "-an",
+            "-i",
+            "-",
+            "-vcodec",
+            codec,
+            "-preset",
+            preset,
+        ]
+        if codec == "libx264" and width % 2 == 0 and height % 2 == 0:
+            cmd.extend(["-pix_fmt", "yuv420p"])
+        if frame_indices is not None:
+            setpts = vfr_setpts(frame_indices)
+            if setpts is None:
+                raise ValueError("Too many frame runs for variable frame rate output")
+            cmd.extend(["-vf", setpts, "-fps_mode", "passthrough"])
+            # B-frames reorder timestamps; MP4 sample durations come from
+            # decode order, so gaps would land on the wrong frames
+            cmd.extend(["-bf", "0"])
+        if ffmpeg_params:
+            cmd.extend(ffmpeg_params)
+        cmd.append(path)
+
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        self.frames_written = 0
+
+    def write(self, frame: np.ndarray) -> None:
+        self._write(frame, 1)
+
+    def write_batch(self, frames: np.ndarray) -> None:
+        """Write a ``(N, height, width, 3)`` block of frames in one pipe write."""
+        self._write(frames, len(frames))
+
+    def _write(self, pixels: np.ndarray, count: int) -> None:
+        try:
+            self.proc.stdin.write(memoryview(np.ascontiguousarray(pixels)))
+        except (BrokenPipeError, OSError) as e:
+            self.proc.kill()
+            _, stderr = self.proc.communicate()
+            raise IOError(
+                f"ffmpeg failed while writing {self.path}: {stderr.decode(errors='replace')}"
+            ) from e
+        self.frames_written += count
+
+    def close(self) -> None:
+        self.proc.stdin.close()
+        stderr = self.proc.stderr.read()
+        if self.proc.wait() != 0:
+            raise IOError(
+                f"ffmpeg failed to encode {self.path}: {stderr.decode(errors='replace')}"
+            )
+
+    def abort(self) -> None:
+        self.proc.kill()
+        self.proc.wait()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def run_ffmpeg(args: List[str]) -> None:
+    result = subprocess.run(
+        [ffmpeg_binary(), "-y", "-loglevel", "error", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        raise IOError(f"ffmpeg failed: {result.stderr.decode(errors='replace')}")
+
+
+def concat_segments(
+    segment_paths: Sequence[str],
+    output_path: str,
+    durations: Optional[Sequence[float]] = None,
+    audio_path: Optional[str] = None,
+) -> None:
+    """
+    Join encoded segments without re-encoding (ffmpeg concat demuxer).
+    Explicit ``durations`` keep segment boundaries exact for variable frame
+    rate segments, whose probed duration stops at their last timestamp.
+
+    ``audio_path`` is muxed in the same pass: the video stream is still
+    copied, only the audio is encoded to AAC and cut to the video length.
+    """
+    list_path = f"{output_path}.txt"
+    with open(list_path, "w") as f:
+        for i, path in enumerate(segment_paths):
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+            if durations is not None:
+                f.write(f"duration {durations[i]:.6f}\n")
+    try:
+        args = ["-f", "concat", "-safe", "0", "-i", list_path]
+        if audio_path is None:
+            args.extend(["-c", "copy"])
+        else:
+            args.extend(["-i", audio_path, "-map", "0:v", "-map", "1:a"])
+            args.extend(["-c:v", "copy", "-c:a", "aac", "-b:a", "128k"])
+            if durations is not None:
+                args.extend(["-t", f"{sum(durations):.6f}"])
+        args.extend(["-movflags", "+faststart", output_path])
+        run_ffmpeg(args)
+    finally:
+        os.remove(list_path)
+
+
+def transcode(
+    input_path: str,
+    output_path: str,
+    crf: int,
+    preset: str = "slow",
+    audio_bitrate: str = "64k",
+) -> None:
+    """Re-encode a finished video at a lower quality (cold storage tier)."""
+    args = ["-i", input_path, "-map", "0"]
+    args.extend(["-c:v", "libx264", "-crf", str(crf), "-preset", preset])
+    args.extend(["-c:a", "aac", "-b:a", audio_bitrate])
+    args.extend(["-f", "mp4", "-movflags", "+faststart", output_path])
+    run_ffmpeg(args)
+
+
+def _preview_filter(fps: int, width: int) -> str:
+    # Even height keeps every codec happy; lanczos keeps thin text readable
+    return f"fps={fps},scale={width}:-2:flags=lanczos"
+
+
+def encode_webm(
+    input_path: str, output_path: str, codec: str, crf: int, audio_bitrate: str = "48k"
+) -> None:
+    """Low-bitrate WebM (AV1 or VP9, software) with Opus audio."""
+    args = ["-i", input_path, "-map", "0:v", "-map", "0:a?"]
+    args.extend(["-c:v", codec, "-crf", str(crf), "-b:v", "0"])
+    # Fastest presets that still beat the master's size: renditions are
+    # encoded while the first client waits
+    if codec == "libaom-av1":
+        args.extend(["-usage", "realtime", "-cpu-used", "8", "-row-mt", "1"])
+    elif codec == "libvpx-vp9":
+        args.extend(["-deadline", "good", "-cpu-used", "5", "-row-mt", "1"])
+    args.extend(["-c:a", "libopus", "-b:a", audio_bitrate])
+    args.extend(["-f", "webm", output_path])
+    run_ffmpeg(args)
+
+
+def encode_gif(
+    input_path: str, output_path: str, fps: int, width: int, max_seconds: float
+) -> None:
+    """Looping GIF preview with a palette computed from the clip itself."""
+    graph = (
+        f"[0:v]{_preview_filter(fps, width)},split[a][b];"
+        "[a]palettegen=stats_mode=diff[p];"
+        "[b][p]paletteuse=dither=bayer:bayer_scale=3:diff_mode=rectangle"
+    )
+    args = ["-t", str(max_seconds), "-i", input_path, "-filter_complex", graph]
+    args.extend(["-loop", "0", "-f", "gif", output_path])
+    run_ffmpeg(args)
+
+
+def encode_webp(
+    input_path: str,
+    output_path: str,
+    fps: int,
+    width: int,
+    max_seconds: float,
+    quality: int = 60,
+) -> None:
+    """Looping animated WebP preview."""
+    args = ["-t", str(max_seconds), "-i", input_path, "-an"]
+    args.extend(["-vf", _preview_filter(fps, width)])
+    args.extend(["-c:v", "libwebp_anim", "-quality", str(quality), "-loop", "0"])
+    args.extend(["-f", "webp", output_path])
+    run_ffmpeg(args)
@@ -0,0 +1,190 @@
+"""
+In-place frame rendering.
+
+FrameRenderer draws a job's scene straight into a caller-provided
+``(height, width, 3)`` uint8 array, so a render loop can reuse a handful of
+preallocated buffers instead of allocating a PIL image and a NumPy copy per
+frame. The scene (and everything static in it, such as rasterised text) is
+built once per job.
+
+Consecutive frames are compared through the scene's evaluated parameters
+before anything is drawn: identical frames reuse the previous buffer and
+frames where only a few layers moved are redrawn inside their dirty rect.
+
+render_frames draws a block of consecutive frames into one
+``(count, height, width, 3)`` array, evaluating layer parameters as vectors
+over each run of changed frames.
+"""
+
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.core.video_generation.scene import FrameChange, Scene, build_scene
+
+
+def batch_frames(width: int, height: int) -> int:
+    """Frames per render_frames call for this frame size (RENDER_BATCH_BYTES)."""
+    return max(1, settings.RENDER_BATCH_BYTES // (width * height * 3))
+
+
+class FrameBufferPool:
+    """Round-robin pool of preallocated RGB frame buffers."""
+
+    def __init__(self, width: int, height: int, size: int = 2):
+        self.buffers: List[np.ndarray] = [
+            np.empty((height, width, 3), dtype=np.uint8) for _ in range(size)
+        ]
+        self._next = 0
+
+    def take(self) -> np.ndarray:
+        buffer = self.buffers[self._next]
+        self._next = (self._next + 1) % len(self.buffers)
+        return buffer
+
+
+class FrameRenderer:
+    def __init__(
+        self,
+        prompt: str,
+        total_frames: int,
+        width: int,
+        height: int,
+        style: Optional[str] = None,
+        dedup: bool = True,
+        scene: Optional[Scene] = None,
+    ):
+        self.total_frames = total_frames
+        self.width = width
+        self.height = height
+        self.shape = (height, width, 3)
+        self.scene = scene or build_scene(style, prompt, width, height)
+        self.dedup = dedup
+
+        # Last frame handed out by render_range and the buffer holding it
+        self._last_frame: Optional[int] = None
+        self._last_buffer: Optional[np.ndarray] = None
+
+    def render(self, frame_num: int) -> np.ndarray:
+        out = np.empty(self.shape, dtype=np.uint8)
+        self.render_into(out, frame_num)
+        return out
+
+    def render_into(self, out: np.ndarray, frame_num: int) -> np.ndarray:
+        if out.shape != self.shape or out.dtype != np.uint8:
+            raise ValueError(f"Frame buffer must be uint8 with shape {self.shape}")
+        return self.scene.render_into(out, frame_num / self.total_frames)
+
+    def continues(self, start: int) -> bool:
+        """Whether frame ``start - 1`` is the last frame this renderer drew."""
+        return self._last_frame == start - 1 and self._last_buffer is not None
+
+    def changes(self, start: int, count: int) -> List[FrameChange]:
+        """How each frame of ``start .. start + count`` differs from the one before."""
+        if not self.dedup:
+            return [FrameChange("full")] * count
+        first = max(start - 1, 0)
+        progress = np.arange(first, start + count) / self.total_frames
+        changes = self.scene.changes(progress)
+        return changes[1:] if start > 0 else changes
+
+    def render_range(
+        self,
+        start: int,
+        count: int,
+        take: Callable[[], np.ndarray],
+        reuse_buffers: bool = True,
+        changes: Optional[List[FrameChange]] = None,
+    ) -> Iterator[Tuple[int, np.ndarray, FrameChange]]:
+        """
+        Yield ``(frame_num, buffer, change)`` for consecutive frames.
+
+        ``take`` supplies a buffer for frames that need one. With
+        ``reuse_buffers`` unchanged frames yield the previous buffer again and
+        partial changes patch it in place, so the caller must be done with a
+        buffer before asking for the next frame. Without it (e.g. shared
+        memory slots that are still being read) every frame gets a fresh
+        buffer, seeded from the previous one when that is cheaper than
+        drawing it.
+        """
+        if changes is None:
+            changes = self.changes(start, count)
+        for frame_num, change in zip(range(start, start + count), changes):
+            previous = self._last_buffer if self._last_frame == frame_num - 1 else None
+            if previous is None:
+                change = FrameChange("full")
+
+            if change.kind == "full":
+                out = self.render_into(take(), frame_num)
+            else:
+                if reuse_buffers:
+                    out = previous
+                else:
+                    out = take()
+                    np.copyto(out, previous)
+                if change.kind == "partial":
+                    self.scene.render_into(
+                        out, frame_num / self.total_frames, change.box
+                    )
+
+            self._last_frame, self._last_buffer = frame_num, out
+            yield frame_num, out, change
+
+    def render_frames(
+        self,
+        start: int,
+        count: int,
+        out: Optional[np.ndarray] = None,
+        changes: Optional[List[FrameChange]] = None,
+    ) -> np.ndarray:
+        """
+        Render frames ``start .. start + count`` into ``out`` (allocated when
+        not given) as a ``(count, height, width, 3)`` block and return it.
+
+        Each run of fully changed frames is drawn by one batched scene call.
+        Unchanged frames copy their predecessor, and a run of partial changes
+        copies the frame before it and redraws the union of the dirty rects.
+        The first frame continues from the last frame this renderer drew, so
+        as with render_range the caller must leave that frame in place until
+        the next call (it may be the last frame of ``out`` itself).
+        """
+        shape = (count,) + self.shape
+        if out is None:
+            out = np.empty(shape, dtype=np.uint8)
+        elif out.shape != shape or out.dtype != np.uint8:
+            raise ValueError(f"Frame block must be uint8 with shape {shape}")
+        if changes is None:
+            changes = self.changes(start, count)
+        progress = np.arange(start, start + count) / self.total_frames
+        previous = self._last_buffer if self.continues(start) else None
+
+        offset = 0
+        while offset < count:
+            kind = changes[offset].kind
+            if offset == 0 and previous is None:
+                kind = "full"
+            end = offset + 1
+            while end < count and changes[end].kind == kind:
+                end += 1
+
+            if kind == "full":
+                self.scene.render_batch(out[offset:end], progress[offset:end])
+            else:
+                # Seed the run from the frame before it, first frame only so
+                # ``previous`` may alias a frame the run overwrites
+                np.copyto(out[offset], out[offset - 1] if offset else previous)
+                out[offset + 1 : end] = out[offset]
+                if kind == "partial":
+                    boxes = np.array([change.box for change in changes[offset:end]])
+                    box = (
+                        int(boxes[:, 0].min()),
+                        int(boxes[:, 1].min()),
+                        int(boxes[:, 2].max()),
+                        int(boxes[:, 3].max()),
+                    )
+                    self.scene.render_batch(out[offset:end], progress[offset:end], box)
+            offset = end
+
+        self._last_frame, self._last_buffer = start + count - 1, out[count - 1]
+        return out
@@ -0,0 +1,134 @@
+"""
+Zero-copy frame transport between a renderer process and the encoder.
+
+Frames live in a ``multiprocessing.shared_memory`` block split into ``depth``
+preallocated slots. The producer fills slot ``seq % depth`` in place and
+announces it on a small control queue; the consumer reads the slot as a
+NumPy view and releases it back through a semaphore. Only frame numbers
+travel through the queue, never pixel data.
+"""
+
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+from typing import Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+# Control messages besides frame numbers
+END_OF_STREAM = None
+
+
+class FrameRing:
+    def __init__(
+        self,
+        shape: Tuple[int, int, int],
+        depth: int,
+        context=None,
+        _handle: Optional[dict] = None,
+    ):
+        self.shape = tuple(shape)
+        self.depth = depth
+        self.frame_bytes = int(np.prod(self.shape))
+
+        if _handle is None:
+            context = context or multiprocessing.get_context("spawn")
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=self.frame_bytes * depth
+            )
+            self._owner = True
+            self.free_slots = context.Semaphore(depth)
+            self.control = context.Queue()
+        else:
+            self._shm = shared_memory.SharedMemory(name=_handle["name"])
+            self._owner = False
+            self.free_slots = _handle["free_slots"]
+            self.control = _handle["control"]
+
+        self._slots = np.ndarray(
+            (depth,) + self.shape, dtype=np.uint8, buffer=self._shm.buf
+        )
+
+    def handle(self) -> dict:
+        """Picklable description used to attach from another process."""
+        return {
+            "name": self._shm.name,
+            "shape": self.shape,
+            "depth": self.depth,
+            "free_slots": self.free_slots,
+            "control": self.control,
+        }
+
+    @classmethod
+    def attach(cls, handle: dict) -> "FrameRing":
+        return cls(handle["shape"], handle["depth"], _handle=handle)
+
+    def slot(self, seq: int) -> np.ndarray:
+        return self._slots[seq % self.depth]
+
+    # Producer side
+
+    def acquire_slot(self, seq: int) -> np.ndarray:
+        """Block until slot ``seq`` is free and return it for writing."""
+        self.free_slots.acquire()
+        return self.slot(seq)
+
+    def acquire_slots(self, seq: int, count: int) -> np.ndarray:
+        """
+        Block until slots ``seq .. seq + count`` are free and return them as
+        one ``(count, ...)`` view. The run must not wrap past the last slot.
+        """
+        index = seq % self.depth
+        if index + count > self.depth:
+            raise ValueError("Slot run wraps around the end of the ring")
+        for _ in range(count):
+            self.free_slots.acquire()
+        return self._slots[index : index + count]
+
+    def publish(self, frame_num: int) -> None:
+        self.control.put(frame_num)
+
+    def finish(self, error: Optional[str] = None) -> None:
+        self.control.put(error if error is not None else END_OF_STREAM)
+
+    # Consumer side
+
+    def frames(
+        self, is_alive: Optional[Callable[[], bool]] = None
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Yield ``(frame_num, view)`` in production order. The view is only
+        valid until the next iteration, when its slot is handed back.
+        ``is_alive`` lets the consumer notice a producer that died without
+        sending END_OF_STREAM.
+        """
+        seq = 0
+        while True:
+            try:
+                message = self.control.get(timeout=0.5)
+            except queue.Empty:
+                if is_alive is not None and not is_alive():
+                    raise RuntimeError("Frame producer exited unexpectedly")
+                continue
+            if message is END_OF_STREAM:
+                return
+            if isinstance(message, str):
+                raise RuntimeError(f"Frame producer failed: {message}")
+            try:
+                yield message, self.slot(seq)
+            finally:
+                self.free_slots.release()
+            seq += 1
+
+    def close(self) -> None:
+        del self._slots
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,112 @@
+import fcntl
+import os
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+from app.config import settings
+from app.core.metrics import registry
+from app.core.storage import LocalStorage
+from app.core.video_generation.encoder import encode_gif, encode_webm, encode_webp
+
+
+RENDITIONS_TOTAL = registry.counter(
+    "slopengine_renditions_total",
+    "Rendition requests by format and outcome (hit, generated, coalesced)",
+    ["format", "result"],
+)
+RENDITION_SECONDS = registry.histogram(
+    "slopengine_rendition_seconds",
+    "Time spent encoding a derived rendition from the master MP4",
+    ["format"],
+)
+
+
+class Rendition(NamedTuple):
+    ext: str
+    media_type: str
+    encode: Optional[Callable[[str, str], None]]
+
+
+def _webm(source: str, output: str) -> None:
+    encode_webm(
+        source, output, settings.RENDITION_WEBM_CODEC, settings.RENDITION_WEBM_CRF
+    )
+
+
+def _gif(source: str, output: str) -> None:
+    encode_gif(
+        source,
+        output,
+        settings.RENDITION_PREVIEW_FPS,
+        settings.RENDITION_PREVIEW_WIDTH,
+        settings.RENDITION_PREVIEW_MAX_SECONDS,
+    )
+
+
+def _webp(source: str, output: str) -> None:
+    encode_webp(
+        source,
+        output,
+        settings.RENDITION_PREVIEW_FPS,
+        settings.RENDITION_PREVIEW_WIDTH,
+        settings.RENDITION_PREVIEW_MAX_SECONDS,
+    )
+
+
+# "mp4" is the master render itself; the others are derived from it
+RENDITIONS: Dict[str, Rendition] = {
+    "mp4": Rendition("mp4", "video/mp4", None),
+    "webm": Rendition("webm", "video/webm", _webm),
+    "gif": Rendition("gif", "image/gif", _gif),
+    "webp": Rendition("webp", "image/webp", _webp),
+}
+
+
+class RenditionService:
+    """
+    Derived renditions of finished videos, encoded from the master on first
+    request and kept on disk. Concurrent first requests for one rendition,
+    from any thread or process sharing the storage directory, wait on a file
+    lock for a single encode instead of each running ffmpeg.
+    """
+
+    def __init__(self, storage: Optional[LocalStorage] = None):
+        self.storage = storage or LocalStorage()
+
+    def path_for(self, video_id: str, format: str) -> Optional[str]:
+        """Path of ``video_id`` in ``format``, or None if the video is gone."""
+        rendition = RENDITIONS[format]
+        source = self.storage.find_video(video_id)
+        if source is None:
+            return None
+        if rendition.encode is None:
+            return source
+
+        path = self.storage.rendition_path(video_id, rendition.ext)
+        if os.path.exists(path):
+            RENDITIONS_TOTAL.inc(format=format, result="hit")
+            return path
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if os.path.exists(path):
+                    # Encoded by whoever held the lock before us
+                    RENDITIONS_TOTAL.inc(format=format, result="coalesced")
+                    return path
+                partial = f"{path}.partial"
+                start = time.perf_counter()
+                try:
+                    rendition.encode(source, partial)
+                    os.replace(partial, path)
+                finally:
+                    if os.path.exists(partial):
+                        os.remove(partial)
+                RENDITION_SECONDS.observe(time.perf_counter() - start, format=format)
+                RENDITIONS_TOTAL.inc(format=format, result="generated")
+                return path
+            finally:
+                # The lock file stays: unlinking it would let a newcomer lock
+                # a fresh file while a waiter still holds the old one
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
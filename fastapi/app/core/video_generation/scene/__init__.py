@@ -0,0 +1,11 @@
+from app.core.video_generation.scene.graph import FrameChange, Scene
+from app.core.video_generation.scene.keyframes import Keyframes
+from app.core.video_generation.scene.layers import (
+    GradientLayer,
+    ImageLayer,
+    Layer,
+    ShapeLayer,
+    SolidLayer,
+    TextLayer,
+)
+from app.core.video_generation.scene.presets import PRESETS, build_scene
@@ -0,0 +1,116 @@
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.core.video_generation.scene.layers import Layer, Viewport
+
+
+Box = Tuple[int, int, int, int]
+
+
+class FrameChange(NamedTuple):
+    """
+    How a frame differs from the one before it: ``"none"`` (identical),
+    ``"partial"`` (only ``box`` changed) or ``"full"``.
+    """
+
+    kind: str
+    box: Optional[Box] = None
+
+
+# Above this share of the canvas a partial redraw isn't worth the bookkeeping
+PARTIAL_REDRAW_MAX_AREA = 0.5
+
+
+def _union(a: Optional[Box], b: Box) -> Optional[Box]:
+    if b[0] >= b[2] or b[1] >= b[3]:
+        return a
+    if a is None:
+        return b
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+class Scene:
+    """Ordered stack of layers, drawn bottom to top."""
+
+    def __init__(self, width: int, height: int, layers: List[Layer]):
+        self.width = width
+        self.height = height
+        self.shape = (height, width, 3)
+        self.layers = layers
+
+    def render_batch(
+        self, frames: np.ndarray, progress: np.ndarray, box: Optional[Box] = None
+    ) -> np.ndarray:
+        """
+        Draw ``len(progress)`` frames into ``frames`` (N, height, width, 3).
+        With ``box`` only that half-open region is redrawn; pixels outside it
+        are left untouched.
+        """
+        progress = np.asarray(progress, dtype=np.float64)
+        if frames.shape != (len(progress),) + self.shape or frames.dtype != np.uint8:
+            raise ValueError(
+                f"Frame batch must be uint8 with shape {(len(progress),) + self.shape}"
+            )
+        left, top, right, bottom = box or (0, 0, self.width, self.height)
+        viewport = Viewport(left, top, self.width, self.height)
+        region = frames[:, top:bottom, left:right]
+        for layer in self.layers:
+            layer.render(region, progress, viewport)
+        return frames
+
+    def render_into(
+        self, out: np.ndarray, progress: float, box: Optional[Box] = None
+    ) -> np.ndarray:
+        self.render_batch(out[None], np.array([progress]), box)
+        return out
+
+    def changes(self, progress: np.ndarray) -> List[FrameChange]:
+        """
+        Compare each frame with the previous one using the layers' evaluated
+        parameters, without rendering anything. The first entry is always
+        ``"full"``; callers pass the previous frame's progress first when
+        they want it compared too.
+        """
+        progress = np.asarray(progress, dtype=np.float64)
+        footprints = [
+            layer.footprint(progress, self.width, self.height) for layer in self.layers
+        ]
+        # (layers, frames - 1): whether each layer changed since the last frame
+        changed = np.array(
+            [np.any(states[1:] != states[:-1], axis=1) for states, _ in footprints]
+        ).reshape(len(self.layers), max(len(progress) - 1, 0))
+
+        max_area = PARTIAL_REDRAW_MAX_AREA * self.width * self.height
+        result = [FrameChange("full")]
+        for i in range(1, len(progress)):
+            dirty: Optional[Box] = None
+            full = False
+            for layer_index in np.flatnonzero(changed[:, i - 1]):
+                _, boxes = footprints[layer_index]
+                if boxes is None:
+                    full = True
+                    break
+                dirty = _union(dirty, tuple(boxes[i - 1]))
+                dirty = _union(dirty, tuple(boxes[i]))
+
+            if full:
+                result.append(FrameChange("full"))
+                continue
+            if dirty is None:
+                result.append(FrameChange("none"))
+                continue
+            box = (
+                max(int(dirty[0]), 0),
+                max(int(dirty[1]), 0),
+                min(int(dirty[2]), self.width),
+                min(int(dirty[3]), self.height),
+            )
+            if box[0] >= box[2] or box[1] >= box[3]:
+                # Changes entirely off-canvas
+                result.append(FrameChange("none"))
+            elif (box[2] - box[0]) * (box[3] - box[1]) > max_area:
+                result.append(FrameChange("full"))
+            else:
+                result.append(FrameChange("partial", box))
+        return result
@@ -0,0 +1,71 @@
+"""
+Keyframed properties.
+
+A property is a list of ``(progress, value)`` keyframes where progress runs
+from 0.0 (first frame) to 1.0 (end of the clip). Values are scalars or
+fixed-length tuples such as RGB colors. ``evaluate`` takes an array of
+progress values, one per frame in a batch, and interpolates all of them in
+a single vectorized pass.
+"""
+
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+
+Value = Union[float, Sequence[float]]
+
+EASINGS = ("linear", "ease_in_out", "step")
+
+
+class Keyframes:
+    def __init__(self, points: Sequence[Tuple[float, Value]], easing: str = "linear"):
+        if not points:
+            raise ValueError("At least one keyframe is required")
+        if easing not in EASINGS:
+            raise ValueError(f"Unknown easing {easing!r}, expected one of {EASINGS}")
+
+        points = sorted(points, key=lambda point: point[0])
+        self.times = np.array([t for t, _ in points], dtype=np.float64)
+        self.values = np.array([v for _, v in points], dtype=np.float64)
+        self.easing = easing
+
+    @property
+    def is_constant(self) -> bool:
+        return bool(np.all(self.values == self.values[0]))
+
+    def evaluate(self, progress: np.ndarray) -> np.ndarray:
+        """Values at each progress; shape ``(N,)`` or ``(N, components)``."""
+        progress = np.asarray(progress, dtype=np.float64)
+        if len(self.times) == 1:
+            return np.broadcast_to(
+                self.values[0], progress.shape + self.values.shape[1:]
+            )
+
+        # Index of the keyframe that starts each frame's segment
+        index = np.clip(
+            np.searchsorted(self.times, progress, side="right") - 1,
+            0,
+            len(self.times) - 2,
+        )
+        t0, t1 = self.times[index], self.times[index + 1]
+        local = np.clip((progress - t0) / (t1 - t0), 0.0, 1.0)
+        if self.easing == "ease_in_out":
+            local = local * local * (3 - 2 * local)
+        elif self.easing == "step":
+            local = np.floor(local)
+
+        v0, v1 = self.values[index], self.values[index + 1]
+        if v0.ndim > 1:
+            local = local[:, None]
+        return v0 + local * (v1 - v0)
+
+    def __repr__(self) -> str:
+        return f"Keyframes(times={self.times.tolist()}, easing={self.easing!r})"
+
+
+def prop(value: Union[Keyframes, Value]) -> Keyframes:
+    """Wrap a plain value as a constant property."""
+    if isinstance(value, Keyframes):
+        return value
+    return Keyframes([(0.0, value)])
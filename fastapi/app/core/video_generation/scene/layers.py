@@ -0,0 +1,412 @@
+"""
+Scene layers. Each layer draws onto a batch of frames in place:
+``frames`` is ``(N, h, w, 3)`` uint8 and ``progress`` holds the clip progress
+of each frame. Properties are evaluated once per batch; pixel work is done
+with NumPy slicing and broadcasting, never per pixel or per row in Python.
+
+``frames`` may be a sub-rectangle of the canvas (see Viewport), which lets
+the renderer redraw only the region that changed since the previous frame.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from app.core.video_generation.scene.keyframes import Keyframes, prop
+
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+
+
+@lru_cache(maxsize=8)
+def load_font(size: int = 24):
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def _colors(values: np.ndarray) -> np.ndarray:
+    return np.clip(values, 0, 255).astype(np.uint8)
+
+
+def _blend(region: np.ndarray, color: np.ndarray, alpha: np.ndarray) -> None:
+    """
+    Alpha-blend ``color`` over ``region`` in place with PIL's integer blend,
+    so composited text matches what ImageDraw would have produced.
+    """
+    value = color * alpha + region.astype(np.int32) * (255 - alpha) + 128
+    region[...] = ((value >> 8) + value) >> 8
+
+
+def _fill_columns(frames: np.ndarray, column: np.ndarray) -> None:
+    """
+    Fill every column of ``frames`` (N, h, w, 3) with ``column`` (N, h, 3).
+    A broadcast assignment copies 3 bytes per inner loop step; doubling the
+    filled span instead copies long runs and is several times faster.
+    """
+    width = frames.shape[2]
+    frames[:, :, 0] = column
+    filled = 1
+    while filled < width:
+        step = min(filled, width - filled)
+        frames[:, :, filled : filled + step] = frames[:, :, :step]
+        filled += step
+
+
+def _clip_box(
+    x0: int, y0: int, x1: int, y1: int, width: int, height: int
+) -> Optional[Tuple[int, int, int, int]]:
+    """Half-open box clipped to the frame, or None when fully outside."""
+    box = max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)
+    if box[0] >= box[2] or box[1] >= box[3]:
+        return None
+    return box
+
+
+class Viewport(NamedTuple):
+    """Position of the rendered region inside a ``width`` x ``height`` canvas."""
+
+    left: int
+    top: int
+    width: int
+    height: int
+
+
+Footprint = Tuple[np.ndarray, Optional[np.ndarray]]
+
+
+class Layer:
+    def render(
+        self, frames: np.ndarray, progress: np.ndarray, viewport: Viewport
+    ) -> None:
+        raise NotImplementedError
+
+    def footprint(self, progress: np.ndarray, width: int, height: int) -> Footprint:
+        """
+        ``(states, boxes)`` for each frame. ``states`` (N, k) holds every
+        evaluated value that affects the pixels, so equal rows mean identical
+        output. ``boxes`` (N, 4) are the half-open ``left, top, right,
+        bottom`` regions the layer touches, or None for full-frame layers.
+        """
+        raise NotImplementedError
+
+
+class SolidLayer(Layer):
+    def __init__(self, color: Union[Keyframes, tuple] = BLACK):
+        self.color = prop(color)
+
+    def render(
+        self, frames: np.ndarray, progress: np.ndarray, viewport: Viewport
+    ) -> None:
+        colors = _colors(self.color.evaluate(progress))
+        _fill_columns(
+            frames, np.broadcast_to(colors[:, None, :], frames.shape[:2] + (3,))
+        )
+
+    def footprint(self, progress: np.ndarray, width: int, height: int) -> Footprint:
+        return _colors(self.color.evaluate(progress)).astype(np.float64), None
+
+
+class GradientLayer(Layer):
+    """Linear gradient from ``start`` at the top (or left) edge to ``end``."""
+
+    def __init__(
+        self,
+        start: Union[Keyframes, tuple] = BLACK,
+        end: Union[Keyframes, tuple] = WHITE,
+        direction: str = "vertical",
+    ):
+        if direction not in ("vertical", "horizontal"):
+            raise ValueError(f"Unknown gradient direction {direction!r}")
+        self.start = prop(start)
+        self.end = prop(end)
+        self.direction = direction
+        self._ratios = {}
+
+    def _ratio(self, length: int) -> np.ndarray:
+        if length not in self._ratios:
+            self._ratios[length] = np.arange(length) / length
+        return self._ratios[length]
+
+    def render(
+        self, frames: np.ndarray, progress: np.ndarray, viewport: Viewport
+    ) -> None:
+        _, height, width, _ = frames.shape
+        vertical = self.direction == "vertical"
+        if vertical:
+            ratio = self._ratio(viewport.height)[viewport.top : viewport.top + height]
+        else:
+            ratio = self._ratio(viewport.width)[viewport.left : viewport.left + width]
+
+        start = self.start.evaluate(progress)[:, None, :]
+        end = self.end.evaluate(progress)[:, None, :]
+        levels = _colors(start + (end - start) * ratio[None, :, None])
+
+        if vertical:
+            _fill_columns(frames, levels)
+        else:
+            frames[...] = levels[:, None, :, :]
+
+    def footprint(self, progress: np.ndarray, width: int, height: int) -> Footprint:
+        states = np.hstack([self.start.evaluate(progress), self.end.evaluate(progress)])
+        return states, None
+
+
+class _MaskLayer(Layer):
+    """Blends a fixed RGB(A) bitmap at a keyframed position."""
+
+    def __init__(
+        self,
+        x: Union[Keyframes, float],
+        y: Union[Keyframes, float],
+        opacity: Union[Keyframes, float],
+    ):
+        self.x = prop(x)
+        self.y = prop(y)
+        self.opacity = prop(opacity)
+
+    def _bitmap(self) -> Tuple[int, int, np.ndarray, np.ndarray]:
+        """``(offset_x, offset_y, alpha (h, w, 1), color (h, w, 3) or None)``."""
+        raise NotImplementedError
+
+    def _origin_x(self, x: np.ndarray, width: int) -> np.ndarray:
+        return x
+
+    def _placements(self, progress: np.ndarray, width: int):
+        """Bitmap top-left corners and opacity per frame, in canvas pixels."""
+        offset_x, offset_y, _, _ = self._bitmap()
+        xs = self._origin_x(self.x.evaluate(progress), width).astype(int) + offset_x
+        ys = self.y.evaluate(progress).astype(int) + offset_y
+        return xs, ys, self.opacity.evaluate(progress)
+
+    def footprint(self, progress: np.ndarray, width: int, height: int) -> Footprint:
+        _, _, alpha, _ = self._bitmap()
+        xs, ys, opacities = self._placements(progress, width)
+        columns = [xs, ys, opacities]
+        colors = self._color_batch(progress)
+        if colors is not None:
+            columns.extend(colors.T)
+        states = np.column_stack(columns).astype(np.float64)
+
+        box_h, box_w = alpha.shape[:2] if alpha is not None else (0, 0)
+        boxes = np.column_stack([xs, ys, xs + box_w, ys + box_h])
+        # Fully transparent frames draw nothing
+        boxes[opacities <= 0, 2:] = boxes[opacities <= 0, :2]
+        return states, boxes
+
+    def render(
+        self, frames: np.ndarray, progress: np.ndarray, viewport: Viewport
+    ) -> None:
+        count = len(frames)
+        _, _, alpha, pixels = self._bitmap()
+        if alpha is None:
+            return
+
+        xs, ys, opacities = self._placements(progress, viewport.width)
+        xs = xs - viewport.left
+        ys = ys - viewport.top
+        colors = self._color_batch(progress)
+
+        # Frames sharing a placement and opacity are blended together
+        start = 0
+        while start < count:
+            stop = start + 1
+            while (
+                stop < count
+                and xs[stop] == xs[start]
+                and ys[stop] == ys[start]
+                and opacities[stop] == opacities[start]
+            ):
+                stop += 1
+            self._blend_group(
+                frames[start:stop],
+                xs[start],
+                ys[start],
+                opacities[start],
+                alpha,
+                pixels if pixels is not None else colors[start:stop, None, None, :],
+            )
+            start = stop
+
+    def _color_batch(self, progress: np.ndarray) -> Optional[np.ndarray]:
+        return None
+
+    def _blend_group(self, frames, x, y, opacity, alpha, color) -> None:
+        if opacity <= 0:
+            return
+        _, height, width, _ = frames.shape
+        box_h, box_w = alpha.shape[:2]
+        box = _clip_box(x, y, x + box_w, y + box_h, width, height)
+        if box is None:
+            return
+        left, top, right, bottom = box
+        src = (slice(top - y, bottom - y), slice(left - x, right - x))
+
+        mask = alpha[src]
+        if opacity < 1:
+            mask = (mask * opacity + 0.5).astype(np.int32)
+        if color.ndim == 3:
+            color = color[src]
+        _blend(frames[:, top:bottom, left:right], color, mask)
+
+
+class TextLayer(_MaskLayer):
+    """
+    Single line of text. The glyph mask is rasterised once; frames only
+    blend it. ``x=None`` centres the line horizontally. ``x``/``y`` are the
+    PIL text origin in pixels.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        y: Union[Keyframes, float],
+        x: Optional[Union[Keyframes, float]] = None,
+        color: Union[Keyframes, tuple] = WHITE,
+        opacity: Union[Keyframes, float] = 1.0,
+        font_size: int = 24,
+    ):
+        super().__init__(x if x is not None else 0.0, y, opacity)
+        self.text = text
+        self.centered = x is None
+        self.color = prop(color)
+        self.font = load_font(font_size)
+        self.text_width = self.font.getlength(text)
+        self._mask = None
+
+    def _origin_x(self, x: np.ndarray, width: int) -> np.ndarray:
+        if not self.centered:
+            return x
+        return x + (width - self.text_width) // 2
+
+    def _bitmap(self):
+        if self._mask is None:
+            left, top, right, bottom = self.font.getbbox(self.text)
+            if right <= left or bottom <= top:
+                self._mask = (0, 0, None, None)
+            else:
+                image = Image.new("L", (right - left, bottom - top), 0)
+                ImageDraw.Draw(image).text(
+                    (-left, -top), self.text, fill=255, font=self.font
+                )
+                alpha = np.asarray(image, dtype=np.int32)[:, :, None]
+                self._mask = (left, top, alpha, None)
+        return self._mask
+
+    def _color_batch(self, progress: np.ndarray) -> np.ndarray:
+        return _colors(self.color.evaluate(progress)).astype(np.int32)
+
+
+class ImageLayer(_MaskLayer):
+    """Bitmap (path or PIL image) composited with its own alpha channel."""
+
+    def __init__(
+        self,
+        source: Union[str, Image.Image],
+        x: Union[Keyframes, float],
+        y: Union[Keyframes, float],
+        size: Optional[Tuple[int, int]] = None,
+        opacity: Union[Keyframes, float] = 1.0,
+    ):
+        super().__init__(x, y, opacity)
+        image = source if isinstance(source, Image.Image) else Image.open(source)
+        image = image.convert("RGBA")
+        if size is not None:
+            image = image.resize(size)
+        rgba = np.asarray(image, dtype=np.int32)
+        self._pixels = rgba[:, :, :3]
+        self._alpha = rgba[:, :, 3:]
+
+    def _bitmap(self):
+        return 0, 0, self._alpha, self._pixels
+
+
+class ShapeLayer(Layer):
+    """
+    Rectangle or ellipse with keyframed geometry and color. The box spans
+    ``x .. x + width`` and ``y .. y + height`` inclusive, like PIL shapes.
+    ``outline`` > 0 draws only a border of that many pixels.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        x: Union[Keyframes, float],
+        y: Union[Keyframes, float],
+        width: Union[Keyframes, float],
+        height: Union[Keyframes, float],
+        color: Union[Keyframes, tuple] = WHITE,
+        outline: int = 0,
+    ):
+        if kind not in ("rect", "ellipse"):
+            raise ValueError(f"Unknown shape {kind!r}")
+        self.kind = kind
+        self.x = prop(x)
+        self.y = prop(y)
+        self.width = prop(width)
+        self.height = prop(height)
+        self.color = prop(color)
+        self.outline = outline
+
+    def _geometry(self, progress: np.ndarray):
+        xs = self.x.evaluate(progress).astype(int)
+        ys = self.y.evaluate(progress).astype(int)
+        widths = self.width.evaluate(progress).astype(int)
+        heights = self.height.evaluate(progress).astype(int)
+        return xs, ys, xs + widths, ys + heights
+
+    def footprint(self, progress: np.ndarray, width: int, height: int) -> Footprint:
+        x0, y0, x1, y1 = self._geometry(progress)
+        colors = _colors(self.color.evaluate(progress))
+        states = np.column_stack([x0, y0, x1, y1, colors]).astype(np.float64)
+        return states, np.column_stack([x0, y0, x1 + 1, y1 + 1])
+
+    def render(
+        self, frames: np.ndarray, progress: np.ndarray, viewport: Viewport
+    ) -> None:
+        x0, y0, x1, y1 = self._geometry(progress)
+        x0, x1 = x0 - viewport.left, x1 - viewport.left
+        y0, y1 = y0 - viewport.top, y1 - viewport.top
+        colors = _colors(self.color.evaluate(progress))
+
+        draw = self._draw_rect if self.kind == "rect" else self._draw_ellipse
+        for i in range(len(frames)):
+            draw(frames[i], x0[i], y0[i], x1[i], y1[i], colors[i])
+
+    def _fill(self, frame, x0, y0, x1, y1, color) -> None:
+        box = _clip_box(x0, y0, x1 + 1, y1 + 1, frame.shape[1], frame.shape[0])
+        if box is not None:
+            left, top, right, bottom = box
+            frame[top:bottom, left:right] = color
+
+    def _draw_rect(self, frame, x0, y0, x1, y1, color) -> None:
+        if not self.outline:
+            self._fill(frame, x0, y0, x1, y1, color)
+            return
+        w = self.outline - 1
+        self._fill(frame, x0, y0, x1, y0 + w, color)
+        self._fill(frame, x0, y1 - w, x1, y1, color)
+        self._fill(frame, x0, y0, x0 + w, y1, color)
+        self._fill(frame, x1 - w, y0, x1, y1, color)
+
+    def _draw_ellipse(self, frame, x0, y0, x1, y1, color) -> None:
+        box = _clip_box(x0, y0, x1 + 1, y1 + 1, frame.shape[1], frame.shape[0])
+        if box is None:
+            return
+        left, top, right, bottom = box
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        rx, ry = max((x1 - x0) / 2, 0.5), max((y1 - y0) / 2, 0.5)
+
+        dx = ((np.arange(left, right) - cx) / rx) ** 2
+        dy = ((np.arange(top, bottom) - cy) / ry) ** 2
+        inside = dy[:, None] + dx[None, :] <= 1
+        if self.outline:
+            irx, iry = max(rx - self.outline, 0.5), max(ry - self.outline, 0.5)
+            dx = ((np.arange(left, right) - cx) / irx) ** 2
+            dy = ((np.arange(top, bottom) - cy) / iry) ** 2
+            inside &= dy[:, None] + dx[None, :] > 1
+        frame[top:bottom, left:right][inside] = color
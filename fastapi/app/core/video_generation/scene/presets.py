@@ -0,0 +1,151 @@
+"""
+Scene presets selected by ``VideoGenerationRequest.style``. Each preset builds
+a Scene for one job; unknown or missing styles fall back to ``default``,
+which is the original gradient / caption / progress bar look.
+"""
+
+from typing import Callable, Dict, Optional
+
+from app.core.video_generation.scene.graph import Scene
+from app.core.video_generation.scene.keyframes import Keyframes
+from app.core.video_generation.scene.layers import (
+    BLACK,
+    WHITE,
+    GradientLayer,
+    ShapeLayer,
+    SolidLayer,
+    TextLayer,
+)
+
+
+def caption(prompt: str) -> str:
+    return f"Video: {prompt[:50]}..."
+
+
+def default_scene(prompt: str, width: int, height: int) -> Scene:
+    bar_width = int(width * 0.8)
+    bar_height = 20
+    bar_x = (width - bar_width) // 2
+    bar_y = height // 2 + 50
+    return Scene(
+        width,
+        height,
+        [
+            GradientLayer(
+                start=(0, 0, 255),
+                end=Keyframes([(0.0, (0, 0, 255)), (1.0, (255, 255, 255))]),
+            ),
+            TextLayer(caption(prompt), y=height // 2),
+            ShapeLayer("rect", bar_x, bar_y, bar_width, bar_height, outline=1),
+            ShapeLayer(
+                "rect",
+                bar_x,
+                bar_y,
+                Keyframes([(0.0, 0), (1.0, bar_width)]),
+                bar_height,
+            ),
+        ],
+    )
+
+
+def cinematic_scene(prompt: str, width: int, height: int) -> Scene:
+    letterbox = int(height * 0.12)
+    return Scene(
+        width,
+        height,
+        [
+            GradientLayer(
+                start=Keyframes([(0.0, (8, 10, 24)), (1.0, (40, 24, 16))]),
+                end=Keyframes([(0.0, (40, 44, 70)), (1.0, (120, 70, 40))]),
+            ),
+            TextLayer(
+                caption(prompt),
+                y=Keyframes(
+                    [(0.0, height * 0.55), (0.2, height // 2)], easing="ease_in_out"
+                ),
+                color=(235, 225, 210),
+                opacity=Keyframes([(0.0, 0.0), (0.2, 1.0)], easing="ease_in_out"),
+                font_size=28,
+            ),
+            ShapeLayer("rect", 0, 0, width, letterbox - 1, BLACK),
+            ShapeLayer("rect", 0, height - letterbox, width, letterbox, BLACK),
+            ShapeLayer(
+                "rect",
+                0,
+                height - letterbox // 2,
+                Keyframes([(0.0, 0), (1.0, width)]),
+                1,
+                (235, 225, 210),
+            ),
+        ],
+    )
+
+
+def neon_scene(prompt: str, width: int, height: int) -> Scene:
+    size = min(width, height)
+    pulse = Keyframes(
+        [(0.0, size * 0.3), (0.25, size * 0.4), (0.5, size * 0.3), (0.75, size * 0.4)],
+        easing="ease_in_out",
+    )
+    centre = Keyframes(
+        [(0.0, width // 2 - size * 0.15), (0.25, width // 2 - size * 0.2)]
+        + [(0.5, width // 2 - size * 0.15), (0.75, width // 2 - size * 0.2)],
+        easing="ease_in_out",
+    )
+    return Scene(
+        width,
+        height,
+        [
+            GradientLayer(
+                start=Keyframes([(0.0, (40, 0, 60)), (1.0, (0, 30, 70))]),
+                end=Keyframes([(0.0, (0, 30, 70)), (1.0, (60, 0, 50))]),
+                direction="horizontal",
+            ),
+            ShapeLayer(
+                "ellipse",
+                centre,
+                Keyframes(
+                    [(0.0, height // 2 - size * 0.15), (0.25, height // 2 - size * 0.2)]
+                    + [
+                        (0.5, height // 2 - size * 0.15),
+                        (0.75, height // 2 - size * 0.2),
+                    ],
+                    easing="ease_in_out",
+                ),
+                pulse,
+                pulse,
+                Keyframes([(0.0, (255, 0, 200)), (1.0, (0, 255, 230))]),
+                outline=4,
+            ),
+            TextLayer(caption(prompt), y=height // 2, color=(0, 255, 230)),
+        ],
+    )
+
+
+def minimal_scene(prompt: str, width: int, height: int) -> Scene:
+    return Scene(
+        width,
+        height,
+        [
+            SolidLayer((245, 245, 240)),
+            TextLayer(
+                caption(prompt),
+                y=height // 2,
+                color=(30, 30, 30),
+                opacity=Keyframes([(0.0, 0.0), (0.1, 1.0), (0.9, 1.0), (1.0, 0.0)]),
+            ),
+        ],
+    )
+
+
+PRESETS: Dict[str, Callable[[str, int, int], Scene]] = {
+    "default": default_scene,
+    "cinematic": cinematic_scene,
+    "neon": neon_scene,
+    "minimal": minimal_scene,
+}
+
+
+def build_scene(style: Optional[str], prompt: str, width: int, height: int) -> Scene:
+    preset = PRESETS.get((style or "default").strip().lower(), default_scene)
+    return preset(prompt, width, height)
@@ -1,30 +1,81 @@
+import hashlib
+import multiprocessing
 import os
+import shutil
+import time
 import uuid
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
 from datetime import datetime
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
-import moviepy.editor as mpy
-import tempfile
 
 from app.config import settings
+from app.core.cache import get_cache
+from app.core.metrics import StageTimer, registry
+from app.core.profiling import profile_if_slow
+from app.core.storage import LocalStorage
+from app.core.tts import TTSCache, get_tts_client
+from app.core.video_generation.checkpoint import RenderCheckpoint, make_temp_dir
+from app.core.video_generation.encoder import (
+    FrameEncoder,
+    concat_segments,
+    vfr_setpts,
+)
+from app.core.video_generation.frame_renderer import FrameRenderer, batch_frames
+from app.core.video_generation.frame_ring import FrameRing
+from app.core.video_generation.scene import FrameChange
 from app.models.schemas import VideoGenerationRequest, VideoGenerationResponse
 
 
+RENDER_STAGE_SECONDS = registry.histogram(
+    "slopengine_render_stage_seconds",
+    "Wall time spent in each video generation stage",
+    ["stage"],
+)
+RENDER_JOBS_TOTAL = registry.counter(
+    "slopengine_render_jobs_total",
+    "Video generation jobs by final status",
+    ["status"],
+)
+RENDER_FRAMES_TOTAL = registry.counter(
+    "slopengine_render_frames_total",
+    "Frames rendered across all jobs",
+)
+RENDER_SEGMENTS_RESUMED_TOTAL = registry.counter(
+    "slopengine_render_segments_resumed_total",
+    "Encoded segments reused from a checkpoint instead of re-rendered",
+)
+RENDER_FRAMES_REUSED_TOTAL = registry.counter(
+    "slopengine_render_frames_reused_total",
+    "Frames served from the previous frame buffer, fully or with a dirty rect",
+    ["change"],
+)
+
+
+class RenderCancelled(Exception):
+    """The caller no longer owns the job (e.g. its queue lease was lost)."""
+
+
+def _check_cancelled(cancelled: Optional[Callable[[], bool]]) -> None:
+    if cancelled is not None and cancelled():
+        raise RenderCancelled("Render cancelled")
+
+
 class VideoGenerationService:
-    def __init__(self):
+    def __init__(
+        self,
+        llm=None,
+        storage: Optional[LocalStorage] = None,
+        tts_cache: Optional[TTSCache] = None,
+    ):
         self.openai_api_key = settings.OPENAI_API_KEY
-        if not self.openai_api_key:
-            raise ValueError("OPENAI_API_KEY is required for video generation")
-
-        self.llm = ChatOpenAI(
-            model="gpt-4",
-            temperature=0.7,
-            api_key=self.openai_api_key,
-        )
+        self.llm = llm
+        self.storage = storage or LocalStorage()
+        self._enhancer_chain = None
+        self._tts_cache = tts_cache
 
         # Prompt template for enhancing video prompts
         self.prompt_enhancer = PromptTemplate(
@@ -37,37 +88,107 @@ Style: {style}
 Enhanced prompt (be specific, descriptive, and cinematic):""",
         )
 
-        self.enhancer_chain = LLMChain(llm=self.llm, prompt=self.prompt_enhancer)
+    @property
+    def enhancer_chain(self) -> LLMChain:
+        # Built on first use so API nodes that only enqueue jobs or serve
+        # files don't need an OpenAI key
+        if self._enhancer_chain is None:
+            if self.llm is None:
+                if not self.openai_api_key:
+                    raise ValueError("OPENAI_API_KEY is required for video generation")
+
+                self.llm = ChatOpenAI(
+                    model="gpt-4",
+                    temperature=0.7,
+                    api_key=self.openai_api_key,
+                    base_url=settings.OPENAI_BASE_URL,
+                )
+            self._enhancer_chain = LLMChain(llm=self.llm, prompt=self.prompt_enhancer)
+        return self._enhancer_chain
+
+    @property
+    def tts_cache(self) -> TTSCache:
+        if self._tts_cache is None:
+            self._tts_cache = TTSCache(get_tts_client(), self.storage.tts_cache_dir())
+        return self._tts_cache
+
+    def _enhance_prompt(self, prompt: str, style: str) -> str:
+        def enhance() -> str:
+            return self.enhancer_chain.run(prompt=prompt, style=style)
+
+        if not settings.CACHE_PROMPT_TTL_SECONDS:
+            return enhance()
+        # Identical requests from any replica share one LLM call
+        key = hashlib.sha256(f"{style}\0{prompt}".encode("utf-8")).hexdigest()
+        return get_cache(
+            "enhanced_prompts", settings.CACHE_PROMPT_TTL_SECONDS
+        ).get_or_load(key, enhance)
+
+    def _narration_voice(self, request: VideoGenerationRequest) -> Optional[str]:
+        if not (settings.NARRATION_ENABLED and request.narration):
+            return None
+        return request.voice or settings.NARRATION_DEFAULT_VOICE
 
     def generate_video(
-        self, request: VideoGenerationRequest
+        self,
+        request: VideoGenerationRequest,
+        video_id: Optional[str] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
     ) -> VideoGenerationResponse:
-        video_id = str(uuid.uuid4())
+        """
+        Render ``request``. ``cancelled`` is polled between segments; once it
+        returns True the render stops with RenderCancelled, leaving the
+        checkpoint to whoever owns the job now.
+        """
+        video_id = video_id or str(uuid.uuid4())
+        timer = StageTimer(RENDER_STAGE_SECONDS)
 
-        # Enhance the prompt using LLM
-        enhanced_prompt = self.enhancer_chain.run(
-            prompt=request.prompt,
-            style=request.style or "cinematic",
-        )
+        checkpoint = RenderCheckpoint(self.storage.checkpoint_dir(video_id))
 
-        # Parse resolution
-        width, height = map(int, request.resolution.split("x"))
+        try:
+            with profile_if_slow(f"render-{video_id}"):
+                # Enhance the prompt using LLM (a resumed job reuses the prompt
+                # its checkpointed segments were rendered with)
+                enhanced_prompt = checkpoint.enhanced_prompt
+                if enhanced_prompt is None:
+                    with timer.stage("enhance"):
+                        enhanced_prompt = self._enhance_prompt(
+                            request.prompt, request.style or "cinematic"
+                        )
+                    checkpoint.save_enhanced_prompt(enhanced_prompt)
 
-        # Create a simulated video (in production, this would call Sora API)
-        video_path = self._create_simulated_video(
-            video_id=video_id,
-            prompt=enhanced_prompt,
-            duration=request.duration,
-            width=width,
-            height=height,
-            fps=request.fps,
-        )
+                width, height = request.dimensions
+
+                # Create a simulated video (in production, this would call Sora API)
+                video_path = self._create_simulated_video(
+                    video_id=video_id,
+                    prompt=enhanced_prompt,
+                    duration=request.duration,
+                    width=width,
+                    height=height,
+                    fps=request.fps,
+                    style=request.style,
+                    narration_voice=self._narration_voice(request),
+                    timer=timer,
+                    checkpoint=checkpoint,
+                    cancelled=cancelled,
+                )
+        except Exception:
+            RENDER_JOBS_TOTAL.inc(status="failed")
+            raise
+        finally:
+            timer.observe()
+
+        RENDER_JOBS_TOTAL.inc(status="completed")
+        timings = dict(timer.timings)
+        timings["total"] = timer.total()
 
         return VideoGenerationResponse(
             video_id=video_id,
             status="completed",
             message=f"Video generated successfully: {enhanced_prompt}",
             created_at=datetime.utcnow(),
+            stage_timings=timings,
         )
 
     def _create_simulated_video(
@@ -78,32 +199,266 @@ Enhanced prompt (be specific, descriptive, and cinematic):""",
         width: int,
         height: int,
         fps: int,
+        style: Optional[str] = None,
+        narration_voice: Optional[str] = None,
+        timer: Optional[StageTimer] = None,
+        checkpoint: Optional[RenderCheckpoint] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
     ) -> str:
-        # Create a temporary directory for video files
-        temp_dir = tempfile.mkdtemp()
-        video_path = os.path.join(temp_dir, f"{video_id}.mp4")
-
-        # Create frames
-        frames = []
-        for i in range(duration * fps):
-            # Create a simple animated frame based on prompt
-            frame = self._create_frame(
-                prompt=prompt,
-                frame_num=i,
-                total_frames=duration * fps,
-                width=width,
-                height=height,
-            )
-            frames.append(frame)
+        timer = timer or StageTimer(RENDER_STAGE_SECONDS)
+        checkpoint = checkpoint or RenderCheckpoint(
+            self.storage.checkpoint_dir(video_id)
+        )
+        total_frames = duration * fps
+        segment_frames = settings.RENDER_SEGMENT_FRAMES
+
+        # Segments from a previous attempt are only reused if they were
+        # rendered with identical parameters
+        checkpoint.start(
+            {
+                "prompt": prompt,
+                "style": style,
+                "width": width,
+                "height": height,
+                "fps": fps,
+                "total_frames": total_frames,
+                "segment_frames": segment_frames,
+            }
+        )
+
+        # Scratch directory for the concatenated output
+        temp_dir = make_temp_dir()
+        narration_executor = None
+        try:
+            # Speech is synthesised in the background while frames render
+            narration = None
+            if narration_voice is not None:
+                narration_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix=f"narration-{video_id}"
+                )
+                narration = narration_executor.submit(
+                    self.tts_cache.audio_for, prompt, narration_voice
+                )
+
+            segment_paths = []
+            segment_durations = []
+            pending = []
+            for index, start in enumerate(range(0, total_frames, segment_frames)):
+                count = min(segment_frames, total_frames - start)
+                segment_paths.append(checkpoint.segment_path(index))
+                segment_durations.append(count / fps)
+                if checkpoint.has_segment(index):
+                    RENDER_SEGMENTS_RESUMED_TOTAL.inc()
+                    continue
+                pending.append((index, start, count))
+
+            if settings.RENDER_PIPELINE == "process" and pending:
+                self._render_segments_in_process(
+                    checkpoint=checkpoint,
+                    pending=pending,
+                    prompt=prompt,
+                    style=style,
+                    total_frames=total_frames,
+                    width=width,
+                    height=height,
+                    fps=fps,
+                    timer=timer,
+                    cancelled=cancelled,
+                )
+            else:
+                renderer = FrameRenderer(
+                    prompt,
+                    total_frames,
+                    width,
+                    height,
+                    style,
+                    dedup=settings.RENDER_DEDUP_FRAMES,
+                )
+                # One block reused by every batch of every segment
+                block = np.empty(
+                    (
+                        min(batch_frames(width, height), segment_frames),
+                        height,
+                        width,
+                        3,
+                    ),
+                    dtype=np.uint8,
+                )
+                for index, start, count in pending:
+                    _check_cancelled(cancelled)
+                    self._render_segment(
+                        checkpoint=checkpoint,
+                        index=index,
+                        renderer=renderer,
+                        block=block,
+                        start=start,
+                        count=count,
+                        fps=fps,
+                        timer=timer,
+                        cancelled=cancelled,
+                    )
+
+            audio_path = None
+            if narration is not None:
+                # Only the time rendering didn't already cover
+                with timer.stage("narration"):
+                    audio_path = narration.result()
 
-        # Create video from frames
-        clip = mpy.ImageSequenceClip(frames, fps=fps)
-        clip.write_videofile(video_path, codec="libx264", audio=False)
+            _check_cancelled(cancelled)
+            with timer.stage("concat"):
+                output_path = os.path.join(temp_dir, f"{video_id}.mp4")
+                concat_segments(
+                    segment_paths, output_path, segment_durations, audio_path
+                )
+                video_path = self.storage.save_video(video_id, output_path)
+        finally:
+            if narration_executor is not None:
+                narration_executor.shutdown(wait=False)
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
-        # In production, save to persistent storage (S3, etc.)
-        # For now, we'll just return the path
+        checkpoint.clear()
         return video_path
 
+    def _render_segment(
+        self,
+        checkpoint: RenderCheckpoint,
+        index: int,
+        renderer: FrameRenderer,
+        block: np.ndarray,
+        start: int,
+        count: int,
+        fps: int,
+        timer: StageTimer,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        changes = renderer.changes(start, count)
+        if not renderer.continues(start):
+            # Nothing to reuse, e.g. the previous segment came from a checkpoint
+            changes[0] = FrameChange("full")
+        frame_indices = _vfr_frame_indices(changes)
+        written = set(frame_indices) if frame_indices is not None else None
+
+        render_seconds = 0.0
+        encode_start = time.perf_counter()
+        with FrameEncoder(
+            checkpoint.partial_segment_path(index),
+            renderer.width,
+            renderer.height,
+            fps,
+            frame_indices=frame_indices,
+        ) as encoder:
+            # The block is recycled in place; the encoder has consumed each
+            # batch by the time the next one is rendered
+            for offset in range(0, count, len(block)):
+                size = min(len(block), count - offset)
+                batch_start = time.perf_counter()
+                frames = renderer.render_frames(
+                    start + offset,
+                    size,
+                    block[:size],
+                    changes[offset : offset + size],
+                )
+                render_seconds += time.perf_counter() - batch_start
+                if written is None:
+                    encoder.write_batch(frames)
+                else:
+                    for i in range(size):
+                        if offset + i in written:
+                            encoder.write(frames[i])
+
+        # Frames stream into ffmpeg while rendering; whatever isn't spent
+        # rendering is time spent in (or blocked on) the encoder
+        timer.record("render", render_seconds)
+        timer.record("encode", time.perf_counter() - encode_start - render_seconds)
+        # The job may have been re-claimed while this segment was encoding
+        _check_cancelled(cancelled)
+        checkpoint.commit_segment(index)
+        RENDER_FRAMES_TOTAL.inc(count)
+        for change in changes:
+            if change.kind != "full":
+                RENDER_FRAMES_REUSED_TOTAL.inc(change=change.kind)
+
+    def _render_segments_in_process(
+        self,
+        checkpoint: RenderCheckpoint,
+        pending: List[Tuple[int, int, int]],
+        prompt: str,
+        style: Optional[str],
+        total_frames: int,
+        width: int,
+        height: int,
+        fps: int,
+        timer: StageTimer,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Render in a separate process and encode here. Frames cross the process
+        boundary through a shared-memory ring instead of pickled arrays.
+        """
+        # Only needed to know which frames a variable frame rate segment drops
+        planner = FrameRenderer(
+            prompt, total_frames, width, height, style, settings.RENDER_DEDUP_FRAMES
+        )
+        context = multiprocessing.get_context("spawn")
+        with FrameRing((height, width, 3), settings.FRAME_RING_DEPTH, context) as ring:
+            producer = context.Process(
+                target=_produce_frames,
+                args=(
+                    ring.handle(),
+                    prompt,
+                    style,
+                    settings.RENDER_DEDUP_FRAMES,
+                    [(start, count) for _, start, count in pending],
+                    total_frames,
+                    width,
+                    height,
+                ),
+                daemon=True,
+            )
+            producer.start()
+            try:
+                frames = ring.frames(is_alive=producer.is_alive)
+                for index, start, count in pending:
+                    _check_cancelled(cancelled)
+                    frame_indices = None
+                    if settings.RENDER_VFR:
+                        frame_indices = _vfr_frame_indices(
+                            planner.changes(start, count)
+                        )
+                    written = set(frame_indices) if frame_indices is not None else None
+
+                    wait_seconds = 0.0
+                    segment_start = time.perf_counter()
+                    with FrameEncoder(
+                        checkpoint.partial_segment_path(index),
+                        width,
+                        height,
+                        fps,
+                        frame_indices=frame_indices,
+                    ) as encoder:
+                        for offset in range(count):
+                            wait_start = time.perf_counter()
+                            _, frame = next(frames)
+                            wait_seconds += time.perf_counter() - wait_start
+                            if written is None or offset in written:
+                                encoder.write(frame)
+
+                    # Rendering overlaps encoding; "render" is the time the
+                    # encoder sat waiting for frames
+                    timer.record("render", wait_seconds)
+                    timer.record(
+                        "encode", time.perf_counter() - segment_start - wait_seconds
+                    )
+                    _check_cancelled(cancelled)
+                    checkpoint.commit_segment(index)
+                    RENDER_FRAMES_TOTAL.inc(count)
+                frames.close()
+            finally:
+                producer.join(timeout=5)
+                if producer.is_alive():
+                    producer.terminate()
+                    producer.join()
+
     def _create_frame(
         self,
         prompt: str,
@@ -111,52 +466,83 @@ Enhanced prompt (be specific, descriptive, and cinematic):""",
         total_frames: int,
         width: int,
         height: int,
+        style: Optional[str] = None,
     ) -> np.ndarray:
-        # Create a simple gradient background
-        img = Image.new("RGB", (width, height), color="black")
-        draw = ImageDraw.Draw(img)
+        # Single-frame convenience; render loops keep one FrameRenderer per job
+        return self.render_frames(
+            prompt, frame_num, 1, total_frames, width, height, style
+        )[0]
 
-        # Add some text with the prompt
-        try:
-            font = ImageFont.truetype("arial.ttf", 24)
-        except:
-            font = ImageFont.load_default()
-
-        # Draw animated elements
-        progress = frame_num / total_frames
-
-        # Gradient effect
-        for y in range(height):
-            color_value = int(255 * (y / height) * progress)
-            draw.line([(0, y), (width, y)], fill=(color_value, color_value, 255))
-
-        # Draw prompt text
-        text = f"Video: {prompt[:50]}..."
-        text_width = draw.textlength(text, font=font)
-        text_position = ((width - text_width) // 2, height // 2)
-        draw.text(text_position, text, fill="white", font=font)
-
-        # Progress indicator
-        bar_width = int(width * 0.8)
-        bar_height = 20
-        bar_x = (width - bar_width) // 2
-        bar_y = height // 2 + 50
-        draw.rectangle(
-            [bar_x, bar_y, bar_x + bar_width, bar_y + bar_height], outline="white"
-        )
-        draw.rectangle(
-            [bar_x, bar_y, bar_x + int(bar_width * progress), bar_y + bar_height],
-            fill="white",
+    def render_frames(
+        self,
+        prompt: str,
+        start: int,
+        count: int,
+        total_frames: int,
+        width: int,
+        height: int,
+        style: Optional[str] = None,
+    ) -> np.ndarray:
+        """Frames ``start .. start + count`` of a clip as a (count, height, width, 3) array."""
+        renderer = FrameRenderer(
+            prompt, total_frames, width, height, style, settings.RENDER_DEDUP_FRAMES
         )
-
-        return np.array(img)
+        return renderer.render_frames(start, count)
 
     def get_video_path(self, video_id: str) -> Optional[str]:
         # In production, retrieve from storage
-        # For simulation, check if file exists
-        temp_dir = tempfile.gettempdir()
-        video_path = os.path.join(temp_dir, f"{video_id}.mp4")
+        return self.storage.find_video(video_id)
+
 
-        if os.path.exists(video_path):
-            return video_path
+def _produce_frames(
+    handle: dict,
+    prompt: str,
+    style: Optional[str],
+    dedup: bool,
+    ranges: List[Tuple[int, int]],
+    total_frames: int,
+    width: int,
+    height: int,
+) -> None:
+    """Renderer process body for the process pipeline."""
+    ring = FrameRing.attach(handle)
+    seq = 0
+    try:
+        renderer = FrameRenderer(prompt, total_frames, width, height, style, dedup)
+        # At most half the ring per batch, so the encoder drains one half
+        # while the next is rendered
+        batch = min(batch_frames(width, height), max(ring.depth // 2, 1))
+        for start, end in ((start, start + count) for start, count in ranges):
+            frame_num = start
+            while frame_num < end:
+                # Slots may still be read by the encoder, so every frame gets
+                # its own slot; unchanged frames are copied rather than redrawn
+                size = min(batch, end - frame_num, ring.depth - seq % ring.depth)
+                renderer.render_frames(frame_num, size, ring.acquire_slots(seq, size))
+                for offset in range(size):
+                    ring.publish(frame_num + offset)
+                frame_num += size
+                seq += size
+        ring.finish()
+    except Exception as e:
+        ring.finish(f"{type(e).__name__}: {e}")
+    finally:
+        ring.close()
+
+
+def _vfr_frame_indices(changes: List[FrameChange]) -> Optional[List[int]]:
+    """
+    Offsets of the frames a RENDER_VFR segment keeps, or None to encode every
+    frame. The last frame is always kept so the segment keeps its duration.
+    """
+    if not settings.RENDER_VFR:
+        return None
+    last = len(changes) - 1
+    indices = [
+        offset
+        for offset, change in enumerate(changes)
+        if offset in (0, last) or change.kind != "none"
+    ]
+    if len(indices) == len(changes) or vfr_setpts(indices) is None:
         return None
+    return indices
@@ -0,0 +1,168 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from typing import Callable, Optional
+
+from app.config import settings
+from app.core.metrics import registry
+from app.database.session import SessionLocal
+from app.models.schemas import VideoGenerationRequest
+from app.services.render_queue import RenderQueueService
+from app.services.throughput import render_fps
+from app.core.video_generation.autotune import RssSampler
+from app.core.video_generation.checkpoint import cleanup_orphaned_temp_dirs
+from app.core.video_generation.service import (
+    RenderCancelled,
+    VideoGenerationService,
+)
+
+
+logger = logging.getLogger(__name__)
+
+WORKER_JOBS_TOTAL = registry.counter(
+    "slopengine_worker_jobs_total",
+    "Render jobs processed by workers, by outcome",
+    ["outcome"],
+)
+WORKER_LEASES_LOST_TOTAL = registry.counter(
+    "slopengine_worker_leases_lost_total",
+    "Jobs whose lease was taken over by another worker mid-render",
+)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class _Heartbeat:
+    """Extends the job lease in the background while a render is running."""
+
+    def __init__(self, video_id: str, worker_id: str):
+        self.video_id = video_id
+        self.worker_id = worker_id
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"heartbeat-{video_id}", daemon=True
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(settings.WORKER_HEARTBEAT_SECONDS):
+            db = SessionLocal()
+            try:
+                if not RenderQueueService(db).heartbeat(self.video_id, self.worker_id):
+                    self.lost = True
+                    return
+            except Exception:
+                logger.exception("Heartbeat failed for %s", self.video_id)
+            finally:
+                db.close()
+
+
+class RenderWorker:
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        service_factory: Callable[[], VideoGenerationService] = VideoGenerationService,
+    ):
+        self.worker_id = worker_id or default_worker_id()
+        self.service_factory = service_factory
+        self._service: Optional[VideoGenerationService] = None
+
+    @property
+    def service(self) -> VideoGenerationService:
+        if self._service is None:
+            self._service = self.service_factory()
+        return self._service
+
+    def run_once(self) -> bool:
+        """Claim and render one job. Returns False when the queue is empty."""
+        db = SessionLocal()
+        try:
+            queue = RenderQueueService(db)
+            job = queue.claim(self.worker_id)
+            if job is None:
+                return False
+
+            video_id = job.video_id
+            # Validated when it was accepted; limits may have changed since
+            request = VideoGenerationRequest.model_construct(
+                prompt=job.prompt,
+                duration=job.duration,
+                resolution=job.resolution,
+                style=job.style,
+                fps=job.fps,
+                narration=job.narration,
+                voice=job.voice,
+            )
+            logger.info(
+                "Worker %s claimed %s (attempt %d)",
+                self.worker_id,
+                video_id,
+                job.attempts,
+            )
+
+            with _Heartbeat(video_id, self.worker_id) as heartbeat, RssSampler() as rss:
+                try:
+                    # Stop at the next segment once another worker owns the job,
+                    # rather than writing into its checkpoint
+                    response = self.service.generate_video(
+                        request, video_id=video_id, cancelled=lambda: heartbeat.lost
+                    )
+                except RenderCancelled:
+                    self._lease_lost(video_id)
+                    return True
+                except Exception as e:
+                    logger.exception("Render of %s failed", video_id)
+                    queue.fail(video_id, self.worker_id, str(e))
+                    WORKER_JOBS_TOTAL.inc(outcome="failed")
+                    return True
+
+            # A resumed job only timed the segments missing from its checkpoint
+            fps = (
+                render_fps(request.frames, response.stage_timings)
+                if job.attempts == 1
+                else None
+            )
+            if heartbeat.lost or not queue.complete(
+                video_id,
+                self.worker_id,
+                response,
+                render_fps=fps,
+                peak_rss_bytes=rss.peak,
+            ):
+                self._lease_lost(video_id)
+            else:
+                WORKER_JOBS_TOTAL.inc(outcome="completed")
+            return True
+        finally:
+            db.close()
+
+    def _lease_lost(self, video_id: str) -> None:
+        WORKER_LEASES_LOST_TOTAL.inc()
+        WORKER_JOBS_TOTAL.inc(outcome="lost")
+        logger.warning("Worker %s lost the lease on %s", self.worker_id, video_id)
+
+    def run_forever(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        cleanup_orphaned_temp_dirs()
+        logger.info("Render worker %s started", self.worker_id)
+        while not stop.is_set():
+            try:
+                worked = self.run_once()
+            except Exception:
+                logger.exception("Worker %s iteration failed", self.worker_id)
+                worked = False
+            if not worked:
+                stop.wait(settings.WORKER_POLL_INTERVAL)
+        logger.info("Render worker %s stopped", self.worker_id)
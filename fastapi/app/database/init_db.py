@@ -2,158 +2,205 @@
 # -*- coding: utf-8 -*-
 """
 Script d'initialisation de la base de données.
-Génère et applique les migrations si nécessaire.
+Applique les migrations Alembic en cours de processus, sans jamais en générer.
+
+Plusieurs réplicas peuvent démarrer en même temps : un seul migre, sous un
+verrou consultatif PostgreSQL (``pg_advisory_lock``), pendant que les autres
+attendent ce verrou au lieu de boucler. Une base déjà à jour ne prend aucun
+verrou.
 """
 
+import contextlib
+import fcntl
 import os
+import random
 import sys
-import subprocess
 import time
 
+from sqlalchemy import inspect, text
+
 # Ajouter le chemin du projet
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+sys.path.append(PROJECT_DIR)
 
-from app.database.check_init import check_database_initialized, check_alembic_version
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 
+from app.config import settings
+from app.models.user import User
+from app.models.video import GeneratedVideo
 
-def run_alembic_command(command):
-    """Exécute une commande Alembic et retourne le résultat."""
-    try:
-        print(f"Exécution de la commande: alembic {command}")
-        result = subprocess.run(
-            ["alembic"] + command.split(),
-            capture_output=True,
-            text=True,
-            cwd=os.path.dirname(os.path.dirname(__file__)),
-        )
 
-        if result.returncode != 0:
-            print(f"Erreur lors de l'exécution de 'alembic {command}':")
-            print(f"STDOUT: {result.stdout}")
-            print(f"STDERR: {result.stderr}")
-            return False
+# Clé du verrou consultatif partagé par tous les réplicas (entier 64 bits)
+MIGRATION_LOCK_KEY = 0x736C6F70656E67
 
-        print(f"Commande réussie: {result.stdout}")
-        return True
+# Schéma produit par create_all avant l'arrivée des migrations suivantes
+INITIAL_REVISION = "d6e70af859f8"
 
-    except FileNotFoundError:
-        print("Erreur: Alembic n'est pas installé ou n'est pas dans le PATH.")
-        return False
-    except Exception as e:
-        print(f"Erreur inattendue: {e}")
-        return False
+
+def alembic_config(database_url=None):
+    """Configuration Alembic du projet, pointée sur la base de l'application."""
+    config = Config(os.path.join(PROJECT_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(PROJECT_DIR, "alembic"))
+    config.set_main_option(
+        "sqlalchemy.url",
+        (database_url or settings.DATABASE_URL).replace("%", "%%"),
+    )
+    return config
 
 
-def wait_for_database(max_retries=30, retry_interval=2):
+def wait_for_database(engine, timeout=60.0, initial_delay=0.1, max_delay=5.0):
     """
-    Attend que la base de données soit disponible.
-    Retourne True si la base de données est disponible, False sinon.
+    Attend que la base de données accepte les connexions, avec un délai
+    exponentiel (et aléatoire, pour désynchroniser les réplicas) entre les
+    tentatives. Retourne True si la base est disponible avant ``timeout``.
     """
-    print("Attente de la disponibilité de la base de données...")
-
-    for attempt in range(max_retries):
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    attempt = 0
+    while True:
+        attempt += 1
         try:
-            # Importer ici pour éviter les erreurs d'importation circulaire
-            from app.database.session import engine
-
             with engine.connect() as connection:
-                # Test simple de connexion
-                connection.execute("SELECT 1")
-                print(f"Base de données disponible après {attempt + 1} tentatives.")
-                return True
-
+                connection.execute(text("SELECT 1"))
+            if attempt > 1:
+                print(f"Base de données disponible après {attempt} tentatives.")
+            return True
         except Exception as e:
-            if attempt < max_retries - 1:
-                print(
-                    f"Tentative {attempt + 1}/{max_retries}: Base de données non disponible: {e}"
-                )
-                time.sleep(retry_interval)
-            else:
-                print(f"Échec après {max_retries} tentatives: {e}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"Échec après {attempt} tentatives: {e}")
                 return False
+            print(f"Tentative {attempt}: base de données non disponible: {e}")
+            time.sleep(min(random.uniform(0, delay), remaining))
+            delay = min(delay * 2, max_delay)
 
-    return False
 
+def current_revision(connection):
+    return MigrationContext.configure(connection).get_current_revision()
 
-def initialize_database():
-    """Initialise la base de données si nécessaire."""
-    print("=== Initialisation de la base de données ===")
 
-    # Attendre que la base de données soit disponible
-    if not wait_for_database():
-        print("Échec: Base de données non disponible.")
-        return False
-
-    # Vérifier l'état actuel
-    is_initialized = check_database_initialized()
-    has_alembic_version = check_alembic_version()
-
-    print(
-        f"État initial - Base initialisée: {is_initialized}, Version Alembic: {has_alembic_version}"
+def has_application_tables(connection):
+    """True si les tables principales existent déjà (base créée hors Alembic)."""
+    existing_tables = inspect(connection).get_table_names()
+    return all(
+        table in existing_tables
+        for table in (User.__tablename__, GeneratedVideo.__tablename__)
     )
 
-    # Cas 1: Tout est déjà initialisé
-    if is_initialized and has_alembic_version:
-        print("La base de données est déjà complètement initialisée.")
-        return True
-
-    # Cas 2: Rien n'est initialisé
-    if not is_initialized and not has_alembic_version:
-        print("Génération de la migration initiale...")
-
-        # Générer la migration
-        if not run_alembic_command("revision --autogenerate -m 'Initial migration'"):
-            print("Échec de la génération de la migration.")
-            return False
 
-        # Appliquer la migration
-        if not run_alembic_command("upgrade head"):
-            print("Échec de l'application de la migration.")
+def has_current_columns(connection):
+    """True si les tables contiennent déjà toutes les colonnes des modèles."""
+    inspector = inspect(connection)
+    for model in (User, GeneratedVideo):
+        existing_columns = {
+            column["name"] for column in inspector.get_columns(model.__tablename__)
+        }
+        if not set(model.__table__.columns.keys()) <= existing_columns:
             return False
+    return True
 
-        print("Migration initiale appliquée avec succès.")
-        return True
 
-    # Cas 3: État incohérent (tables existent mais pas alembic_version, ou vice versa)
-    print("État incohérent détecté. Tentative de réparation...")
-
-    if is_initialized and not has_alembic_version:
-        print("Tables existent mais pas la table alembic_version.")
-        print("Création d'une migration factice pour synchroniser Alembic...")
-
-        # Créer une migration factice
-        if not run_alembic_command("revision -m 'Sync existing database'"):
-            print("Échec de la création de la migration factice.")
-            return False
-
-        # Appliquer la migration
-        if not run_alembic_command("upgrade head"):
-            print("Échec de l'application de la migration factice.")
-            return False
-
-        print("Base de données synchronisée avec Alembic.")
-        return True
-
-    if not is_initialized and has_alembic_version:
-        print("Table alembic_version existe mais pas les tables d'application.")
-        print("Suppression de la table alembic_version et réinitialisation...")
-
-        # Supprimer la table alembic_version
+@contextlib.contextmanager
+def migration_lock(connection):
+    """
+    Verrou exclusif de migration, tenu par ``connection`` : verrou consultatif
+    sous PostgreSQL, verrou de fichier à côté d'une base SQLite. Les autres
+    réplicas bloquent dessus jusqu'à la fin de la migration.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+        )
+        connection.commit()
         try:
-            from app.database.session import engine
-
-            with engine.connect() as connection:
-                connection.execute("DROP TABLE IF EXISTS alembic_version")
+            yield
+        finally:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+            connection.commit()
+    elif dialect == "sqlite" and connection.engine.url.database not in (
+        None,
+        "",
+        ":memory:",
+    ):
+        with open(f"{connection.engine.url.database}.migrate.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    else:
+        yield
+
+
+def bootstrap_database(engine=None, database_url=None):
+    """
+    Amène le schéma à la dernière révision. Retourne "up-to-date" si rien
+    n'était à faire, "migrated" si ce processus a appliqué les migrations,
+    "stamped" pour une base créée hors Alembic avec le schéma courant, None si
+    la base est injoignable.
+    """
+    if engine is None:
+        from app.database.session import engine
+
+    config = alembic_config(database_url or engine.url.render_as_string(False))
+    head = ScriptDirectory.from_config(config).get_current_head()
+
+    if not wait_for_database(engine):
+        return None
+
+    with engine.connect() as connection:
+        # Cas courant : un autre réplica (ou un déploiement précédent) a déjà migré
+        if current_revision(connection) == head:
+            return "up-to-date"
+        connection.commit()
+
+        with migration_lock(connection):
+            # Le détenteur précédent du verrou a peut-être déjà tout fait
+            revision = current_revision(connection)
+            connection.commit()
+            if revision == head:
+                return "up-to-date"
+
+            config.attributes["connection"] = connection
+            if revision is None and has_application_tables(connection):
+                # Tables créées sans Alembic (create_all) : on les rattache
+                if has_current_columns(connection):
+                    print("Tables existantes sans version Alembic, marquage à head.")
+                    command.stamp(config, "head")
+                    connection.commit()
+                    return "stamped"
+                # Un create_all plus ancien : seul le schéma initial est là,
+                # les migrations de colonnes restent à appliquer
+                print(
+                    "Tables existantes sans version Alembic, "
+                    f"marquage à {INITIAL_REVISION}."
+                )
+                command.stamp(config, INITIAL_REVISION)
                 connection.commit()
-                print("Table alembic_version supprimée.")
-        except Exception as e:
-            print(f"Erreur lors de la suppression de alembic_version: {e}")
-            return False
+                revision = INITIAL_REVISION
 
-        # Réinitialiser complètement
-        return initialize_database()
+            print(f"Migration de {revision or 'base vide'} vers {head}...")
+            command.upgrade(config, "head")
+            connection.commit()
+            return "migrated"
 
-    return False
+
+def initialize_database():
+    """Initialise la base de données si nécessaire."""
+    print("=== Initialisation de la base de données ===")
+    start = time.perf_counter()
+    outcome = bootstrap_database()
+    if outcome is None:
+        print("Échec: Base de données non disponible.")
+        return False
+    print(f"Base de données prête ({outcome}) en {time.perf_counter() - start:.2f}s.")
+    return True
 
 
 def main():
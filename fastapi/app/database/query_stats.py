@@ -0,0 +1,57 @@
+"""
+Per-request database statistics collected through SQLAlchemy engine events.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    __slots__ = ("count", "total_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+
+
+# The object is shared, not copied, when FastAPI runs sync endpoints in the
+# threadpool, so queries issued there are still attributed to the request.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _record(conn) -> None:
+    start = conn.info["query_start_times"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += time.perf_counter() - start
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record(conn)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failing statement (e.g. an IntegrityError on an insert race) never
+    # reaches after_cursor_execute; pop its start time so it does not stay
+    # behind on the pooled connection
+    conn = exception_context.connection
+    if (
+        conn is not None
+        and exception_context.statement is not None
+        and conn.info.get("query_start_times")
+    ):
+        _record(conn)
@@ -0,0 +1,226 @@
+"""
+Read-replica routing. Read-only dependencies get a ``RoutingSession`` that
+binds to a replica on its first query, unless the request's user committed a
+write more recently than the replicas' replication lag, in which case it stays
+on the primary (read-your-writes). Replicas lagging beyond
+``REPLICA_MAX_LAG_SECONDS`` or failing their lag probe are skipped until the
+next probe.
+
+Writes are tracked per process: stickiness covers the user's next requests
+served by the same API process, and replicas are only ever chosen once their
+measured lag is below the time elapsed since that user's last write.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+DB_READ_ROUTES_TOTAL = registry.counter(
+    "slopengine_db_read_routes_total",
+    "Read-only sessions bound to a database, by target and reason",
+    ["target", "reason"],
+)
+REPLICA_LAG_SECONDS = registry.gauge(
+    "slopengine_db_replica_lag_seconds",
+    "Last measured replication lag per replica (-1: unreachable)",
+    ["replica"],
+)
+
+# Replay lag of a streaming replica; NULL on a server that is not replaying
+# (a standalone database used as a replica in development counts as caught up)
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaPool:
+    """
+    Round-robin over replica engines, skipping those whose last probed lag is
+    above ``max_lag``. Each replica is probed at most once per
+    ``check_interval`` seconds, by whichever request notices the stale value.
+    """
+
+    def __init__(
+        self, engines: List[Engine], max_lag: float, check_interval: float = 1.0
+    ):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lags: List[Optional[float]] = [None] * len(engines)
+        self._checked_at = [float("-inf")] * len(engines)
+        self._cycle = itertools.cycle(range(len(engines)))
+        self._lock = threading.Lock()
+
+    def probe(self, engine: Engine) -> float:
+        """Replication lag of ``engine`` in seconds."""
+        if engine.dialect.name != "postgresql":
+            return 0.0
+        with engine.connect() as connection:
+            lag = connection.execute(POSTGRES_LAG_QUERY).scalar()
+        return float(lag or 0.0)
+
+    def lag(self, index: int) -> Optional[float]:
+        """Cached lag of replica ``index``, re-probed when stale; None if down."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at[index] < self.check_interval:
+                return self._lags[index]
+            # Claim the probe so concurrent requests keep using the old value
+            self._checked_at[index] = now
+        try:
+            lag = self.probe(self.engines[index])
+        except Exception as e:
+            logger.warning("Replica %d unavailable: %s", index, e)
+            lag = None
+        self._lags[index] = lag
+        REPLICA_LAG_SECONDS.set(-1 if lag is None else lag, replica=str(index))
+        return lag
+
+    def choose(self, max_lag: Optional[float] = None) -> Optional[int]:
+        """
+        Index of the next replica lagging less than ``max_lag`` (by default the
+        pool's limit), or None when every replica is behind or down.
+        """
+        limit = self.max_lag if max_lag is None else min(max_lag, self.max_lag)
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._cycle)
+            lag = self.lag(index)
+            if lag is not None and lag < limit:
+                return index
+        return None
+
+
+class WriteTracker:
+    """
+    Time of each subject's last committed write, kept for ``window`` seconds
+    (past that, no usable replica can be behind it). Bounded LRU.
+    """
+
+    def __init__(self, window: float, max_entries: int = 100000):
+        self.window = window
+        self.max_entries = max_entries
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, subject: str) -> None:
+        with self._lock:
+            self._writes[subject] = time.monotonic()
+            self._writes.move_to_end(subject)
+            while len(self._writes) > self.max_entries:
+                self._writes.popitem(last=False)
+
+    def since_last_write(self, subject: Optional[str]) -> Optional[float]:
+        """Seconds since ``subject`` last wrote, None if not within the window."""
+        if subject is None:
+            return None
+        with self._lock:
+            written_at = self._writes.get(subject)
+            if written_at is None:
+                return None
+            elapsed = time.monotonic() - written_at
+            if elapsed >= self.window:
+                del self._writes[subject]
+                return None
+            return elapsed
+
+
+def _subject(session: Session) -> Optional[str]:
+    state = session.info.get("request_state")
+    return getattr(state, "subject", None) if state is not None else None
+
+
+class RoutingSession(Session):
+    """
+    Session for read-only work. The bind is chosen on first use and kept for
+    the session's lifetime so one request reads from a single snapshot
+    source; flushes always go to the primary.
+    """
+
+    def __init__(
+        self,
+        *args,
+        replicas: Optional[ReplicaPool] = None,
+        writes: Optional[WriteTracker] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.writes = writes
+        self._routed_bind: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if self._flushing:
+            return primary
+        if self._routed_bind is None:
+            self._routed_bind = self._route(primary)
+        return self._routed_bind
+
+    @property
+    def on_replica(self) -> bool:
+        return self._routed_bind is not None and self._routed_bind is not self.bind
+
+    def use_primary(self) -> None:
+        """Send the rest of this session's reads to the primary."""
+        self.rollback()
+        self._routed_bind = self.bind
+
+    def _route(self, primary: Engine) -> Engine:
+        if not self.replicas or not self.replicas.engines:
+            return primary
+        max_lag = None
+        if self.writes is not None:
+            elapsed = self.writes.since_last_write(_subject(self))
+            if elapsed is not None:
+                # Lag may have grown since it was last probed
+                max_lag = elapsed - self.replicas.check_interval
+        index = (
+            self.replicas.choose(max_lag) if max_lag is None or max_lag > 0 else None
+        )
+        if index is None:
+            reason = "recent_write" if max_lag is not None else "replica_lag"
+            DB_READ_ROUTES_TOTAL.inc(target="primary", reason=reason)
+            return primary
+        DB_READ_ROUTES_TOTAL.inc(target="replica", reason="read")
+        return self.replicas.engines[index]
+
+
+def track_writes(factory: sessionmaker, writes: WriteTracker) -> None:
+    """
+    Record a write for the request's subject whenever a session from
+    ``factory`` commits after flushing or executing DML.
+    """
+
+    @event.listens_for(factory, "after_flush")
+    def _after_flush(session, flush_context):
+        session.info["wrote"] = True
+
+    @event.listens_for(factory, "do_orm_execute")
+    def _do_orm_execute(orm_execute_state):
+        if not orm_execute_state.is_select:
+            orm_execute_state.session.info["wrote"] = True
+
+    @event.listens_for(factory, "after_commit")
+    def _after_commit(session):
+        if session.info.pop("wrote", False):
+            subject = _subject(session)
+            if subject is not None:
+                writes.record(subject)
+
+    @event.listens_for(factory, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop("wrote", None)
@@ -2,7 +2,28 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.database.routing import ReplicaPool, RoutingSession, WriteTracker, track_writes
 
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Read-only sessions: routed to a replica when one is fresh enough, otherwise
+# to the primary (the only choice when no replica is configured)
+replica_pool = ReplicaPool(
+    [create_engine(url, pool_pre_ping=True) for url in settings.DATABASE_REPLICA_URLS],
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+)
+recent_writes = WriteTracker(
+    settings.REPLICA_MAX_LAG_SECONDS + settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS
+)
+track_writes(SessionLocal, recent_writes)
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    replicas=replica_pool,
+    writes=recent_writes,
+)
@@ -0,0 +1,16 @@
+from sqlalchemy.orm import Session
+
+
+def insert_for(db: Session, model):
+    """
+    INSERT construct of the session's dialect, which adds ``on_conflict_do_*``
+    (PostgreSQL in production, SQLite for local runs and benchmarks).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT upserts are not supported on {dialect}")
+    return insert(model)
@@ -1,12 +1,40 @@
 from typing import Generator
+from fastapi import Request
 from sqlalchemy.orm import Session
 
-from app.database.session import SessionLocal
+from app.database.session import ReadSessionLocal, SessionLocal
+from app.core.video_generation.service import VideoGenerationService
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_db(request: Request) -> Generator[Session, None, None]:
     db = SessionLocal()
+    # Commits record a write for the authenticated user (read-your-writes)
+    db.info["request_state"] = request.state
     try:
         yield db
     finally:
         db.close()
+
+
+def open_read_session(request_state) -> Session:
+    """
+    Read-only session routed for the subject in ``request_state``, owned by
+    the caller rather than by one request: work coalesced across requests
+    must not depend on the session of whichever request started it.
+    """
+    db = ReadSessionLocal()
+    db.info["request_state"] = request_state
+    return db
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Session for read-only endpoints, served by a replica when possible."""
+    db = open_read_session(request.state)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_video_service() -> VideoGenerationService:
+    return VideoGenerationService()
@@ -1,7 +1,17 @@
-from fastapi import FastAPI
+import hmac
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from app.config import settings
+from app.core.cache import close_caches
+from app.core.compression import JSONCompressionMiddleware
+from app.core.metrics import registry
+from app.core.video_generation.checkpoint import cleanup_orphaned_temp_dirs
+from app.core.middleware import RequestTimingMiddleware
+from app.core.oauth.base import oauth_transport
 from app.api.v1.router import router as api_v1_router
 
 
@@ -9,6 +19,7 @@ app = FastAPI(
     title="SlopEngine API",
     description="Video generation API using AI",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -20,6 +31,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/brotli for JSON bodies
+app.add_middleware(JSONCompressionMiddleware)
+
+# Per-route latency, request IDs and slow-request logging
+app.add_middleware(RequestTimingMiddleware)
+
 # Store frontend URL in app state for OAuth redirects
 app.state.frontend_url = settings.FRONTEND_URL
 
@@ -27,6 +44,21 @@ app.state.frontend_url = settings.FRONTEND_URL
 app.include_router(api_v1_router)
 
 
+@app.on_event("startup")
+def remove_orphaned_render_dirs():
+    cleanup_orphaned_temp_dirs()
+
+
+@app.on_event("shutdown")
+async def close_oauth_connections():
+    await oauth_transport.close()
+
+
+@app.on_event("shutdown")
+def close_shared_cache():
+    close_caches()
+
+
 @app.get("/")
 async def root():
     return {
@@ -40,3 +72,17 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not hmac.compare_digest((authorization or "").encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
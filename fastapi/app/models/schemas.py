@@ -1,6 +1,9 @@
+import re
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import Dict, Optional, Tuple
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+
+from app.config import settings
 
 
 # User schemas
@@ -27,6 +30,11 @@ class LoginRequest(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
@@ -34,12 +42,96 @@ class TokenData(BaseModel):
 
 
 # Video generation schemas
+RESOLUTION_PATTERN = re.compile(r"^([1-9][0-9]{1,4})x([1-9][0-9]{1,4})$")
+ALLOWED_RESOLUTIONS = frozenset(settings.ALLOWED_RESOLUTIONS)
+# TTS voice ids are alphanumeric; the id ends up in the provider's URL path
+VOICE_PATTERN = re.compile(r"^[A-Za-z0-9]{1,64}$")
+
+
 class VideoGenerationRequest(BaseModel):
+    """
+    Render parameters, validated up front so a request that cannot be
+    rendered is rejected (422) before any LLM call is paid for.
+    """
+
     prompt: str
     duration: int = 10
     resolution: str = "1920x1080"
+    # Scene preset (default, cinematic, neon, minimal); also guides the LLM
     style: Optional[str] = None
     fps: int = 30
+    # Voice-over of the enhanced prompt (needs NARRATION_ENABLED on the server)
+    narration: bool = False
+    voice: Optional[str] = None
+
+    @field_validator("resolution")
+    @classmethod
+    def check_resolution(cls, value: str) -> str:
+        match = RESOLUTION_PATTERN.match(value)
+        if match is None:
+            raise ValueError("resolution must be WIDTHxHEIGHT, e.g. 1280x720")
+        if ALLOWED_RESOLUTIONS and value not in ALLOWED_RESOLUTIONS:
+            raise ValueError(
+                f"resolution must be one of {', '.join(settings.ALLOWED_RESOLUTIONS)}"
+            )
+        width, height = int(match.group(1)), int(match.group(2))
+        # libx264 with yuv420p needs both dimensions divisible by 2
+        if width % 2 or height % 2:
+            raise ValueError("resolution width and height must be even")
+        return value
+
+    @field_validator("voice")
+    @classmethod
+    def check_voice(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and VOICE_PATTERN.match(value) is None:
+            raise ValueError("voice must be a voice id of 1 to 64 letters or digits")
+        return value
+
+    @field_validator("fps")
+    @classmethod
+    def check_fps(cls, value: int) -> int:
+        if not settings.MIN_VIDEO_FPS <= value <= settings.MAX_VIDEO_FPS:
+            raise ValueError(
+                f"fps must be between {settings.MIN_VIDEO_FPS} "
+                f"and {settings.MAX_VIDEO_FPS}"
+            )
+        return value
+
+    @field_validator("duration")
+    @classmethod
+    def check_duration(cls, value: int) -> int:
+        if not 1 <= value <= settings.MAX_VIDEO_DURATION:
+            raise ValueError(
+                f"duration must be between 1 and {settings.MAX_VIDEO_DURATION} seconds"
+            )
+        return value
+
+    @model_validator(mode="after")
+    def check_pixel_budget(self) -> "VideoGenerationRequest":
+        width, height = self.dimensions
+        if width * height * self.fps * self.duration > settings.MAX_RENDER_PIXELS:
+            raise ValueError(
+                "resolution x fps x duration exceeds the render budget; "
+                "lower one of them"
+            )
+        return self
+
+    @property
+    def dimensions(self) -> Tuple[int, int]:
+        width, height = self.resolution.split("x")
+        return int(width), int(height)
+
+    @property
+    def frames(self) -> int:
+        return self.duration * self.fps
+
+
+class RenderEstimate(BaseModel):
+    # Predicted from recent completed renders (defaults until there are any)
+    render_seconds: float
+    output_bytes: int
+    frames: int
+    samples: int
 
 
 class VideoGenerationResponse(BaseModel):
@@ -47,6 +139,28 @@ class VideoGenerationResponse(BaseModel):
     status: str
     message: str
     created_at: datetime
+    stage_timings: Optional[Dict[str, float]] = None
+    estimate: Optional[RenderEstimate] = None
+
+
+class VideoResponse(BaseModel):
+    id: int
+    video_id: str
+    user_id: int
+    prompt: str
+    duration: int
+    resolution: str
+    style: Optional[str] = None
+    fps: int
+    video_path: str
+    status: str
+    created_at: Optional[datetime] = None
+    stage_timings: Optional[Dict[str, float]] = None
+    size_bytes: Optional[int] = None
+    storage_tier: Optional[str] = None
+
+    class Config:
+        from_attributes = True
 
 
 # OAuth schemas
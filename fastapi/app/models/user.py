@@ -11,3 +11,6 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     password_hash = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped with every change to the user's video listing (ETag of
+    # GET /videos/user/{id})
+    listing_version = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import (
+    Boolean,
+    BigInteger,
+    Column,
+    Float,
+    Integer,
+    String,
+    DateTime,
+    Text,
+    JSON,
+    Index,
+    UniqueConstraint,
+)
 from datetime import datetime
 
 from app.models.base import Base
@@ -15,6 +27,55 @@ class GeneratedVideo(Base):
     resolution = Column(String, nullable=False)
     style = Column(String, nullable=True)
     fps = Column(Integer, nullable=False)
+    narration = Column(Boolean, nullable=False, default=False)
+    voice = Column(String, nullable=True)
     video_path = Column(String, nullable=False)
     status = Column(String, nullable=False)
+    # Seconds spent per generation stage (enhance, render, encode, total)
+    stage_timings = Column(JSON, nullable=True)
+    # Learned throughput: frames rendered and encoded per second with the
+    # worker's render profile (pipeline, dedup, vfr), and the peak RSS of the
+    # worker process tree during the job
+    render_profile = Column(String, nullable=True)
+    render_fps = Column(Float, nullable=True)
+    peak_rss_bytes = Column(BigInteger, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Retention: bytes on disk, last download and tier (hot, cold, evicted)
+    size_bytes = Column(BigInteger, nullable=True)
+    last_accessed_at = Column(DateTime, nullable=True)
+    storage_tier = Column(String, nullable=False, default="hot")
+
+    # Render queue bookkeeping (status: queued, processing, completed, failed)
+    worker_id = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_generated_videos_status_created_at", "status", "created_at"),
+        Index(
+            "ix_generated_videos_user_id_last_accessed_at",
+            "user_id",
+            "last_accessed_at",
+        ),
+    )
+
+
+class IdempotencyKey(Base):
+    """Client-supplied Idempotency-Key of a POST /videos/generate call."""
+
+    __tablename__ = "idempotency_keys"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    key = Column(String, nullable=False)
+    video_id = Column(String, nullable=False)
+    # SHA-256 of the request body, so a key reused for another request is caught
+    request_hash = Column(String(64), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_id_key"),
+    )
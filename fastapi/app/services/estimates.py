@@ -0,0 +1,123 @@
+import statistics
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import get_cache
+from app.models.schemas import RenderEstimate, VideoGenerationRequest
+from app.models.video import GeneratedVideo
+from app.services.throughput import ThroughputService
+
+
+# Used until renders have completed: per-job overhead (a GPT-4 prompt
+# enhancement, concat), then render + encode time and output size per
+# megapixel of frames as measured with the inline pipeline on one core
+DEFAULT_COST_MODEL = {
+    "fixed_seconds": 3.0,
+    "seconds_per_megapixel": 0.08,
+    "bytes_per_megapixel": 2000.0,
+    "narration_seconds": 2.0,
+    "samples": 0,
+}
+
+FIXED_STAGES = ("enhance", "concat")
+VARIABLE_STAGES = ("render", "encode")
+
+
+def _megapixels(resolution: str, frames: int) -> float:
+    width, height = resolution.split("x")
+    return int(width) * int(height) * frames / 1e6
+
+
+def _median(values: List[float], default: float) -> float:
+    return statistics.median(values) if values else default
+
+
+class RenderEstimator:
+    """
+    Predicts render time and output size from the stage timings and sizes
+    of recent completed renders. The fitted model is shared through the
+    cache and refitted every ESTIMATE_REFRESH_SECONDS, so estimates cost no
+    query on the request path.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def model(self) -> Dict[str, float]:
+        return get_cache(
+            "render_cost_model", settings.ESTIMATE_REFRESH_SECONDS
+        ).get_or_load("model", self.fit)
+
+    def fit(self) -> Dict[str, float]:
+        rows = (
+            self.db.query(
+                GeneratedVideo.resolution,
+                GeneratedVideo.duration,
+                GeneratedVideo.fps,
+                GeneratedVideo.stage_timings,
+                GeneratedVideo.size_bytes,
+                GeneratedVideo.storage_tier,
+            )
+            .filter(
+                GeneratedVideo.status == "completed",
+                GeneratedVideo.stage_timings.isnot(None),
+            )
+            .order_by(GeneratedVideo.id.desc())
+            .limit(settings.ESTIMATE_HISTORY_SIZE)
+            .all()
+        )
+        self.db.commit()
+
+        fixed, per_megapixel, bytes_per_megapixel, narration = [], [], [], []
+        for row in rows:
+            megapixels = _megapixels(row.resolution, row.duration * row.fps)
+            timings = row.stage_timings or {}
+            if megapixels <= 0 or not any(
+                stage in timings for stage in VARIABLE_STAGES
+            ):
+                continue
+            fixed.append(sum(timings.get(stage, 0.0) for stage in FIXED_STAGES))
+            per_megapixel.append(
+                sum(timings.get(stage, 0.0) for stage in VARIABLE_STAGES) / megapixels
+            )
+            if timings.get("narration"):
+                narration.append(timings["narration"])
+            # Cold-tier copies were re-encoded and say nothing about renders
+            if row.size_bytes and row.storage_tier == "hot":
+                bytes_per_megapixel.append(row.size_bytes / megapixels)
+
+        return {
+            "fixed_seconds": _median(fixed, DEFAULT_COST_MODEL["fixed_seconds"]),
+            "seconds_per_megapixel": _median(
+                per_megapixel, DEFAULT_COST_MODEL["seconds_per_megapixel"]
+            ),
+            "bytes_per_megapixel": _median(
+                bytes_per_megapixel, DEFAULT_COST_MODEL["bytes_per_megapixel"]
+            ),
+            "narration_seconds": _median(
+                narration, DEFAULT_COST_MODEL["narration_seconds"]
+            ),
+            "samples": len(per_megapixel),
+        }
+
+    def estimate(self, request: VideoGenerationRequest) -> RenderEstimate:
+        model = self.model()
+        megapixels = _megapixels(request.resolution, request.frames)
+        # Throughput learned for this resolution beats scaling by pixel count
+        fps = ThroughputService(self.db).fps(request.resolution)
+        if fps:
+            seconds = model["fixed_seconds"] + request.frames / fps
+        else:
+            seconds = (
+                model["fixed_seconds"] + model["seconds_per_megapixel"] * megapixels
+            )
+        if settings.NARRATION_ENABLED and request.narration:
+            seconds += model["narration_seconds"]
+        return RenderEstimate(
+            render_seconds=round(seconds, 2),
+            output_bytes=int(model["bytes_per_megapixel"] * megapixels),
+            frames=request.frames,
+            samples=int(model["samples"]),
+        )
@@ -0,0 +1,92 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.metrics import registry
+from app.models.schemas import VideoGenerationRequest, VideoGenerationResponse
+from app.models.video import GeneratedVideo, IdempotencyKey
+
+
+IDEMPOTENT_REPLAYS_TOTAL = registry.counter(
+    "slopengine_idempotent_replays_total",
+    "POST /videos/generate retries answered with the job of an earlier call",
+)
+
+
+def request_fingerprint(request: VideoGenerationRequest) -> str:
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+
+class IdempotencyService:
+    """
+    Maps a client's Idempotency-Key to the video job its first call created.
+    The key row is committed in the same transaction as the job, so concurrent
+    retries race on the (user_id, key) unique constraint and only one of them
+    starts a render; the others replay the winner's current state.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def find(
+        self, user_id: int, key: str, request: VideoGenerationRequest
+    ) -> Optional[GeneratedVideo]:
+        row = (
+            self.db.query(IdempotencyKey, GeneratedVideo)
+            .outerjoin(
+                GeneratedVideo, GeneratedVideo.video_id == IdempotencyKey.video_id
+            )
+            .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .first()
+        )
+        if row is None:
+            return None
+
+        record, video = row
+        expires_at = record.created_at + timedelta(
+            hours=settings.IDEMPOTENCY_KEY_TTL_HOURS
+        )
+        gone = video is None or video.storage_tier == "evicted"
+        if gone or expires_at < datetime.utcnow():
+            # Expired, or the video is gone: the key is free to start a new job
+            self.db.delete(record)
+            self.db.commit()
+            return None
+
+        if record.request_hash != request_fingerprint(request):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request",
+            )
+        return video
+
+    def claim(
+        self,
+        user_id: int,
+        key: str,
+        request: VideoGenerationRequest,
+        video_id: str,
+    ) -> None:
+        """Add the key to the caller's transaction; the caller commits."""
+        self.db.add(
+            IdempotencyKey(
+                user_id=user_id,
+                key=key,
+                video_id=video_id,
+                request_hash=request_fingerprint(request),
+            )
+        )
+
+    def replay(self, video: GeneratedVideo) -> VideoGenerationResponse:
+        IDEMPOTENT_REPLAYS_TOTAL.inc()
+        return VideoGenerationResponse(
+            video_id=video.video_id,
+            status=video.status,
+            message=f"Video generation already requested ({video.status})",
+            created_at=video.created_at,
+            stage_timings=video.stage_timings,
+        )
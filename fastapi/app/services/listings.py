@@ -0,0 +1,39 @@
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.video import GeneratedVideo
+
+
+class ListingVersionService:
+    """
+    Per-user version of the video listing (GET /videos/user/{id}). Every
+    change to a listed column bumps the owner's users.listing_version in the
+    same transaction, so an unchanged version means an unchanged listing and
+    conditional requests are answered without running the listing query.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def version(self, user_id: int) -> int:
+        version = self.db.execute(
+            select(User.listing_version).where(User.id == user_id)
+        ).scalar()
+        self.db.commit()
+        return version or 0
+
+    def bump_user(self, user_id: int) -> None:
+        self._bump(User.id == user_id)
+
+    def bump(self, *conditions) -> None:
+        """Bump the owners of the videos matching ``conditions``."""
+        self._bump(User.id.in_(select(GeneratedVideo.user_id).where(*conditions)))
+
+    def _bump(self, condition) -> None:
+        self.db.execute(
+            update(User)
+            .where(condition)
+            .values(listing_version=User.listing_version + 1)
+            .execution_options(synchronize_session=False)
+        )
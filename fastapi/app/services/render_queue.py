@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.storage import LocalStorage
+from app.models.schemas import VideoGenerationRequest, VideoGenerationResponse
+from app.models.video import GeneratedVideo
+from app.services.idempotency import IdempotencyService
+from app.services.listings import ListingVersionService
+from app.services.throughput import render_profile
+
+
+class RenderQueueService:
+    """
+    Database-backed render queue. Jobs are GeneratedVideo rows; workers claim
+    them with SELECT ... FOR UPDATE SKIP LOCKED and hold a lease that they
+    extend through heartbeats. A job whose lease expired is claimable again.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(
+        self,
+        user_id: int,
+        request: VideoGenerationRequest,
+        video_id: str,
+        idempotency_key: Optional[str] = None,
+    ) -> GeneratedVideo:
+        job = GeneratedVideo(
+            video_id=video_id,
+            user_id=user_id,
+            prompt=request.prompt,
+            duration=request.duration,
+            resolution=request.resolution,
+            style=request.style,
+            fps=request.fps,
+            narration=request.narration,
+            voice=request.voice,
+            video_path=LocalStorage().video_path(video_id),
+            status="queued",
+            attempts=0,
+        )
+        self.db.add(job)
+        ListingVersionService(self.db).bump_user(user_id)
+        if idempotency_key:
+            IdempotencyService(self.db).claim(
+                user_id, idempotency_key, request, video_id
+            )
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def _claimable(self, now: datetime):
+        return or_(
+            GeneratedVideo.status == "queued",
+            and_(
+                GeneratedVideo.status == "processing",
+                GeneratedVideo.lease_expires_at < now,
+            ),
+        )
+
+    def claim(self, worker_id: str) -> Optional[GeneratedVideo]:
+        while True:
+            now = datetime.utcnow()
+            job_id = (
+                self.db.query(GeneratedVideo.id)
+                .filter(self._claimable(now))
+                .order_by(GeneratedVideo.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar()
+            )
+            if job_id is None:
+                self.db.commit()
+                return None
+
+            # Conditional update keeps the claim safe on databases without
+            # SKIP LOCKED (SQLite); on Postgres the row is already locked.
+            result = self.db.execute(
+                update(GeneratedVideo)
+                .where(GeneratedVideo.id == job_id, self._claimable(now))
+                .values(
+                    status="processing",
+                    worker_id=worker_id,
+                    heartbeat_at=now,
+                    lease_expires_at=now
+                    + timedelta(seconds=settings.WORKER_LEASE_SECONDS),
+                    attempts=GeneratedVideo.attempts + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                ListingVersionService(self.db).bump(GeneratedVideo.id == job_id)
+            self.db.commit()
+            if result.rowcount != 1:
+                continue
+
+            job = self.db.get(GeneratedVideo, job_id, populate_existing=True)
+            if job.attempts > settings.WORKER_MAX_ATTEMPTS:
+                job.status = "failed"
+                job.error = job.error or "Exceeded maximum render attempts"
+                job.worker_id = None
+                job.lease_expires_at = None
+                ListingVersionService(self.db).bump_user(job.user_id)
+                self.db.commit()
+                continue
+            return job
+
+    def active_resolutions(self) -> Dict[str, int]:
+        """
+        In-flight (leased) and claimable jobs per resolution, for sizing the
+        worker pool.
+        """
+        now = datetime.utcnow()
+        rows = (
+            self.db.query(GeneratedVideo.resolution, func.count())
+            .filter(
+                or_(
+                    self._claimable(now),
+                    and_(
+                        GeneratedVideo.status == "processing",
+                        GeneratedVideo.lease_expires_at >= now,
+                    ),
+                )
+            )
+            .group_by(GeneratedVideo.resolution)
+            .all()
+        )
+        self.db.commit()
+        return {resolution: count for resolution, count in rows}
+
+    def _owned(self, video_id: str, worker_id: str):
+        return and_(
+            GeneratedVideo.video_id == video_id,
+            GeneratedVideo.worker_id == worker_id,
+            GeneratedVideo.status == "processing",
+        )
+
+    def heartbeat(self, video_id: str, worker_id: str) -> bool:
+        """Extend the lease. Returns False if the job was lost to another worker."""
+        now = datetime.utcnow()
+        result = self.db.execute(
+            update(GeneratedVideo)
+            .where(self._owned(video_id, worker_id))
+            .values(
+                heartbeat_at=now,
+                lease_expires_at=now + timedelta(seconds=settings.WORKER_LEASE_SECONDS),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def complete(
+        self,
+        video_id: str,
+        worker_id: str,
+        response: VideoGenerationResponse,
+        render_fps: Optional[float] = None,
+        peak_rss_bytes: Optional[int] = None,
+    ) -> bool:
+        result = self.db.execute(
+            update(GeneratedVideo)
+            .where(self._owned(video_id, worker_id))
+            .values(
+                status="completed",
+                stage_timings=response.stage_timings,
+                render_profile=render_profile(),
+                render_fps=render_fps,
+                peak_rss_bytes=peak_rss_bytes,
+                size_bytes=LocalStorage().size(video_id),
+                last_accessed_at=datetime.utcnow(),
+                lease_expires_at=None,
+                error=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            ListingVersionService(self.db).bump(GeneratedVideo.video_id == video_id)
+        self.db.commit()
+        return result.rowcount == 1
+
+    def fail(self, video_id: str, worker_id: str, error: str) -> bool:
+        job = (
+            self.db.query(GeneratedVideo)
+            .filter(self._owned(video_id, worker_id))
+            .with_for_update()
+            .first()
+        )
+        if job is None:
+            self.db.commit()
+            return False
+        # Retry until the attempt budget is spent
+        job.status = (
+            "queued" if job.attempts < settings.WORKER_MAX_ATTEMPTS else "failed"
+        )
+        job.error = error
+        job.worker_id = None
+        job.lease_expires_at = None
+        ListingVersionService(self.db).bump_user(job.user_id)
+        self.db.commit()
+        return True
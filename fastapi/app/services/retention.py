@@ -0,0 +1,412 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, true, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.metrics import registry
+from app.core.storage import LocalStorage
+from app.core.video_generation.checkpoint import cleanup_orphaned_temp_dirs
+from app.core.video_generation.encoder import transcode
+from app.database.session import SessionLocal
+from app.models.video import GeneratedVideo
+from app.services.listings import ListingVersionService
+
+
+logger = logging.getLogger(__name__)
+
+RETENTION_VIDEOS_TOTAL = registry.counter(
+    "slopengine_retention_videos_total",
+    "Videos moved to the cold tier or evicted by the retention sweeper",
+    ["action"],
+)
+RETENTION_RECLAIMED_BYTES_TOTAL = registry.counter(
+    "slopengine_retention_reclaimed_bytes_total",
+    "Disk space reclaimed by the retention sweeper",
+    ["action"],
+)
+STORAGE_BYTES = registry.gauge(
+    "slopengine_storage_bytes",
+    "Bytes of rendered videos on disk, by storage tier",
+    ["tier"],
+)
+
+# Checkpoints of these jobs may still be resumed
+ACTIVE_STATUSES = ("queued", "processing")
+
+
+class RetentionService:
+    """
+    Disk-usage accounting and cleanup of rendered videos. Each step selects a
+    bounded batch in its own short transaction, works on files outside of
+    any transaction, then applies a conditional UPDATE, so the sweeper never
+    holds row locks while touching the disk and skips videos that were
+    watched while it was working on them.
+    """
+
+    def __init__(self, db: Session, storage: Optional[LocalStorage] = None):
+        self.db = db
+        self.storage = storage or LocalStorage()
+        self.batch_size = settings.RETENTION_BATCH_SIZE
+
+    def touch(self, video_id: str) -> None:
+        """Record a download, at most once per RETENTION_TOUCH_INTERVAL_SECONDS."""
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=settings.RETENTION_TOUCH_INTERVAL_SECONDS)
+        self.db.execute(
+            update(GeneratedVideo)
+            .where(
+                GeneratedVideo.video_id == video_id,
+                or_(
+                    GeneratedVideo.last_accessed_at.is_(None),
+                    GeneratedVideo.last_accessed_at < stale,
+                ),
+            )
+            .values(last_accessed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def sweep(self) -> Dict[str, int]:
+        started = datetime.utcnow()
+        report = dict.fromkeys(
+            (
+                "accounted",
+                "cold",
+                "cold_reclaimed_bytes",
+                "evicted",
+                "evicted_bytes",
+                "checkpoints_removed",
+                "temp_dirs_removed",
+            ),
+            0,
+        )
+        self._account(report)
+        if settings.RETENTION_MAX_AGE_DAYS is not None:
+            cutoff = started - timedelta(days=settings.RETENTION_MAX_AGE_DAYS)
+            self._evict_where(GeneratedVideo.created_at < cutoff, started, report)
+        if settings.RETENTION_COLD_AFTER_DAYS is not None:
+            self._move_cold(
+                started - timedelta(days=settings.RETENTION_COLD_AFTER_DAYS), report
+            )
+        if settings.RETENTION_USER_BUDGET_BYTES is not None:
+            for user_id, used in self._usage_by_user():
+                excess = used - settings.RETENTION_USER_BUDGET_BYTES
+                if excess > 0:
+                    self._evict_until(excess, started, report, user_id=user_id)
+        if settings.RETENTION_GLOBAL_BUDGET_BYTES is not None:
+            excess = self._usage() - settings.RETENTION_GLOBAL_BUDGET_BYTES
+            if excess > 0:
+                self._evict_until(excess, started, report)
+        report["checkpoints_removed"] = self._sweep_checkpoints()
+        report["temp_dirs_removed"] = cleanup_orphaned_temp_dirs()
+        self.update_gauges()
+        return report
+
+    def update_gauges(self) -> None:
+        rows = self.db.execute(
+            select(GeneratedVideo.storage_tier, func.sum(GeneratedVideo.size_bytes))
+            .where(GeneratedVideo.storage_tier != "evicted")
+            .group_by(GeneratedVideo.storage_tier)
+        ).all()
+        self.db.commit()
+        for tier in ("hot", "cold"):
+            STORAGE_BYTES.set(0, tier=tier)
+        for tier, used in rows:
+            STORAGE_BYTES.set(used or 0, tier=tier)
+
+    # Filters
+
+    def _stored(self):
+        return and_(
+            GeneratedVideo.status == "completed",
+            GeneratedVideo.storage_tier != "evicted",
+        )
+
+    def _last_used(self):
+        return func.coalesce(GeneratedVideo.last_accessed_at, GeneratedVideo.created_at)
+
+    def _eviction_order(self):
+        if settings.RETENTION_POLICY == "age":
+            return GeneratedVideo.created_at
+        return self._last_used()
+
+    def _untouched_since(self, started: datetime):
+        # Under LRU a video watched during the sweep is no longer a candidate
+        if settings.RETENTION_POLICY == "age":
+            return true()
+        return or_(
+            GeneratedVideo.last_accessed_at.is_(None),
+            GeneratedVideo.last_accessed_at < started,
+        )
+
+    # Steps
+
+    def _account(self, report: Dict[str, int]) -> None:
+        """Backfill size_bytes of videos stored before it was recorded."""
+        last_id = 0
+        while True:
+            rows = self.db.execute(
+                select(GeneratedVideo.id, GeneratedVideo.video_id)
+                .where(
+                    self._stored(),
+                    GeneratedVideo.size_bytes.is_(None),
+                    GeneratedVideo.id > last_id,
+                )
+                .order_by(GeneratedVideo.id)
+                .limit(self.batch_size)
+            ).all()
+            self.db.commit()
+            if not rows:
+                return
+
+            changes = []
+            for row in rows:
+                size = self.storage.size(row.video_id)
+                if size is None:
+                    changes.append(
+                        {"id": row.id, "size_bytes": 0, "storage_tier": "evicted"}
+                    )
+                else:
+                    changes.append({"id": row.id, "size_bytes": size})
+            # Bulk UPDATE ... WHERE id = :id, one statement per batch
+            self.db.execute(update(GeneratedVideo), changes)
+            ListingVersionService(self.db).bump(
+                GeneratedVideo.id.in_([change["id"] for change in changes])
+            )
+            self.db.commit()
+            report["accounted"] += len(changes)
+            last_id = rows[-1].id
+
+    def _usage(self) -> int:
+        used = self.db.execute(
+            select(func.sum(GeneratedVideo.size_bytes)).where(self._stored())
+        ).scalar()
+        self.db.commit()
+        return used or 0
+
+    def _usage_by_user(self) -> List:
+        rows = self.db.execute(
+            select(GeneratedVideo.user_id, func.sum(GeneratedVideo.size_bytes))
+            .where(self._stored())
+            .group_by(GeneratedVideo.user_id)
+            .having(
+                func.sum(GeneratedVideo.size_bytes)
+                > settings.RETENTION_USER_BUDGET_BYTES
+            )
+        ).all()
+        self.db.commit()
+        return rows
+
+    def _evict_until(
+        self,
+        excess: int,
+        started: datetime,
+        report: Dict[str, int],
+        user_id: Optional[int] = None,
+    ) -> None:
+        while excess > 0:
+            query = (
+                select(GeneratedVideo.id, GeneratedVideo.size_bytes)
+                .where(self._stored(), self._untouched_since(started))
+                .order_by(self._eviction_order())
+                .limit(self.batch_size)
+            )
+            if user_id is not None:
+                query = query.where(GeneratedVideo.user_id == user_id)
+            rows = self.db.execute(query).all()
+            self.db.commit()
+
+            ids = []
+            planned = excess
+            for row in rows:
+                if planned <= 0:
+                    break
+                ids.append(row.id)
+                planned -= row.size_bytes or 0
+            if not ids:
+                return
+            freed = self._evict_where(GeneratedVideo.id.in_(ids), started, report)
+            if freed == 0:
+                return
+            excess -= freed
+
+    def _evict_where(self, condition, started: datetime, report: Dict[str, int]) -> int:
+        """Evict the stored videos matching ``condition``, a batch at a time."""
+        freed = 0
+        while True:
+            ids = (
+                select(GeneratedVideo.id)
+                .where(condition, self._stored(), self._untouched_since(started))
+                .order_by(GeneratedVideo.id)
+                .limit(self.batch_size)
+                .scalar_subquery()
+            )
+            # Mark first: a crash before the unlink leaves an orphaned file
+            # rather than a row pointing at nothing
+            evicted = self.db.execute(
+                update(GeneratedVideo)
+                .where(GeneratedVideo.id.in_(ids))
+                .values(storage_tier="evicted")
+                .returning(
+                    GeneratedVideo.video_id,
+                    GeneratedVideo.video_path,
+                    GeneratedVideo.size_bytes,
+                )
+                .execution_options(synchronize_session=False)
+            ).all()
+            if evicted:
+                ListingVersionService(self.db).bump(
+                    GeneratedVideo.video_id.in_([row.video_id for row in evicted])
+                )
+            self.db.commit()
+            if not evicted:
+                return freed
+
+            for video_id, path, size in evicted:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self.storage.delete_renditions(video_id)
+                freed += size or 0
+            report["evicted"] += len(evicted)
+            report["evicted_bytes"] += sum(size or 0 for _, _, size in evicted)
+            RETENTION_VIDEOS_TOTAL.inc(len(evicted), action="evict")
+            RETENTION_RECLAIMED_BYTES_TOTAL.inc(
+                sum(size or 0 for _, _, size in evicted), action="evict"
+            )
+            if len(evicted) < self.batch_size:
+                return freed
+
+    def _move_cold(self, cutoff: datetime, report: Dict[str, int]) -> None:
+        failed = set()
+        while True:
+            rows = self.db.execute(
+                select(
+                    GeneratedVideo.id,
+                    GeneratedVideo.video_id,
+                    GeneratedVideo.video_path,
+                    GeneratedVideo.size_bytes,
+                )
+                .where(
+                    self._stored(),
+                    GeneratedVideo.storage_tier == "hot",
+                    self._last_used() < cutoff,
+                    GeneratedVideo.id.notin_(failed),
+                )
+                .order_by(self._last_used())
+                .limit(self.batch_size)
+            ).all()
+            self.db.commit()
+            if not rows:
+                return
+            for row in rows:
+                if not self._move_one_cold(row, cutoff, report):
+                    failed.add(row.id)
+
+    def _move_one_cold(self, row, cutoff: datetime, report: Dict[str, int]) -> bool:
+        cold_path = self.storage.video_path(row.video_id, tier="cold")
+        os.makedirs(os.path.dirname(cold_path), exist_ok=True)
+        partial = f"{cold_path}.partial"
+        try:
+            transcode(row.video_path, partial, settings.RETENTION_COLD_CRF)
+            original_size = os.path.getsize(row.video_path)
+            # Already compact videos are moved as they are
+            if os.path.getsize(partial) >= original_size:
+                shutil.copyfile(row.video_path, partial)
+            os.replace(partial, cold_path)
+        except (IOError, OSError):
+            logger.exception("Could not move %s to the cold tier", row.video_id)
+            if os.path.exists(partial):
+                os.remove(partial)
+            return False
+
+        size = os.path.getsize(cold_path)
+        result = self.db.execute(
+            update(GeneratedVideo)
+            .where(
+                GeneratedVideo.id == row.id,
+                GeneratedVideo.storage_tier == "hot",
+                self._last_used() < cutoff,
+            )
+            .values(storage_tier="cold", video_path=cold_path, size_bytes=size)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            ListingVersionService(self.db).bump(GeneratedVideo.id == row.id)
+        self.db.commit()
+        if result.rowcount != 1:
+            # Watched (or evicted) while re-encoding: keep the hot copy
+            os.remove(cold_path)
+            return True
+
+        os.remove(row.video_path)
+        # Previews of a video nobody watches are re-derived if ever asked for
+        self.storage.delete_renditions(row.video_id)
+        reclaimed = max(original_size - size, 0)
+        report["cold"] += 1
+        report["cold_reclaimed_bytes"] += reclaimed
+        RETENTION_VIDEOS_TOTAL.inc(action="cold")
+        RETENTION_RECLAIMED_BYTES_TOTAL.inc(reclaimed, action="cold")
+        return True
+
+    def _sweep_checkpoints(self) -> int:
+        """Remove stale checkpoints of jobs that will not be resumed."""
+        root = self.storage.checkpoint_root()
+        try:
+            names = os.listdir(root)
+        except FileNotFoundError:
+            return 0
+        now = time.time()
+        stale = []
+        for name in names:
+            try:
+                age = now - os.path.getmtime(os.path.join(root, name))
+            except OSError:
+                continue
+            if age > settings.RENDER_TEMP_MAX_AGE_SECONDS:
+                stale.append(name)
+
+        removed = 0
+        for start in range(0, len(stale), self.batch_size):
+            batch = stale[start : start + self.batch_size]
+            active = set(
+                self.db.execute(
+                    select(GeneratedVideo.video_id).where(
+                        GeneratedVideo.video_id.in_(batch),
+                        GeneratedVideo.status.in_(ACTIVE_STATUSES),
+                    )
+                ).scalars()
+            )
+            self.db.commit()
+            for name in batch:
+                if name not in active:
+                    shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+                    removed += 1
+        return removed
+
+
+def run_sweeper(stop: Optional[threading.Event] = None, once: bool = False) -> None:
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            report = RetentionService(db).sweep()
+            logger.info(
+                "Retention sweep took %.1fs: %s", time.perf_counter() - started, report
+            )
+        except Exception:
+            logger.exception("Retention sweep failed")
+        finally:
+            db.close()
+        if once:
+            return
+        stop.wait(settings.RETENTION_SWEEP_INTERVAL_SECONDS)
@@ -0,0 +1,105 @@
+import statistics
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import get_cache
+from app.models.video import GeneratedVideo
+
+
+# Peak RSS of a worker for resolutions with no completed job yet, measured
+# with the inline pipeline: interpreter, libraries and encoder baseline plus
+# frame buffers and x264 lookahead, which grow with the frame size
+DEFAULT_JOB_RSS = {"base_bytes": 160 * 1024 * 1024, "bytes_per_pixel": 200}
+
+THROUGHPUT_STAGES = ("render", "encode")
+
+
+def render_profile() -> str:
+    """Settings that change render throughput, e.g. ``inline+dedup``."""
+    parts = [settings.RENDER_PIPELINE]
+    if settings.RENDER_DEDUP_FRAMES:
+        parts.append("dedup")
+    if settings.RENDER_VFR:
+        parts.append("vfr")
+    return "+".join(parts)
+
+
+def render_fps(
+    frames: int, stage_timings: Optional[Dict[str, float]]
+) -> Optional[float]:
+    """Frames rendered and encoded per second of a job, from its stage timings."""
+    seconds = sum((stage_timings or {}).get(stage, 0.0) for stage in THROUGHPUT_STAGES)
+    return frames / seconds if seconds > 0 else None
+
+
+def _key(resolution: str, profile: str) -> str:
+    return f"{resolution}/{profile}"
+
+
+class ThroughputService:
+    """
+    Render throughput and memory per resolution and render profile, learned
+    from the render_fps and peak_rss_bytes of recent completed jobs. Like the
+    render estimates, the fitted table is shared through the cache.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def model(self) -> Dict[str, Dict[str, float]]:
+        return get_cache(
+            "render_throughput", settings.ESTIMATE_REFRESH_SECONDS
+        ).get_or_load("model", self.fit)
+
+    def fit(self) -> Dict[str, Dict[str, float]]:
+        rows = (
+            self.db.query(
+                GeneratedVideo.resolution,
+                GeneratedVideo.render_profile,
+                GeneratedVideo.render_fps,
+                GeneratedVideo.peak_rss_bytes,
+            )
+            .filter(
+                GeneratedVideo.status == "completed",
+                GeneratedVideo.render_profile.isnot(None),
+            )
+            .order_by(GeneratedVideo.id.desc())
+            .limit(settings.ESTIMATE_HISTORY_SIZE)
+            .all()
+        )
+        self.db.commit()
+
+        fps: Dict[str, list] = {}
+        peak_rss: Dict[str, list] = {}
+        for row in rows:
+            key = _key(row.resolution, row.render_profile)
+            if row.render_fps:
+                fps.setdefault(key, []).append(row.render_fps)
+            if row.peak_rss_bytes:
+                peak_rss.setdefault(key, []).append(row.peak_rss_bytes)
+
+        return {
+            key: {
+                "fps": statistics.median(fps[key]) if key in fps else None,
+                # Budgeting memory for the typical job is what OOMs a node
+                "peak_rss_bytes": max(peak_rss[key]) if key in peak_rss else None,
+                "samples": len(fps.get(key, ())),
+            }
+            for key in fps.keys() | peak_rss.keys()
+        }
+
+    def fps(self, resolution: str, profile: Optional[str] = None) -> Optional[float]:
+        entry = self.model().get(_key(resolution, profile or render_profile()))
+        return entry["fps"] if entry else None
+
+    def job_rss(self, resolution: str, profile: Optional[str] = None) -> int:
+        entry = self.model().get(_key(resolution, profile or render_profile()))
+        if entry and entry["peak_rss_bytes"]:
+            return int(entry["peak_rss_bytes"])
+        width, height = resolution.split("x")
+        pixels = int(width) * int(height)
+        return (
+            DEFAULT_JOB_RSS["base_bytes"] + DEFAULT_JOB_RSS["bytes_per_pixel"] * pixels
+        )
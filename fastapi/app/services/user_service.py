@@ -1,37 +1,141 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.config import settings
+from app.database.upsert import insert_for
 from app.models.user import User
 from app.models.schemas import UserCreate, UserResponse
-from app.core.security import get_password_hash, authenticate_user, create_access_token
+from app.core.security import (
+    get_password_hash,
+    authenticate_user,
+    create_access_token,
+    create_refresh_token,
+)
+from app.core.tokens import TokenError, decode_token
+
+
+class ProvisioningResult(NamedTuple):
+    created: int
+    existing: int
+    updated: int
 
 
 class UserService:
     def __init__(self, db: Session):
         self.db = db
 
+    def insert_user(self, email: str, password_hash: str) -> Optional[User]:
+        """
+        INSERT ... ON CONFLICT (email) DO NOTHING RETURNING: one statement, and
+        concurrent sign-ups for the same email cannot both succeed. Returns
+        None when the email is already registered.
+        """
+        stmt = (
+            insert_for(self.db, User)
+            .values(
+                email=email,
+                password_hash=password_hash,
+                created_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
+        )
+        user = self.db.scalars(stmt).first()
+        if user is not None:
+            # Keep the returned attributes instead of reloading them after commit
+            self.db.expunge(user)
+        self.db.commit()
+        return user
+
     def create_user(self, user_create: UserCreate) -> User:
-        # Check if user already exists
-        existing_user = (
-            self.db.query(User).filter(User.email == user_create.email).first()
+        user = self.insert_user(
+            user_create.email, get_password_hash(user_create.password)
         )
-        if existing_user:
+        if user is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
+        return user
 
-        # Create new user
-        user = User(
-            email=user_create.email,
-            password_hash=get_password_hash(user_create.password),
+    def bulk_create_users(
+        self,
+        users: Iterable[UserCreate],
+        update_passwords: bool = False,
+        chunk_size: Optional[int] = None,
+        hash_workers: Optional[int] = None,
+    ) -> ProvisioningResult:
+        """
+        Provision many accounts: passwords are bcrypt-hashed on a thread pool
+        (bcrypt releases the GIL) and rows are upserted a chunk per statement,
+        each chunk in its own short transaction. Existing accounts are left
+        alone unless ``update_passwords`` is set. Duplicate emails in the
+        input keep their first occurrence.
+        """
+        chunk_size = chunk_size or settings.PROVISIONING_CHUNK_SIZE
+        hash_workers = (
+            hash_workers or settings.PROVISIONING_HASH_WORKERS or os.cpu_count() or 1
         )
+        totals = ProvisioningResult(0, 0, 0)
+        seen = set()
+        chunk: List[UserCreate] = []
+        with ThreadPoolExecutor(max_workers=hash_workers) as pool:
+            for user in users:
+                if user.email in seen:
+                    continue
+                seen.add(user.email)
+                chunk.append(user)
+                if len(chunk) >= chunk_size:
+                    counts = self._upsert_chunk(chunk, update_passwords, pool)
+                    totals = ProvisioningResult(*map(sum, zip(totals, counts)))
+                    chunk = []
+            if chunk:
+                counts = self._upsert_chunk(chunk, update_passwords, pool)
+                totals = ProvisioningResult(*map(sum, zip(totals, counts)))
+        return totals
 
-        self.db.add(user)
+    def _upsert_chunk(
+        self,
+        chunk: List[UserCreate],
+        update_passwords: bool,
+        pool: ThreadPoolExecutor,
+    ) -> ProvisioningResult:
+        emails = [user.email for user in chunk]
+        known = set(self.db.scalars(select(User.email).where(User.email.in_(emails))))
         self.db.commit()
-        self.db.refresh(user)
+        # Without password updates, existing accounts need no (slow) hash
+        pending = (
+            chunk if update_passwords else [u for u in chunk if u.email not in known]
+        )
+        if not pending:
+            return ProvisioningResult(0, len(chunk), 0)
 
-        return user
+        hashes = pool.map(get_password_hash, [user.password for user in pending])
+        now = datetime.utcnow()
+        rows = [
+            {"email": user.email, "password_hash": password_hash, "created_at": now}
+            for user, password_hash in zip(pending, hashes)
+        ]
+        stmt = insert_for(self.db, User).values(rows)
+        if update_passwords:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[User.email],
+                set_={"password_hash": stmt.excluded.password_hash},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[User.email])
+        written = set(self.db.scalars(stmt.returning(User.email)))
+        self.db.commit()
+
+        updated = len(written & known)
+        created = len(written) - updated
+        return ProvisioningResult(created, len(chunk) - created - updated, updated)
 
     def authenticate(self, email: str, password: str) -> User:
         user = authenticate_user(self.db, email, password)
@@ -63,3 +167,23 @@ class UserService:
 
     def create_auth_token(self, user: User) -> str:
         return create_access_token(data={"sub": user.email})
+
+    def create_refresh_token(self, user: User) -> str:
+        return create_refresh_token(data={"sub": user.email})
+
+    def refresh_auth_token(self, refresh_token: str) -> str:
+        """New access token for a valid refresh token, without a password check."""
+        unauthorized = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        try:
+            email = decode_token(refresh_token, token_type="refresh").get("sub")
+        except TokenError:
+            raise unauthorized
+        # The account may have been deleted since the token was issued
+        user = self.db.query(User).filter(User.email == email).first()
+        if email is None or user is None:
+            raise unauthorized
+        return self.create_auth_token(user)
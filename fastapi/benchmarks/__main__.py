@@ -0,0 +1,139 @@
+"""
+Benchmark suite entry point.
+
+    python -m benchmarks run --output results.json [--suite render,auth,...]
+    python -m benchmarks compare results.json benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.common import configure_environment
+
+
+SUITES = (
+    "render",
+    "auth",
+    "http",
+    "middleware",
+    "serialization",
+    "workers",
+    "frame_ring",
+    "scene",
+    "dedup",
+    "narration",
+    "oauth",
+    "provisioning",
+    "bootstrap",
+    "cache",
+    "renditions",
+    "autotune",
+    "coalescing",
+    "replay",
+)
+
+
+def _run(args) -> int:
+    database_url = configure_environment(args.database_url)
+
+    # app modules read settings at import time, so import after configuring
+    from benchmarks.common import create_schema, new_report
+
+    create_schema()
+    report = new_report(database_url)
+
+    suites = args.suite.split(",") if args.suite else SUITES
+    for suite in suites:
+        print(f"== {suite}", file=sys.stderr)
+        if suite == "render":
+            from benchmarks import render as module
+        elif suite == "auth":
+            from benchmarks import auth as module
+        elif suite == "http":
+            from benchmarks import load as module
+        elif suite == "middleware":
+            from benchmarks import middleware as module
+        elif suite == "serialization":
+            from benchmarks import serialization as module
+        elif suite == "workers":
+            from benchmarks import workers as module
+        elif suite == "frame_ring":
+            from benchmarks import frame_ring as module
+        elif suite == "scene":
+            from benchmarks import scene as module
+        elif suite == "dedup":
+            from benchmarks import dedup as module
+        elif suite == "narration":
+            from benchmarks import narration as module
+        elif suite == "oauth":
+            from benchmarks import oauth as module
+        elif suite == "provisioning":
+            from benchmarks import provisioning as module
+        elif suite == "bootstrap":
+            from benchmarks import bootstrap as module
+        elif suite == "cache":
+            from benchmarks import cache as module
+        elif suite == "renditions":
+            from benchmarks import renditions as module
+        elif suite == "autotune":
+            from benchmarks import autotune as module
+        elif suite == "coalescing":
+            from benchmarks import coalescing as module
+        elif suite == "replay":
+            from benchmarks import replay as module
+        else:
+            print(f"Unknown suite: {suite}", file=sys.stderr)
+            return 2
+        report["results"].update(module.run(quick=args.quick))
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+def _compare(args) -> int:
+    from benchmarks.compare import compare_reports, load_report, print_comparison
+
+    rows = compare_reports(
+        load_report(args.current), load_report(args.baseline), args.threshold
+    )
+    print_comparison(rows)
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmark suites")
+    run.add_argument("--suite", help=f"Comma separated subset of {','.join(SUITES)}")
+    run.add_argument("--output", help="Write JSON results to this file")
+    run.add_argument("--quick", action="store_true", help="Smaller iteration counts")
+    run.add_argument(
+        "--database-url",
+        help="Database to benchmark against (default: BENCH_DATABASE_URL or SQLite)",
+    )
+    run.set_defaults(func=_run)
+
+    compare = commands.add_parser("compare", help="Flag regressions against a baseline")
+    compare.add_argument("current")
+    compare.add_argument("baseline")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown tolerated before flagging (default: 0.10)",
+    )
+    compare.set_defaults(func=_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
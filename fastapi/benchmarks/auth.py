@@ -0,0 +1,152 @@
+"""
+Auth-path latency: password login (bcrypt bound), token refresh, bearer
+token verification through ``get_current_user`` and raw JWT encode/decode
+throughput (python-jose versus the keyring fast path and its claims cache).
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+from benchmarks.common import latency_summary, metric, time_calls
+
+
+EMAIL = "bench-auth@example.com"
+PASSWORD = "benchmark-password"
+
+
+def _ensure_user():
+    from app.database.session import SessionLocal
+    from app.models.user import User
+    from app.core.security import get_password_hash
+
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.email == EMAIL).first():
+            db.add(User(email=EMAIL, password_hash=get_password_hash(PASSWORD)))
+            db.commit()
+    finally:
+        db.close()
+
+
+def _throughput(fn: Callable[[], object], iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def bench_jwt(iterations: int = 20000) -> Dict[str, Dict]:
+    from jose import jwt
+
+    from app.config import settings
+    from app.core.security import create_access_token
+    from app.core.tokens import _claims_cache, decode_token, get_keyring
+
+    claims = {"sub": EMAIL}
+    results = {}
+
+    def jose_encode():
+        return jwt.encode(
+            {**claims, "exp": datetime.utcnow() + timedelta(minutes=30)},
+            settings.SECRET_KEY,
+            algorithm=settings.ALGORITHM,
+        )
+
+    results["jwt.encode_per_s[jose]"] = metric(
+        _throughput(jose_encode, iterations), "tokens/s", True
+    )
+    results["jwt.encode_per_s[keyring]"] = metric(
+        _throughput(lambda: create_access_token(claims), iterations), "tokens/s", True
+    )
+
+    token = create_access_token(claims)
+    keyring = get_keyring()
+    results["jwt.decode_per_s[jose]"] = metric(
+        _throughput(
+            lambda: jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            ),
+            iterations,
+        ),
+        "tokens/s",
+        True,
+    )
+    results["jwt.decode_per_s[keyring]"] = metric(
+        _throughput(lambda: keyring.verify(token), iterations), "tokens/s", True
+    )
+    _claims_cache.clear()
+    results["jwt.decode_per_s[cached]"] = metric(
+        _throughput(lambda: decode_token(token), iterations), "tokens/s", True
+    )
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.core.security import create_access_token, get_current_user
+
+    _ensure_user()
+    iterations = 10 if quick else 50
+    results = {}
+
+    with TestClient(app) as client:
+
+        def login():
+            response = client.post(
+                "/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD}
+            )
+            assert response.status_code == 200, response.text
+
+        summary = latency_summary(time_calls(login, iterations))
+        results["auth.login_p50_ms"] = metric(summary["p50_ms"], "ms", False, **summary)
+
+        refresh_token = client.post(
+            "/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD}
+        ).json()["refresh_token"]
+
+        def refresh():
+            response = client.post(
+                "/api/v1/auth/refresh", json={"refresh_token": refresh_token}
+            )
+            assert response.status_code == 200, response.text
+
+        summary = latency_summary(time_calls(refresh, iterations))
+        results["auth.refresh_p50_ms"] = metric(
+            summary["p50_ms"], "ms", False, **summary
+        )
+
+        token = create_access_token(data={"sub": EMAIL})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def me():
+            response = client.get("/api/v1/users/me", headers=headers)
+            assert response.status_code == 200, response.text
+
+        summary = latency_summary(time_calls(me, iterations * 10))
+        results["auth.users_me_p50_ms"] = metric(
+            summary["p50_ms"], "ms", False, **summary
+        )
+
+    # The dependency alone, without HTTP and routing overhead
+    request = SimpleNamespace(state=SimpleNamespace())
+    loop = asyncio.new_event_loop()
+    try:
+        samples = time_calls(
+            lambda: loop.run_until_complete(
+                get_current_user(request=request, token=token)
+            ),
+            iterations * 20,
+        )
+    finally:
+        loop.close()
+    summary = latency_summary(samples)
+    results["auth.get_current_user_p50_ms"] = metric(
+        summary["p50_ms"], "ms", False, **summary
+    )
+    results.update(bench_jwt(2000 if quick else 20000))
+    return results
@@ -0,0 +1,185 @@
+"""
+Replays recorded job mixes (benchmarks/job_mixes.json, or the file named by
+BENCH_JOB_MIX) through the render worker pool: a fixed pool of processes
+versus the autotuned pool, on a node budgeted at BENCH_NODE_MEMORY_MB. Reports
+makespan, the peak RSS of all workers against that budget, the autotuner's
+decisions and the throughput learned per resolution.
+
+Jobs are {"at": seconds after the start, "resolution", "duration", "fps"}.
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+from benchmarks.common import metric
+from benchmarks.workers import WORKER_ENV, _wait_done
+
+
+MIXES_PATH = os.path.join(os.path.dirname(__file__), "job_mixes.json")
+FIXED_PROCESSES = 4
+
+
+def _worker_main(worker_id: str) -> None:
+    from app.core.video_generation.worker import RenderWorker
+    from benchmarks.fakes import make_video_service
+
+    # Surplus workers drain their job on SIGTERM, as with worker.py
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    worker = RenderWorker(worker_id=worker_id, service_factory=make_video_service)
+    worker.run_forever(stop)
+
+
+def load_mixes(path: Optional[str] = None) -> Dict[str, List[Dict]]:
+    with open(path or os.environ.get("BENCH_JOB_MIX") or MIXES_PATH) as f:
+        return json.load(f)
+
+
+def _feeder(jobs: List[Dict], video_ids: List[str]) -> threading.Thread:
+    from app.database.session import SessionLocal
+    from app.models.schemas import VideoGenerationRequest
+    from app.services.render_queue import RenderQueueService
+
+    def feed():
+        db = SessionLocal()
+        try:
+            queue = RenderQueueService(db)
+            start = time.monotonic()
+            for job, video_id in sorted(
+                zip(jobs, video_ids), key=lambda pair: pair[0]["at"]
+            ):
+                time.sleep(max(0.0, start + job["at"] - time.monotonic()))
+                request = VideoGenerationRequest(
+                    prompt="A lighthouse beam sweeping over a stormy sea",
+                    duration=job["duration"],
+                    resolution=job["resolution"],
+                    fps=job["fps"],
+                )
+                queue.enqueue(0, request, video_id=video_id)
+        finally:
+            db.close()
+
+    return threading.Thread(target=feed, name="job-mix-feeder")
+
+
+def _replay(jobs: List[Dict], tuner) -> Dict:
+    from app.config import settings
+    from app.core.cache import get_cache
+    from app.core.video_generation.autotune import WorkerPool, process_tree_rss
+
+    # Every run learns from what it renders itself
+    get_cache("render_throughput", settings.ESTIMATE_REFRESH_SECONDS).invalidate(
+        "model"
+    )
+    video_ids = [str(uuid.uuid4()) for _ in jobs]
+    pool = WorkerPool(_worker_main, f"replay-{uuid.uuid4().hex[:6]}", tuner, 0.5)
+    limits: Counter = Counter()
+    targets: List[int] = []
+    peak_rss = 0
+    baseline = process_tree_rss()
+    stop = threading.Event()
+
+    def supervise():
+        nonlocal peak_rss
+        next_adjust = 0.0
+        while not stop.is_set():
+            if time.monotonic() >= next_adjust:
+                decision = pool.adjust()
+                limits[decision.limit] += 1
+                targets.append(decision.target)
+                next_adjust = time.monotonic() + pool.interval
+            peak_rss = max(peak_rss, process_tree_rss() - baseline)
+            stop.wait(0.1)
+
+    feeder = _feeder(jobs, video_ids)
+    supervisor = threading.Thread(target=supervise, name="replay-supervisor")
+    start = time.perf_counter()
+    feeder.start()
+    supervisor.start()
+    try:
+        feeder.join()
+        statuses = _wait_done(video_ids, timeout=1800)
+    finally:
+        stop.set()
+        supervisor.join()
+        pool.shutdown()
+    return {
+        "makespan": time.perf_counter() - start,
+        "completed": sum(1 for s in statuses.values() if s[0] == "completed"),
+        "peak_rss": peak_rss,
+        "max_processes": max(targets, default=0),
+        "limits": dict(limits),
+    }
+
+
+def _learned_throughput() -> Dict[str, Dict]:
+    from app.database.session import SessionLocal
+    from app.services.throughput import ThroughputService
+
+    db = SessionLocal()
+    try:
+        model = ThroughputService(db).fit()
+    finally:
+        db.close()
+    return {
+        f"autotune.learned_fps[{key}]": metric(
+            entry["fps"] or 0.0,
+            "frames/s",
+            True,
+            peak_rss_bytes=entry["peak_rss_bytes"],
+            samples=entry["samples"],
+        )
+        for key, entry in model.items()
+    }
+
+
+def bench_mix(name: str, jobs: List[Dict], node_bytes: int) -> Dict[str, Dict]:
+    from app.core.video_generation.autotune import ConcurrencyTuner, memory_available
+
+    # Reserving all but node_bytes makes this host behave like a smaller node
+    available = memory_available() or node_bytes
+    pools = {
+        f"fixed{FIXED_PROCESSES}": ConcurrencyTuner(
+            min_processes=FIXED_PROCESSES, max_processes=FIXED_PROCESSES
+        ),
+        "autotune": ConcurrencyTuner(
+            max_processes=FIXED_PROCESSES,
+            memory_reserve_bytes=max(0, available - node_bytes),
+        ),
+    }
+    results = {}
+    for pool_name, tuner in pools.items():
+        run = _replay(jobs, tuner)
+        results[f"autotune.makespan_s[{name}:{pool_name}]"] = metric(
+            run["makespan"],
+            "s",
+            False,
+            jobs=len(jobs),
+            completed=run["completed"],
+            max_processes=run["max_processes"],
+            limits=run["limits"],
+        )
+        results[f"autotune.peak_rss[{name}:{pool_name}]"] = metric(
+            run["peak_rss"],
+            "bytes",
+            False,
+            node_bytes=node_bytes,
+            over_budget=run["peak_rss"] > node_bytes,
+        )
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    os.environ.update(WORKER_ENV)
+    node_bytes = int(os.environ.get("BENCH_NODE_MEMORY_MB", "1536")) * 1024 * 1024
+    results = {}
+    for name, jobs in load_mixes().items():
+        results.update(bench_mix(name, jobs[:4] if quick else jobs, node_bytes))
+    results.update(_learned_throughput())
+    return results
@@ -0,0 +1,114 @@
+"""
+Cold start of N replicas booting together against one database: each runs
+``bootstrap_database`` (what the container entrypoint does before uvicorn)
+as a separate process, released at the same instant. On an empty database
+exactly one replica should migrate while the rest wait on the migration
+lock; on an up-to-date one none should take the lock at all. The previous
+entrypoint (``alembic upgrade head`` in a subprocess) is timed for
+reference.
+
+Always runs on its own throwaway SQLite files, since it needs an empty
+database per scenario.
+"""
+
+import contextlib
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from benchmarks.common import metric, percentile
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _replica(database_url, barrier, results) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        from app.database.init_db import bootstrap_database
+        from app.database.session import engine
+
+        barrier.wait()
+        start = time.perf_counter()
+        outcome = bootstrap_database(engine)
+        results.put((outcome, time.perf_counter() - start))
+
+
+def _boot(database_url: str, replicas: int):
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(replicas)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_replica, args=(database_url, barrier, results))
+        for _ in range(replicas)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get(timeout=120) for _ in processes]
+    for process in processes:
+        process.join()
+    return [outcome for outcome, _ in outcomes], [seconds for _, seconds in outcomes]
+
+
+def _alembic_cli(database_url: str) -> float:
+    # alembic.ini hardcodes the Postgres URL; env.py reads it from the ini
+    with tempfile.NamedTemporaryFile("w", suffix=".ini", delete=False) as ini:
+        with open(os.path.join(PROJECT_DIR, "alembic.ini")) as source:
+            for line in source:
+                if line.startswith("sqlalchemy.url"):
+                    line = f"sqlalchemy.url = {database_url}\n"
+                elif line.startswith("script_location"):
+                    line = f"script_location = {os.path.join(PROJECT_DIR, 'alembic')}\n"
+                ini.write(line)
+    try:
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "alembic", "-c", ini.name, "upgrade", "head"],
+            cwd=PROJECT_DIR,
+            check=True,
+            capture_output=True,
+        )
+        return time.perf_counter() - start
+    finally:
+        os.unlink(ini.name)
+
+
+def _summary(name, outcomes, seconds, replicas) -> Dict[str, Dict]:
+    return {
+        f"bootstrap.{name}_max_ms[{replicas}]": metric(
+            max(seconds) * 1000,
+            "ms",
+            False,
+            p50_ms=round(percentile(seconds, 50) * 1000, 2),
+            migrated=outcomes.count("migrated"),
+            up_to_date=outcomes.count("up-to-date"),
+            failed=outcomes.count(None),
+        )
+    }
+
+
+def bench_bootstrap(replicas: int) -> Dict[str, Dict]:
+    directory = tempfile.mkdtemp(prefix="slopengine-bench-bootstrap-")
+    database_url = f"sqlite:///{os.path.join(directory, 'bootstrap.db')}"
+
+    results = {}
+    outcomes, seconds = _boot(database_url, replicas)
+    assert outcomes.count("migrated") == 1, outcomes
+    results.update(_summary("cold", outcomes, seconds, replicas))
+
+    outcomes, seconds = _boot(database_url, replicas)
+    assert outcomes.count("up-to-date") == replicas, outcomes
+    results.update(_summary("warm", outcomes, seconds, replicas))
+
+    results["bootstrap.alembic_cli_warm_ms"] = metric(
+        _alembic_cli(database_url) * 1000, "ms", False
+    )
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    return bench_bootstrap(4 if quick else 8)
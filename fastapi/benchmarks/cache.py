@@ -0,0 +1,153 @@
+"""
+Shared cache tier: several replicas (one ``Cache`` each, so one L1 each)
+serving a skewed key stream whose loader stands in for a database or LLM
+call. Compares L1 only (every replica misses on its own) with an L2 shared
+through the in-process stand-in and through a local Redis-protocol server,
+then measures coalescing of a burst of misses on one cold key and how fast
+an invalidation reaches the other replicas.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from benchmarks.common import latency_summary, metric
+
+
+LOAD_LATENCY = 0.002
+
+
+class _Loader:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, key: str):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return {"key": key, "payload": "x" * 256}
+
+
+def _replicas(name: str, count: int, backend, l1_ttl: float = 60.0):
+    from app.core.cache import Cache
+
+    return [Cache(name, ttl=300, backend=backend, l1_ttl=l1_ttl) for _ in range(count)]
+
+
+def _backend(kind: str, server):
+    if kind == "local":
+        return None
+    if kind == "memory":
+        from app.core.cache.memory import MemoryBackend
+
+        return MemoryBackend()
+    from app.core.cache.redis import RedisBackend
+
+    return RedisBackend(server.url)
+
+
+def bench_hit_rate(
+    kind: str, server, replicas: int, requests: int, keys: int
+) -> Dict[str, Dict]:
+    backend = _backend(kind, server)
+    caches = _replicas(f"bench-hits-{kind}", replicas, backend)
+    loader = _Loader(LOAD_LATENCY)
+    rng = random.Random(42)
+    stream = [
+        (i % replicas, f"k{min(int(rng.paretovariate(1.2)), keys)}")
+        for i in range(requests)
+    ]
+
+    def lookup(item):
+        replica, key = item
+        start = time.perf_counter()
+        caches[replica].get_or_load(key, lambda: loader(key))
+        return time.perf_counter() - start
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            samples = list(pool.map(lookup, stream))
+    finally:
+        if backend is not None:
+            backend.close()
+    summary = latency_summary(samples)
+    return {
+        f"cache.hit_rate[{kind}]": metric(
+            1 - loader.calls / requests,
+            "ratio",
+            True,
+            loads=loader.calls,
+            requests=requests,
+            replicas=replicas,
+        ),
+        f"cache.lookup_p99_ms[{kind}]": metric(
+            summary["p99_ms"], "ms", False, **summary
+        ),
+    }
+
+
+def bench_coalescing(kind: str, server, replicas: int, callers: int) -> Dict[str, Dict]:
+    backend = _backend(kind, server)
+    caches = _replicas(f"bench-flight-{kind}", replicas, backend)
+    loader = _Loader(0.05)
+    barrier = threading.Barrier(callers)
+
+    def lookup(i):
+        barrier.wait()
+        return caches[i % replicas].get_or_load("cold", lambda: loader("cold"))
+
+    try:
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            list(pool.map(lookup, range(callers)))
+    finally:
+        if backend is not None:
+            backend.close()
+    return {
+        f"cache.loads_per_cold_burst[{kind}]": metric(
+            loader.calls, "loads", False, callers=callers, replicas=replicas
+        )
+    }
+
+
+def bench_invalidation(kind: str, server, rounds: int) -> Dict[str, Dict]:
+    from app.core.cache.local import MISSING
+
+    backend = _backend(kind, server)
+    writer, reader = _replicas(f"bench-invalidate-{kind}", 2, backend)
+    samples = []
+    try:
+        for i in range(rounds):
+            key = f"k{i}"
+            writer.set(key, {"version": 1})
+            reader.get(key)
+            start = time.perf_counter()
+            writer.invalidate(key)
+            while reader.local.get(key) is not MISSING:
+                time.sleep(0.0001)
+            samples.append(time.perf_counter() - start)
+    finally:
+        backend.close()
+    summary = latency_summary(samples)
+    return {
+        f"cache.invalidation_p50_ms[{kind}]": metric(
+            summary["p50_ms"], "ms", False, **summary
+        )
+    }
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    from benchmarks.fakes import FakeRedisServer
+
+    requests = 2000 if quick else 20000
+    results = {}
+    with FakeRedisServer(latency=0.0002) as server:
+        for kind in ("local", "memory", "redis"):
+            results.update(bench_hit_rate(kind, server, 4, requests, keys=500))
+            results.update(bench_coalescing(kind, server, 4, callers=32))
+        for kind in ("memory", "redis"):
+            results.update(bench_invalidation(kind, server, 20 if quick else 200))
+    return results
@@ -0,0 +1,204 @@
+"""
+Request coalescing on dashboard reads: bursts of identical concurrent
+GET /users/me and GET /videos/user/{id} against a real uvicorn server, with
+the users cache cold before each burst. Counts the SQL statements a burst
+costs against the same number of requests made one at a time, then compares
+a full listing with a conditional one answered 304 from its ETag.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.common import latency_summary, metric
+from benchmarks.load import ServerThread
+
+
+EMAIL = "bench-coalescing@example.com"
+LISTED_VIDEOS = 50
+
+
+class _StatementCounter:
+    """Counts statements sent to any engine (primary and replicas)."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.count += 1
+
+    def __enter__(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        event.listen(Engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        event.remove(Engine, "before_cursor_execute", self)
+
+
+def _seed() -> Tuple[str, int]:
+    from app.core.security import create_access_token, get_password_hash
+    from app.database.session import SessionLocal
+    from app.models.user import User
+    from app.models.video import GeneratedVideo
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == EMAIL).first()
+        if not user:
+            user = User(email=EMAIL, password_hash=get_password_hash("bench"))
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+        missing = (
+            LISTED_VIDEOS - db.query(GeneratedVideo).filter_by(user_id=user.id).count()
+        )
+        for i in range(missing):
+            db.add(
+                GeneratedVideo(
+                    video_id=f"bench-coalescing-{user.id}-{i}",
+                    user_id=user.id,
+                    prompt="A paper boat drifting down a rainy street",
+                    duration=2,
+                    resolution="640x480",
+                    fps=24,
+                    video_path=f"/tmp/bench-coalescing-{i}.mp4",
+                    status="completed",
+                    stage_timings={"render": 1.2, "encode": 0.4},
+                    size_bytes=123456,
+                )
+            )
+        db.commit()
+        return create_access_token(data={"sub": EMAIL}), user.id
+    finally:
+        db.close()
+
+
+def _cold_users_cache() -> None:
+    from app.config import settings
+    from app.core.cache import get_cache
+
+    get_cache("users", settings.CACHE_USER_TTL_SECONDS).invalidate(EMAIL)
+
+
+async def _burst(
+    base_url: str, path: str, headers: Dict[str, str], size: int
+) -> List[httpx.Response]:
+    limits = httpx.Limits(max_connections=size)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=120
+    ) as client:
+        return await asyncio.gather(
+            *(client.get(path, headers=headers) for _ in range(size))
+        )
+
+
+async def _sequential(
+    base_url: str, path: str, headers: Dict[str, str], size: int
+) -> List[httpx.Response]:
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        responses = []
+        for _ in range(size):
+            _cold_users_cache()
+            responses.append(await client.get(path, headers=headers))
+        return responses
+
+
+def bench_bursts(
+    base_url: str,
+    paths: Dict[str, str],
+    headers: Dict[str, str],
+    size: int,
+    rounds: int,
+) -> Dict[str, Dict]:
+    results = {}
+    for name, path in paths.items():
+        statements = {}
+        for mode, send in (("sequential", _sequential), ("burst", _burst)):
+            errors = 0
+            with _StatementCounter() as counter:
+                for _ in range(rounds):
+                    _cold_users_cache()
+                    responses = asyncio.run(send(base_url, path, headers, size))
+                    errors += sum(1 for r in responses if r.status_code >= 400)
+            statements[mode] = counter.count / (rounds * size)
+            results[f"coalescing.{name}.statements_per_request[{mode}]"] = metric(
+                statements[mode], "statements", False, burst=size, errors=errors
+            )
+        results[f"coalescing.{name}.statement_reduction"] = metric(
+            statements["sequential"] / max(statements["burst"], 1e-9),
+            "x",
+            True,
+            burst=size,
+        )
+    return results
+
+
+async def _revalidate(
+    base_url: str, path: str, headers: Dict[str, str], total: int
+) -> Dict[str, List[float]]:
+    latencies: Dict[str, List[float]] = {"full": [], "not_modified": []}
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        etag = (await client.get(path, headers=headers)).headers["ETag"]
+        conditional = {**headers, "If-None-Match": etag}
+        for _ in range(total):
+            for kind, request_headers, expected in (
+                ("full", headers, 200),
+                ("not_modified", conditional, 304),
+            ):
+                start = time.perf_counter()
+                response = await client.get(path, headers=request_headers)
+                latencies[kind].append(time.perf_counter() - start)
+                assert response.status_code == expected, response.status_code
+    return latencies
+
+
+def bench_revalidation(
+    base_url: str, path: str, headers: Dict[str, str], total: int
+) -> Dict[str, Dict]:
+    latencies = asyncio.run(_revalidate(base_url, path, headers, total))
+    results = {}
+    for kind, samples in latencies.items():
+        summary = latency_summary(samples)
+        results[f"coalescing.listing.{kind}.p50_ms"] = metric(
+            summary["p50_ms"], "ms", False, videos=LISTED_VIDEOS, **summary
+        )
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    from app.main import app
+
+    token, user_id = _seed()
+    headers = {"Authorization": f"Bearer {token}"}
+    paths = {
+        "users_me": "/api/v1/users/me",
+        "listing": f"/api/v1/videos/user/{user_id}",
+    }
+    results = {}
+    with ServerThread(app) as server:
+        results.update(
+            bench_bursts(
+                server.base_url,
+                paths,
+                headers,
+                size=16 if quick else 64,
+                rounds=2 if quick else 10,
+            )
+        )
+        results.update(
+            bench_revalidation(
+                server.base_url, paths["listing"], headers, 50 if quick else 500
+            )
+        )
+    return results
@@ -0,0 +1,92 @@
+"""
+Shared helpers for the benchmark suite: environment setup, timing statistics
+and the JSON result format.
+"""
+
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+def configure_environment(database_url: Optional[str] = None) -> str:
+    """
+    Point the app at a throwaway database before any ``app`` module is
+    imported. Uses ``BENCH_DATABASE_URL`` (e.g. a local Postgres) when set,
+    otherwise a fresh SQLite file.
+    """
+    url = database_url or os.environ.get("BENCH_DATABASE_URL")
+    if not url:
+        path = os.path.join(tempfile.mkdtemp(prefix="slopengine-bench-"), "bench.db")
+        url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault(
+        "VIDEO_STORAGE_DIR", tempfile.mkdtemp(prefix="slopengine-bench-videos-")
+    )
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    return url
+
+
+def create_schema() -> None:
+    from app.database.session import engine
+    from app.models.base import Base
+    import app.models.user  # noqa: F401
+    import app.models.video  # noqa: F401
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """Summarize latencies given in seconds, reported in milliseconds."""
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000 if samples else 0.0,
+    }
+
+
+def time_calls(
+    fn: Callable[[], object], iterations: int, warmup: int = 1
+) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def metric(value: float, unit: str, higher_is_better: bool, **extra) -> Dict:
+    result = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+    result.update(extra)
+    return result
+
+
+def new_report(database_url: str) -> Dict:
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": database_url.split(":", 1)[0],
+        },
+        "results": {},
+    }
@@ -0,0 +1,50 @@
+"""
+Compare a benchmark report against a stored baseline and flag regressions.
+"""
+
+import json
+from typing import Dict, List
+
+
+def load_report(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_reports(
+    current: Dict, baseline: Dict, threshold: float = 0.10
+) -> List[Dict]:
+    """
+    Return one row per metric present in both reports. ``change`` is the
+    relative change in the "worse" direction: positive means slower/bigger.
+    """
+    rows = []
+    for name, base in sorted(baseline["results"].items()):
+        cur = current["results"].get(name)
+        if cur is None or not base["value"]:
+            continue
+        change = (cur["value"] - base["value"]) / abs(base["value"])
+        if base.get("higher_is_better"):
+            change = -change
+        rows.append(
+            {
+                "name": name,
+                "baseline": base["value"],
+                "current": cur["value"],
+                "unit": cur["unit"],
+                "change": change,
+                "regression": change > threshold,
+            }
+        )
+    return rows
+
+
+def print_comparison(rows: List[Dict]) -> None:
+    width = max((len(row["name"]) for row in rows), default=10)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else "ok"
+        print(
+            f"{row['name']:<{width}}  {row['baseline']:>12.3f} -> "
+            f"{row['current']:>12.3f} {row['unit']:<8} "
+            f"{row['change'] * 100:+7.1f}%  {flag}"
+        )
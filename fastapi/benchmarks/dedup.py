@@ -0,0 +1,130 @@
+"""
+Temporal deduplication on static-heavy clips: render time, encode time and
+output size with every frame rendered, with duplicate/dirty-rect reuse, and
+with duplicates dropped from a variable frame rate output.
+"""
+
+import os
+import time
+from typing import Dict
+
+from benchmarks.common import metric
+
+
+PROMPT = "A still life of a teapot on a wooden table"
+
+MODES = {
+    "full": {"RENDER_DEDUP_FRAMES": False, "RENDER_VFR": False},
+    "dedup": {"RENDER_DEDUP_FRAMES": True, "RENDER_VFR": False},
+    "dedup_vfr": {"RENDER_DEDUP_FRAMES": True, "RENDER_VFR": True},
+}
+
+
+def _title_card(width: int, height: int):
+    """Static background and caption with only a thin progress bar moving."""
+    from app.core.video_generation.scene import (
+        Keyframes,
+        Scene,
+        ShapeLayer,
+        SolidLayer,
+        TextLayer,
+    )
+
+    return Scene(
+        width,
+        height,
+        [
+            SolidLayer((24, 24, 32)),
+            TextLayer(PROMPT, y=height // 2, font_size=32),
+            ShapeLayer(
+                "rect",
+                width // 10,
+                height - 40,
+                Keyframes([(0.0, 0), (1.0, width * 8 // 10)]),
+                6,
+            ),
+        ],
+    )
+
+
+def bench_render(resolution: str = "1280x720", frames: int = 120) -> Dict[str, Dict]:
+    """Render-only time for a title card (every frame differs in a small rect)."""
+    from app.core.video_generation.frame_renderer import FrameBufferPool, FrameRenderer
+
+    width, height = map(int, resolution.split("x"))
+    results = {}
+    for dedup in (False, True):
+        renderer = FrameRenderer(
+            PROMPT, frames, width, height, dedup=dedup, scene=_title_card(width, height)
+        )
+        pool = FrameBufferPool(width, height)
+        kinds: Dict[str, int] = {}
+        start = time.perf_counter()
+        for _, _, change in renderer.render_range(0, frames, pool.take):
+            kinds[change.kind] = kinds.get(change.kind, 0) + 1
+        elapsed = time.perf_counter() - start
+        name = "dedup" if dedup else "full"
+        results[f"dedup.title_card_render_fps[{name}]"] = metric(
+            frames / elapsed, "frames/s", True, resolution=resolution, **kinds
+        )
+    return results
+
+
+def bench_pipeline(
+    resolution: str = "1280x720", duration: int = 6, fps: int = 24
+) -> Dict[str, Dict]:
+    """Whole render+encode of the static-heavy ``minimal`` preset."""
+    from app.config import settings
+    from app.core.metrics import StageTimer
+    from app.core.video_generation.service import RENDER_STAGE_SECONDS
+    from benchmarks.fakes import make_video_service
+
+    width, height = map(int, resolution.split("x"))
+    service = make_video_service()
+    original = {key: getattr(settings, key) for key in MODES["full"]}
+    results = {}
+    try:
+        for mode, overrides in MODES.items():
+            for key, value in overrides.items():
+                setattr(settings, key, value)
+            timer = StageTimer(RENDER_STAGE_SECONDS)
+            start = time.perf_counter()
+            path = service._create_simulated_video(
+                video_id=f"bench-dedup-{mode}",
+                prompt=PROMPT,
+                duration=duration,
+                width=width,
+                height=height,
+                fps=fps,
+                style="minimal",
+                timer=timer,
+            )
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(path)
+            os.remove(path)
+
+            results[f"dedup.minimal_seconds[{mode}]"] = metric(
+                elapsed,
+                "s",
+                False,
+                resolution=resolution,
+                frames=duration * fps,
+                render_s=timer.timings.get("render", 0.0),
+                encode_s=timer.timings.get("encode", 0.0),
+            )
+            results[f"dedup.minimal_bytes[{mode}]"] = metric(size, "bytes", False)
+    finally:
+        for key, value in original.items():
+            setattr(settings, key, value)
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    results = {}
+    if quick:
+        results.update(bench_render("640x360", frames=48))
+        results.update(bench_pipeline("640x360", duration=2, fps=12))
+    else:
+        results.update(bench_render())
+        results.update(bench_pipeline())
+    return results
@@ -0,0 +1,510 @@
+"""
+Offline stand-ins used by the benchmarks so no OpenAI key or network is needed.
+"""
+
+import asyncio
+import math
+import random
+import time
+from typing import Dict, NamedTuple, Optional
+
+from langchain_community.llms.fake import FakeListLLM
+
+from app.core.storage import LocalStorage
+from app.core.tts import TTSCache
+from app.core.tts.fake import FakeTTSClient
+from app.core.video_generation.service import VideoGenerationService
+
+
+ENHANCED_PROMPT = (
+    "A slow cinematic dolly shot across a neon-lit harbour at dusk, "
+    "reflections rippling on wet cobblestones"
+)
+
+
+def make_fake_llm(response: str = ENHANCED_PROMPT) -> FakeListLLM:
+    # FakeListLLM cycles through its responses, so one entry is enough
+    return FakeListLLM(responses=[response])
+
+
+def make_tts_cache(latency: float = 0.0) -> TTSCache:
+    return TTSCache(FakeTTSClient(latency=latency), LocalStorage().tts_cache_dir())
+
+
+def make_video_service(tts_latency: float = 0.0) -> VideoGenerationService:
+    return VideoGenerationService(
+        llm=make_fake_llm(), tts_cache=make_tts_cache(tts_latency)
+    )
+
+
+# z-score of the 99th percentile of a standard normal distribution
+_Z99 = 2.326
+
+
+class NetworkProfile(NamedTuple):
+    """
+    Latency and failures of a fake upstream: log-normal latency with the
+    given median and p99 (seconds), and a share of requests answered with
+    ``error_status`` instead.
+    """
+
+    median: float = 0.0
+    p99: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+    @classmethod
+    def from_dict(cls, spec: Dict) -> "NetworkProfile":
+        """From {"median_ms", "p99_ms", "error_rate", "error_status"}."""
+        median_ms = spec.get("median_ms", 0.0)
+        return cls(
+            median=median_ms / 1000,
+            p99=spec.get("p99_ms", median_ms) / 1000,
+            error_rate=spec.get("error_rate", 0.0),
+            error_status=spec.get("error_status", 503),
+        )
+
+    def delay(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        if self.p99 <= self.median:
+            return self.median
+        sigma = math.log(self.p99 / self.median) / _Z99
+        return self.median * math.exp(rng.gauss(0.0, sigma))
+
+    def fails(self, rng: random.Random) -> bool:
+        return self.error_rate > 0 and rng.random() < self.error_rate
+
+
+class FakeUpstream:
+    """
+    Base of the local stand-ins for remote APIs. Every request waits for a
+    delay drawn from ``profile`` and may be failed by it; requests and
+    injected failures are counted per path. Subclasses provide the routes
+    and point Settings at ``base_url`` once it is being served.
+    """
+
+    def __init__(self, profile: Optional[NetworkProfile] = None, seed: int = 0):
+        self.profile = profile or NetworkProfile()
+        self.requests: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        self.base_url = ""
+        self._rng = random.Random(seed)
+
+    def routes(self) -> list:
+        raise NotImplementedError
+
+    def configure(self, settings) -> None:
+        raise NotImplementedError
+
+    def app(self):
+        from starlette.applications import Starlette
+        from starlette.responses import JSONResponse
+
+        app = Starlette(routes=self.routes())
+
+        @app.middleware("http")
+        async def simulate_network(request, call_next):
+            path = request.url.path
+            self.requests[path] = self.requests.get(path, 0) + 1
+            await asyncio.sleep(self.profile.delay(self._rng))
+            if self.profile.fails(self._rng):
+                self.failures[path] = self.failures.get(path, 0) + 1
+                return JSONResponse(
+                    {"error": {"message": "Injected upstream failure"}},
+                    status_code=self.profile.error_status,
+                )
+            return await call_next(request)
+
+        return app
+
+
+class FakeOpenAIServer(FakeUpstream):
+    """OpenAI-compatible chat completions endpoint answering ENHANCED_PROMPT."""
+
+    API_KEY = "fake-openai-key"
+
+    def configure(self, settings) -> None:
+        settings.OPENAI_API_KEY = self.API_KEY
+        settings.OPENAI_BASE_URL = f"{self.base_url}/v1"
+
+    def routes(self) -> list:
+        from starlette.responses import JSONResponse
+        from starlette.routing import Route
+
+        async def chat_completions(request):
+            body = await request.json()
+            return JSONResponse(
+                {
+                    "id": f"chatcmpl-fake-{sum(self.requests.values())}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "gpt-4"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": ENHANCED_PROMPT,
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 60,
+                        "completion_tokens": 25,
+                        "total_tokens": 85,
+                    },
+                }
+            )
+
+        return [Route("/v1/chat/completions", chat_completions, methods=["POST"])]
+
+
+class FakeElevenLabsServer(FakeUpstream):
+    """
+    ElevenLabs-compatible text-to-speech endpoint. The audio is the tone of
+    FakeTTSClient (WAV, which ffmpeg probes by content like the real MP3).
+    """
+
+    API_KEY = "fake-elevenlabs-key"
+
+    def __init__(self, profile: Optional[NetworkProfile] = None, seed: int = 0):
+        super().__init__(profile, seed)
+        self.tts = FakeTTSClient()
+
+    def configure(self, settings) -> None:
+        settings.NARRATION_ENABLED = True
+        settings.TTS_PROVIDER = "elevenlabs"
+        settings.ELEVENLABS_API_KEY = self.API_KEY
+        settings.ELEVENLABS_BASE_URL = self.base_url
+
+    def routes(self) -> list:
+        from starlette.responses import JSONResponse, Response
+        from starlette.routing import Route
+
+        async def text_to_speech(request):
+            if request.headers.get("xi-api-key") != self.API_KEY:
+                return JSONResponse({"detail": "Invalid API key"}, status_code=401)
+            body = await request.json()
+            audio = self.tts.synthesize(body["text"], request.path_params["voice"])
+            return Response(audio, media_type="audio/mpeg")
+
+        return [Route("/v1/text-to-speech/{voice}", text_to_speech, methods=["POST"])]
+
+
+class FakeOAuthProvider(FakeUpstream):
+    """
+    Local Google-like (OpenID Connect) and GitHub-like OAuth provider. Every
+    request sleeps ``latency`` seconds (or follows ``profile``) to stand in
+    for the network round trip to the real provider, and is counted per path.
+    """
+
+    CLIENT_ID = "fake-client-id"
+    CLIENT_SECRET = "fake-client-secret"
+
+    def __init__(
+        self,
+        latency: float = 0.02,
+        profile: Optional[NetworkProfile] = None,
+        seed: int = 0,
+    ):
+        from authlib.jose import JsonWebKey
+
+        super().__init__(profile or NetworkProfile(latency, latency), seed)
+        self.key = JsonWebKey.generate_key(
+            "RSA", 2048, is_private=True, options={"kid": "fake-key-1"}
+        )
+
+    def configure(self, settings) -> None:
+        """Point the OAuth settings at this provider, served at ``base_url``."""
+        settings.GOOGLE_CLIENT_ID = self.CLIENT_ID
+        settings.GOOGLE_CLIENT_SECRET = self.CLIENT_SECRET
+        settings.GOOGLE_METADATA_URL = (
+            f"{self.base_url}/google/.well-known/openid-configuration"
+        )
+        settings.GITHUB_CLIENT_ID = self.CLIENT_ID
+        settings.GITHUB_CLIENT_SECRET = self.CLIENT_SECRET
+        settings.GITHUB_AUTHORIZE_URL = f"{self.base_url}/github/login/oauth/authorize"
+        settings.GITHUB_ACCESS_TOKEN_URL = (
+            f"{self.base_url}/github/login/oauth/access_token"
+        )
+        settings.GITHUB_API_BASE_URL = f"{self.base_url}/github/api/"
+
+    def _id_token(self, nonce: str) -> str:
+        from authlib.jose import jwt
+
+        now = int(time.time())
+        claims = {
+            "iss": f"{self.base_url}/google",
+            "aud": self.CLIENT_ID,
+            "sub": "fake-google-user",
+            "email": "fake.user@example.com",
+            "email_verified": True,
+            "name": "Fake User",
+            "picture": "https://example.com/avatar.png",
+            "nonce": nonce,
+            "iat": now,
+            "exp": now + 3600,
+        }
+        header = {"alg": "RS256", "kid": self.key.kid}
+        return jwt.encode(header, claims, self.key).decode()
+
+    def routes(self) -> list:
+        from starlette.responses import JSONResponse
+        from starlette.routing import Route
+
+        async def metadata(request):
+            google = f"{self.base_url}/google"
+            return JSONResponse(
+                {
+                    "issuer": google,
+                    "authorization_endpoint": f"{google}/authorize",
+                    "token_endpoint": f"{google}/token",
+                    "userinfo_endpoint": f"{google}/userinfo",
+                    "jwks_uri": f"{google}/jwks",
+                    "id_token_signing_alg_values_supported": ["RS256"],
+                }
+            )
+
+        async def jwks(request):
+            return JSONResponse({"keys": [self.key.as_dict(is_private=False)]})
+
+        async def google_token(request):
+            form = await request.form()
+            # The authorization code doubles as the nonce of the login
+            return JSONResponse(
+                {
+                    "access_token": "fake-google-access-token",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                    "id_token": self._id_token(form["code"]),
+                }
+            )
+
+        async def google_userinfo(request):
+            return JSONResponse({"email": "fake.user@example.com", "name": "Fake User"})
+
+        async def github_token(request):
+            return JSONResponse(
+                {
+                    "access_token": "fake-github-access-token",
+                    "token_type": "bearer",
+                    "scope": "user:email",
+                }
+            )
+
+        async def github_user(request):
+            return JSONResponse(
+                {
+                    "login": "fake-user",
+                    "name": "Fake User",
+                    "email": None,
+                    "avatar_url": "https://example.com/avatar.png",
+                }
+            )
+
+        async def github_emails(request):
+            return JSONResponse(
+                [
+                    {"email": "noreply@example.com", "primary": False},
+                    {
+                        "email": "fake.user@example.com",
+                        "primary": True,
+                        "verified": True,
+                    },
+                ]
+            )
+
+        return [
+            Route("/google/.well-known/openid-configuration", metadata),
+            Route("/google/jwks", jwks),
+            Route("/google/token", google_token, methods=["POST"]),
+            Route("/google/userinfo", google_userinfo),
+            Route("/github/login/oauth/access_token", github_token, methods=["POST"]),
+            Route("/github/api/user", github_user),
+            Route("/github/api/user/emails", github_emails),
+        ]
+
+
+class FakeUpstreams:
+    """
+    Serves a fake OpenAI, ElevenLabs and OAuth provider, each on its own
+    local port, with Settings pointed at them for the duration of the block.
+    ``profiles`` maps "openai", "tts" and "oauth" to their NetworkProfile.
+    """
+
+    def __init__(self, profiles: Optional[Dict[str, NetworkProfile]] = None):
+        profiles = profiles or {}
+        self.upstreams: Dict[str, FakeUpstream] = {
+            "openai": FakeOpenAIServer(profiles.get("openai"), seed=1),
+            "tts": FakeElevenLabsServer(profiles.get("tts"), seed=2),
+            "oauth": FakeOAuthProvider(profile=profiles.get("oauth"), seed=3),
+        }
+        self._servers = []
+        self._saved_settings: Dict = {}
+
+    def __enter__(self) -> "FakeUpstreams":
+        from app.config import settings
+        from app.core.oauth.base import oauth, register_oauth_providers
+        from benchmarks.load import ServerThread
+
+        self._saved_settings = dict(vars(settings))
+        for upstream in self.upstreams.values():
+            server = ServerThread(upstream.app()).__enter__()
+            self._servers.append(server)
+            upstream.base_url = server.base_url
+            upstream.configure(settings)
+        # authlib keeps the first client registered under a name
+        for name in ("google", "github"):
+            oauth._clients.pop(name, None)
+        register_oauth_providers()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        from app.config import settings
+
+        for server in reversed(self._servers):
+            server.__exit__(*exc)
+        self._servers = []
+        for name, value in self._saved_settings.items():
+            setattr(settings, name, value)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {
+                "requests": sum(upstream.requests.values()),
+                "failures": sum(upstream.failures.values()),
+            }
+            for name, upstream in self.upstreams.items()
+        }
+
+
+class FakeRedisServer:
+    """
+    Local server speaking the Redis protocol for the commands the shared cache
+    uses (GET, SET with PX/NX, DEL, PUBLISH, SUBSCRIBE, PING), so the cache's
+    client runs over real sockets. Every command waits ``latency`` seconds to
+    stand in for the network round trip.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        from app.core.cache.memory import MemoryBackend
+
+        self.latency = latency
+        self.store = MemoryBackend()
+        self.commands = 0
+        self.url = ""
+        self._subscribers: Dict[bytes, set] = {}
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "FakeRedisServer":
+        import threading
+
+        started = threading.Event()
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, "127.0.0.1", 0)
+            )
+            port = self._server.sockets[0].getsockname()[1]
+            self.url = f"redis://127.0.0.1:{port}/0"
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        async def shutdown():
+            self._server.close()
+            for writers in self._subscribers.values():
+                for writer in writers:
+                    writer.close()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    @staticmethod
+    def _bulk(value) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _read_command(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def _handle(self, reader, writer):
+        subscribed = []
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                self.commands += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(self._execute(args, writer, subscribed))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscribed:
+                self._subscribers[channel].discard(writer)
+            writer.close()
+
+    def _execute(self, args, writer, subscribed) -> bytes:
+        command = args[0].upper()
+        if command in (b"PING", b"SELECT", b"AUTH"):
+            return b"+OK\r\n"
+        if command == b"GET":
+            return self._bulk(self.store.get(args[1].decode()))
+        if command == b"SET":
+            options = [arg.upper() for arg in args[3:]]
+            ttl = 3600.0
+            if b"PX" in options:
+                ttl = int(args[3 + options.index(b"PX") + 1]) / 1000
+            stored = self.store.set(
+                args[1].decode(), args[2], ttl, only_if_missing=b"NX" in options
+            )
+            return b"+OK\r\n" if stored else b"$-1\r\n"
+        if command == b"DEL":
+            self.store.delete(*(key.decode() for key in args[1:]))
+            return b":%d\r\n" % (len(args) - 1)
+        if command == b"PUBLISH":
+            writers = self._subscribers.get(args[1], set())
+            message = (
+                b"*3\r\n"
+                + self._bulk(b"message")
+                + self._bulk(args[1])
+                + self._bulk(args[2])
+            )
+            for subscriber in writers:
+                subscriber.write(message)
+            return b":%d\r\n" % len(writers)
+        if command == b"SUBSCRIBE":
+            replies = []
+            for channel in args[1:]:
+                self._subscribers.setdefault(channel, set()).add(writer)
+                subscribed.append(channel)
+                replies.append(
+                    b"*3\r\n"
+                    + self._bulk(b"subscribe")
+                    + self._bulk(channel)
+                    + b":%d\r\n" % len(subscribed)
+                )
+            return b"".join(replies)
+        return b"-ERR unknown command\r\n"
@@ -0,0 +1,96 @@
+"""
+Renderer-to-encoder frame transport: the shared-memory ring versus pickling
+frames through a multiprocessing.Queue. The consumer only touches each frame
+(a checksum of one row) so the numbers measure transport, not encoding.
+"""
+
+import multiprocessing
+import time
+from typing import Dict
+
+import numpy as np
+
+from benchmarks.common import metric
+
+
+SHAPE = (1080, 1920, 3)
+
+
+def _ring_producer(handle: dict, frames: int) -> None:
+    from app.core.video_generation.frame_ring import FrameRing
+
+    ring = FrameRing.attach(handle)
+    try:
+        for seq in range(frames):
+            slot = ring.acquire_slot(seq)
+            slot[0, 0, 0] = seq % 256
+            ring.publish(seq)
+        ring.finish()
+    finally:
+        ring.close()
+
+
+def _queue_producer(queue, frames: int) -> None:
+    frame = np.zeros(SHAPE, dtype=np.uint8)
+    for seq in range(frames):
+        frame[0, 0, 0] = seq % 256
+        queue.put(frame)
+    queue.put(None)
+
+
+def bench_ring(frames: int, depth: int) -> float:
+    from app.core.video_generation.frame_ring import FrameRing
+
+    context = multiprocessing.get_context("spawn")
+    with FrameRing(SHAPE, depth, context) as ring:
+        producer = context.Process(target=_ring_producer, args=(ring.handle(), frames))
+        producer.start()
+        start = time.perf_counter()
+        received = 0
+        for _, frame in ring.frames(is_alive=producer.is_alive):
+            int(frame[0].sum())
+            received += 1
+        elapsed = time.perf_counter() - start
+        producer.join()
+    assert received == frames
+    return frames / elapsed
+
+
+def bench_queue(frames: int, depth: int) -> float:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue(maxsize=depth)
+    producer = context.Process(target=_queue_producer, args=(queue, frames))
+    producer.start()
+    start = time.perf_counter()
+    received = 0
+    while True:
+        frame = queue.get()
+        if frame is None:
+            break
+        int(frame[0].sum())
+        received += 1
+    elapsed = time.perf_counter() - start
+    producer.join()
+    assert received == frames
+    return frames / elapsed
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    frames = 60 if quick else 300
+    depths = (4,) if quick else (2, 4, 8)
+    results = {}
+    for depth in depths:
+        ring_fps = bench_ring(frames, depth)
+        queue_fps = bench_queue(frames, depth)
+        results[f"frame_ring.shm_fps[{depth}]"] = metric(
+            ring_fps, "frames/s", True, frames=frames, resolution="1920x1080"
+        )
+        results[f"frame_ring.queue_fps[{depth}]"] = metric(
+            queue_fps,
+            "frames/s",
+            True,
+            frames=frames,
+            resolution="1920x1080",
+            speedup=ring_fps / queue_fps,
+        )
+    return results
@@ -0,0 +1,174 @@
+"""
+HTTP load tests against a real uvicorn server running the full app with the
+LLM replaced by a fake.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.common import latency_summary, metric
+
+
+EMAIL = "bench-load@example.com"
+GENERATE_PAYLOAD = {
+    "prompt": "A paper boat drifting down a rainy street",
+    "duration": 1,
+    "resolution": "320x240",
+    "fps": 12,
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ServerThread:
+    def __init__(self, app):
+        import uvicorn
+
+        self.port = _free_port()
+        config = uvicorn.Config(
+            app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="on"
+        )
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+async def _load(
+    base_url: str,
+    make_request: Callable[[httpx.AsyncClient], "asyncio.Future"],
+    total: int,
+    concurrency: int,
+) -> Tuple[List[float], int, float]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker(client):
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await make_request(client)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=120
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def _seed(service) -> Tuple[str, int, str]:
+    """Create the benchmark user, a token and one video that can be downloaded."""
+    from app.database.session import SessionLocal
+    from app.models.user import User
+    from app.models.video import GeneratedVideo
+    from app.core.security import get_password_hash, create_access_token
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == EMAIL).first()
+        if not user:
+            user = User(email=EMAIL, password_hash=get_password_hash("bench"))
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+
+        video_id = "bench-download"
+        rendered = service._create_simulated_video(
+            video_id=video_id,
+            prompt=GENERATE_PAYLOAD["prompt"],
+            duration=1,
+            width=320,
+            height=240,
+            fps=12,
+        )
+
+        if not db.query(GeneratedVideo).filter_by(video_id=video_id).first():
+            db.add(
+                GeneratedVideo(
+                    video_id=video_id,
+                    user_id=user.id,
+                    prompt=GENERATE_PAYLOAD["prompt"],
+                    duration=1,
+                    resolution="320x240",
+                    fps=12,
+                    video_path=rendered,
+                    status="completed",
+                )
+            )
+            db.commit()
+        return create_access_token(data={"sub": EMAIL}), user.id, video_id
+    finally:
+        db.close()
+
+
+def run(quick: bool = False, concurrency: int = 8) -> Dict[str, Dict]:
+    from app.main import app
+    from app.dependencies import get_video_service
+    from benchmarks.fakes import make_video_service
+
+    app.dependency_overrides[get_video_service] = make_video_service
+    token, user_id, video_id = _seed(make_video_service())
+    headers = {"Authorization": f"Bearer {token}"}
+
+    scenarios = {
+        "generate": (
+            lambda c: c.post(
+                "/api/v1/videos/generate", json=GENERATE_PAYLOAD, headers=headers
+            ),
+            4 if quick else 20,
+        ),
+        "get_video": (
+            lambda c: c.get(f"/api/v1/videos/{video_id}", headers=headers),
+            50 if quick else 500,
+        ),
+        "user_videos": (
+            lambda c: c.get(f"/api/v1/videos/user/{user_id}", headers=headers),
+            100 if quick else 1000,
+        ),
+    }
+
+    results = {}
+    try:
+        with ServerThread(app) as server:
+            for name, (make_request, total) in scenarios.items():
+                latencies, errors, elapsed = asyncio.run(
+                    _load(server.base_url, make_request, total, concurrency)
+                )
+                summary = latency_summary(latencies)
+                results[f"http.{name}.rps"] = metric(
+                    total / elapsed, "req/s", True, concurrency=concurrency
+                )
+                results[f"http.{name}.p95_ms"] = metric(
+                    summary["p95_ms"], "ms", False, errors=errors, **summary
+                )
+    finally:
+        app.dependency_overrides.pop(get_video_service, None)
+    return results
@@ -0,0 +1,66 @@
+"""
+Per-request overhead of RequestTimingMiddleware, measured by driving a
+trivial ASGI app directly so no server or network noise is included.
+"""
+
+import asyncio
+import time
+from typing import Dict
+
+from benchmarks.common import metric
+
+
+# Overhead the middleware is allowed to add to every request
+BUDGET_US = 50.0
+
+
+async def _endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _drive(app, iterations: int) -> float:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/bench",
+        "headers": [(b"host", b"bench")],
+        "app": None,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / iterations
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    from app.core.middleware import RequestTimingMiddleware
+
+    iterations = 5_000 if quick else 50_000
+    wrapped = RequestTimingMiddleware(_endpoint, slow_request_ms=float("inf"))
+
+    async def measure():
+        await _drive(_endpoint, 100)
+        await _drive(wrapped, 100)
+        bare = await _drive(_endpoint, iterations)
+        timed = await _drive(wrapped, iterations)
+        return bare, timed
+
+    bare, timed = asyncio.run(measure())
+    overhead_us = (timed - bare) * 1_000_000
+    return {
+        "middleware.overhead_us": metric(
+            overhead_us,
+            "us",
+            False,
+            budget_us=BUDGET_US,
+            within_budget=overhead_us <= BUDGET_US,
+        )
+    }
@@ -0,0 +1,59 @@
+"""
+Narration overhead per job with a fake TTS provider that sleeps like a remote
+API: silent render, cold narration (synthesised while frames render) and
+warm narration (served from the audio cache).
+"""
+
+import os
+import time
+from typing import Dict
+
+from benchmarks.common import metric
+
+
+JOB = {
+    "prompt": "A paper boat drifting down a rainy street",
+    "duration": 4,
+    "resolution": "640x360",
+    "fps": 24,
+}
+
+
+def bench_narration(tts_latency: float = 1.0, **job) -> Dict[str, Dict]:
+    from app.config import settings
+    from app.models.schemas import VideoGenerationRequest
+    from benchmarks.fakes import make_video_service
+
+    job = {**JOB, **job}
+    service = make_video_service(tts_latency=tts_latency)
+    enabled = settings.NARRATION_ENABLED
+    settings.NARRATION_ENABLED = True
+    results = {}
+    try:
+        # Unique voice per run so the cold case really misses the cache
+        voice = f"bench{time.time_ns()}"
+        for name, narration in (("silent", False), ("cold", True), ("warm", True)):
+            request = VideoGenerationRequest(**job, narration=narration, voice=voice)
+            start = time.perf_counter()
+            response = service.generate_video(request, video_id=f"bench-tts-{name}")
+            elapsed = time.perf_counter() - start
+            os.remove(service.get_video_path(response.video_id))
+
+            timings = response.stage_timings
+            results[f"narration.job_seconds[{name}]"] = metric(
+                elapsed,
+                "s",
+                False,
+                tts_latency_s=tts_latency,
+                render_encode_s=timings.get("render", 0.0) + timings.get("encode", 0.0),
+                narration_wait_s=timings.get("narration", 0.0),
+            )
+    finally:
+        settings.NARRATION_ENABLED = enabled
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    if quick:
+        return bench_narration(tts_latency=0.5, duration=2)
+    return bench_narration()
@@ -0,0 +1,120 @@
+"""
+Outbound latency of the OAuth callbacks against a local fake provider that
+delays every request like a remote one: token exchange, ID token
+verification and profile lookups, with authlib's defaults ("legacy": a new
+connection per call, Google userinfo endpoint, sequential GitHub calls)
+versus the shared pool, TTL caches and concurrent calls.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Dict
+
+from benchmarks.common import latency_summary, metric
+
+
+REDIRECT_URI = "http://127.0.0.1/callback"
+
+
+def _legacy_registry(settings):
+    from authlib.integrations.starlette_client import OAuth
+
+    legacy = OAuth()
+    legacy.register(
+        name="google",
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+        server_metadata_url=settings.GOOGLE_METADATA_URL,
+        client_kwargs={"scope": "openid email profile"},
+    )
+    legacy.register(
+        name="github",
+        client_id=settings.GITHUB_CLIENT_ID,
+        client_secret=settings.GITHUB_CLIENT_SECRET,
+        access_token_url=settings.GITHUB_ACCESS_TOKEN_URL,
+        authorize_url=settings.GITHUB_AUTHORIZE_URL,
+        api_base_url=settings.GITHUB_API_BASE_URL,
+        client_kwargs={"scope": "user:email"},
+    )
+    return legacy
+
+
+async def _google_callback(registry, legacy: bool) -> None:
+    from app.core.oauth.base import get_google_user_info
+
+    # The fake provider echoes the authorization code as the ID token nonce
+    nonce = uuid.uuid4().hex
+    token = await registry.google.fetch_access_token(
+        code=nonce, redirect_uri=REDIRECT_URI
+    )
+    token["userinfo"] = await registry.google.parse_id_token(token, nonce=nonce)
+    if legacy:
+        await registry.google.userinfo(token=token)
+    else:
+        await get_google_user_info(token)
+
+
+async def _github_callback(registry, legacy: bool) -> None:
+    from app.core.oauth.base import get_github_user_info
+
+    token = await registry.github.fetch_access_token(
+        code="fake-code", redirect_uri=REDIRECT_URI
+    )
+    if legacy:
+        (await registry.github.get("user", token=token)).json()
+        (await registry.github.get("user/emails", token=token)).json()
+    else:
+        await get_github_user_info(token)
+
+
+def bench_callbacks(latency: float = 0.02, iterations: int = 50) -> Dict[str, Dict]:
+    from app.config import settings
+    from app.core.oauth.base import oauth, oauth_transport, register_oauth_providers
+    from benchmarks.fakes import FakeOAuthProvider
+    from benchmarks.load import ServerThread
+
+    provider = FakeOAuthProvider(latency=latency)
+    results = {}
+    with ServerThread(provider.app()) as server:
+        provider.base_url = server.base_url
+        provider.configure(settings)
+        register_oauth_providers()
+        registries = {"legacy": _legacy_registry(settings), "pooled": oauth}
+
+        loop = asyncio.new_event_loop()
+        try:
+            for name, callback in (
+                ("google", _google_callback),
+                ("github", _github_callback),
+            ):
+                for variant, registry in registries.items():
+                    legacy = variant == "legacy"
+                    # Warm-up loads discovery metadata and the JWKS
+                    loop.run_until_complete(callback(registry, legacy))
+                    before = sum(provider.requests.values())
+                    samples = []
+                    for _ in range(iterations):
+                        start = time.perf_counter()
+                        loop.run_until_complete(callback(registry, legacy))
+                        samples.append(time.perf_counter() - start)
+                    round_trips = (
+                        sum(provider.requests.values()) - before
+                    ) / iterations
+                    summary = latency_summary(samples)
+                    results[f"oauth.{name}_callback_p50_ms[{variant}]"] = metric(
+                        summary["p50_ms"],
+                        "ms",
+                        False,
+                        provider_latency_ms=latency * 1000,
+                        round_trips=round_trips,
+                        **summary,
+                    )
+            loop.run_until_complete(oauth_transport.close())
+        finally:
+            loop.close()
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    return bench_callbacks(iterations=10 if quick else 50)
@@ -0,0 +1,119 @@
+"""
+Account provisioning throughput: one ``create_user`` call per account versus
+``bulk_create_users`` (threaded bcrypt, chunked ON CONFLICT upserts), a
+re-import of the same accounts, and concurrent sign-ups racing for one
+email. bcrypt runs at a low cost factor so the database side stays visible.
+"""
+
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from benchmarks.common import metric
+
+
+BCRYPT_ROUNDS = 4
+
+
+def _accounts(count: int, prefix: str):
+    from app.models.schemas import UserCreate
+
+    return [
+        UserCreate(email=f"{prefix}-{i}@example.com", password=f"password-{i}")
+        for i in range(count)
+    ]
+
+
+def bench_provisioning(count: int = 2000, chunk_size: int = 500) -> Dict[str, Dict]:
+    from app.config import settings
+    from app.database.session import SessionLocal
+    from app.services.user_service import UserService
+
+    rounds = settings.BCRYPT_ROUNDS
+    settings.BCRYPT_ROUNDS = BCRYPT_ROUNDS
+    db = SessionLocal()
+    results = {}
+    try:
+        run_id = uuid.uuid4().hex[:8]
+        service = UserService(db)
+
+        accounts = _accounts(count, f"single-{run_id}")
+        start = time.perf_counter()
+        for account in accounts:
+            service.create_user(account)
+        single = count / (time.perf_counter() - start)
+
+        accounts = _accounts(count, f"bulk-{run_id}")
+        start = time.perf_counter()
+        created = service.bulk_create_users(accounts, chunk_size=chunk_size)
+        bulk = count / (time.perf_counter() - start)
+        assert created.created == count, created
+
+        start = time.perf_counter()
+        again = service.bulk_create_users(accounts, chunk_size=chunk_size)
+        reimport = count / (time.perf_counter() - start)
+        assert again.existing == count, again
+    finally:
+        db.close()
+        settings.BCRYPT_ROUNDS = rounds
+
+    results["users.create_per_s[single]"] = metric(
+        single, "users/s", True, accounts=count, bcrypt_rounds=BCRYPT_ROUNDS
+    )
+    results["users.create_per_s[bulk]"] = metric(
+        bulk,
+        "users/s",
+        True,
+        accounts=count,
+        chunk_size=chunk_size,
+        bcrypt_rounds=BCRYPT_ROUNDS,
+    )
+    results["users.create_per_s[reimport]"] = metric(
+        reimport, "users/s", True, accounts=count, chunk_size=chunk_size
+    )
+    return results
+
+
+def bench_signup_race(concurrency: int = 8) -> Dict[str, Dict]:
+    from fastapi import HTTPException
+
+    from app.database.session import SessionLocal
+    from app.models.schemas import UserCreate
+    from app.services.user_service import UserService
+
+    account = UserCreate(
+        email=f"race-{uuid.uuid4().hex[:8]}@example.com", password="password"
+    )
+
+    def sign_up(_):
+        db = SessionLocal()
+        try:
+            UserService(db).create_user(account)
+            return "created"
+        except HTTPException:
+            return "rejected"
+        except Exception:
+            return "error"
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(sign_up, range(concurrency)))
+    return {
+        "users.signup_race_created": metric(
+            outcomes.count("created"),
+            "accounts",
+            False,
+            concurrency=concurrency,
+            rejected=outcomes.count("rejected"),
+            errors=outcomes.count("error"),
+        )
+    }
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    results = {}
+    results.update(bench_provisioning(200 if quick else 2000))
+    results.update(bench_signup_race())
+    return results
@@ -0,0 +1,244 @@
+"""
+Render pipeline micro-benchmarks: frame render throughput, batched versus
+per-frame rendering, per-frame allocations (tracemalloc), encode throughput
+and peak RSS per job.
+"""
+
+import os
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import Dict, Sequence
+
+from benchmarks.common import metric
+
+
+RESOLUTIONS = ("512x512", "1280x720", "1920x1080")
+PROMPT = "A slow cinematic dolly shot across a neon-lit harbour at dusk"
+
+
+def _parse(resolution: str):
+    width, height = map(int, resolution.split("x"))
+    return width, height
+
+
+def bench_frame_render(
+    resolutions: Sequence[str] = RESOLUTIONS, frames: int = 30
+) -> Dict[str, Dict]:
+    from app.core.video_generation.frame_renderer import FrameBufferPool, FrameRenderer
+
+    results = {}
+    for resolution in resolutions:
+        width, height = _parse(resolution)
+        renderer = FrameRenderer(PROMPT, frames, width, height)
+        pool = FrameBufferPool(width, height)
+        renderer.render_into(pool.take(), 0)  # warm-up
+
+        start = time.perf_counter()
+        for i in range(frames):
+            renderer.render_into(pool.take(), i)
+        elapsed = time.perf_counter() - start
+
+        results[f"render.frame_fps[{resolution}]"] = metric(
+            frames / elapsed, "frames/s", True, frames=frames
+        )
+    return results
+
+
+def bench_batch_render(
+    resolutions: Sequence[str] = RESOLUTIONS, frames: int = 96
+) -> Dict[str, Dict]:
+    """render_frames blocks (RENDER_BATCH_BYTES) against the per-frame loop."""
+    import numpy as np
+
+    from app.core.video_generation.frame_renderer import (
+        FrameBufferPool,
+        FrameRenderer,
+        batch_frames,
+    )
+
+    results = {}
+    for resolution in resolutions:
+        width, height = _parse(resolution)
+
+        renderer = FrameRenderer(PROMPT, frames, width, height)
+        pool = FrameBufferPool(width, height)
+        start = time.perf_counter()
+        for _ in renderer.render_range(0, frames, pool.take):
+            pass
+        per_frame = time.perf_counter() - start
+
+        renderer = FrameRenderer(PROMPT, frames, width, height)
+        batch = batch_frames(width, height)
+        block = np.empty((batch, height, width, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        changes = renderer.changes(0, frames)
+        for offset in range(0, frames, batch):
+            size = min(batch, frames - offset)
+            renderer.render_frames(
+                offset, size, block[:size], changes[offset : offset + size]
+            )
+        batched = time.perf_counter() - start
+
+        results[f"render.batch_fps[{resolution}]"] = metric(
+            frames / batched,
+            "frames/s",
+            True,
+            batch=batch,
+            per_frame_fps=frames / per_frame,
+            speedup=per_frame / batched,
+        )
+    return results
+
+
+def _traced(render_frame, frames: int) -> Dict[str, int]:
+    tracemalloc.start()
+    try:
+        start_current, _ = tracemalloc.get_traced_memory()
+        before = tracemalloc.take_snapshot()
+        for i in range(frames):
+            render_frame(i)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # Blocks still alive after the loop, i.e. allocations that were retained
+    retained = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.count_diff > 0
+    )
+    return {"peak": peak - start_current, "retained_blocks": retained}
+
+
+def bench_frame_allocations(
+    resolutions: Sequence[str] = RESOLUTIONS, frames: int = 30
+) -> Dict[str, Dict]:
+    """Peak traced allocation while rendering: per-frame images vs pooled buffers."""
+    from app.core.video_generation.frame_renderer import FrameBufferPool, FrameRenderer
+    from benchmarks.fakes import make_video_service
+
+    service = make_video_service()
+    results = {}
+    for resolution in resolutions:
+        width, height = _parse(resolution)
+        renderer = FrameRenderer(PROMPT, frames, width, height)
+        pool = FrameBufferPool(width, height)
+        frame_bytes = width * height * 3
+
+        pooled = _traced(lambda i: renderer.render_into(pool.take(), i), frames)
+        per_frame = _traced(
+            lambda i: service._create_frame(PROMPT, i, frames, width, height), frames
+        )
+        results[f"render.alloc_peak_bytes[{resolution}]"] = metric(
+            pooled["peak"],
+            "bytes",
+            False,
+            frames=frames,
+            frame_bytes=frame_bytes,
+            retained_blocks=pooled["retained_blocks"],
+            unpooled_peak_bytes=per_frame["peak"],
+        )
+    return results
+
+
+def bench_encode(resolution: str = "1280x720", frames: int = 60, fps: int = 30):
+    from app.core.video_generation.encoder import FrameEncoder
+    from app.core.video_generation.frame_renderer import FrameRenderer
+
+    width, height = _parse(resolution)
+    renderer = FrameRenderer(PROMPT, frames, width, height)
+    clip_frames = [renderer.render(i) for i in range(frames)]
+
+    temp_dir = tempfile.mkdtemp(prefix="slopengine-bench-")
+    try:
+        path = os.path.join(temp_dir, "encode.mp4")
+        start = time.perf_counter()
+        with FrameEncoder(path, width, height, fps) as encoder:
+            for frame in clip_frames:
+                encoder.write(frame)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        f"encode.fps[{resolution}]": metric(frames / elapsed, "frames/s", True),
+        f"encode.bytes[{resolution}]": metric(size, "bytes", False, frames=frames),
+    }
+
+
+def _current_rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _rss_job(resolution: str, duration: int, fps: int) -> Dict[str, int]:
+    # Runs in a fresh process so ru_maxrss reflects this job only
+    from benchmarks.fakes import make_video_service
+
+    service = make_video_service()
+    baseline = _current_rss()
+    width, height = _parse(resolution)
+    tracemalloc.start()
+    try:
+        path = service._create_simulated_video(
+            video_id="rss-probe",
+            prompt=PROMPT,
+            duration=duration,
+            width=width,
+            height=height,
+            fps=fps,
+        )
+        _, traced_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # ru_maxrss is reported in KiB on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    os.remove(path)
+    return {"baseline": baseline, "peak": peak, "traced_peak": traced_peak}
+
+
+def bench_peak_rss(
+    resolutions: Sequence[str] = ("512x512", "1280x720"),
+    duration: int = 2,
+    fps: int = 24,
+) -> Dict[str, Dict]:
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for resolution in resolutions:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            rss = pool.submit(_rss_job, resolution, duration, fps).result()
+        results[f"job.peak_rss[{resolution}]"] = metric(
+            rss["peak"],
+            "bytes",
+            False,
+            job_delta_bytes=rss["peak"] - rss["baseline"],
+            traced_peak_bytes=rss["traced_peak"],
+            frames=duration * fps,
+        )
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    results = {}
+    if quick:
+        results.update(bench_frame_render(("512x512", "1280x720"), frames=10))
+        results.update(bench_batch_render(("320x240", "512x512", "1280x720")))
+        results.update(bench_frame_allocations(("512x512",), frames=10))
+        results.update(bench_encode("512x512", frames=24))
+        results.update(bench_peak_rss(("512x512",), duration=1))
+    else:
+        results.update(bench_frame_render())
+        results.update(bench_batch_render(("320x240", "640x360") + RESOLUTIONS))
+        results.update(bench_frame_allocations())
+        results.update(bench_encode())
+        results.update(bench_peak_rss())
+    return results
@@ -0,0 +1,92 @@
+"""
+Derived renditions: encode time and size of each format relative to the
+master MP4, WebM with software AV1 versus VP9, and a burst of concurrent
+first requests for one rendition (should encode once).
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from benchmarks.common import metric
+
+
+def _master(duration: int) -> str:
+    from app.models.schemas import VideoGenerationRequest
+    from benchmarks.fakes import make_video_service
+
+    service = make_video_service()
+    request = VideoGenerationRequest(
+        prompt="A paper boat drifting down a rainy street",
+        duration=duration,
+        resolution="1280x720",
+        fps=24,
+    )
+    return service.generate_video(request).video_id
+
+
+def bench_formats(video_id: str) -> Dict[str, Dict]:
+    from app.config import settings
+    from app.core.storage import LocalStorage
+    from app.core.video_generation.renditions import RENDITIONS, RenditionService
+
+    storage = LocalStorage()
+    service = RenditionService(storage)
+    master_size = storage.size(video_id)
+    results = {}
+    codec = settings.RENDITION_WEBM_CODEC
+    variants = [("gif", None), ("webp", None), ("webm", "libaom-av1")]
+    variants.append(("webm", "libvpx-vp9"))
+    try:
+        for format, webm_codec in variants:
+            if webm_codec:
+                settings.RENDITION_WEBM_CODEC = webm_codec
+            storage.delete_renditions(video_id)
+            start = time.perf_counter()
+            path = service.path_for(video_id, format)
+            elapsed = time.perf_counter() - start
+            name = f"{format}:{webm_codec}" if webm_codec else format
+            results[f"renditions.encode_ms[{name}]"] = metric(
+                elapsed * 1000,
+                "ms",
+                False,
+                bytes=os.path.getsize(path),
+                size_vs_master=round(os.path.getsize(path) / master_size, 3),
+                media_type=RENDITIONS[format].media_type,
+            )
+    finally:
+        settings.RENDITION_WEBM_CODEC = codec
+    return results
+
+
+def bench_coalescing(video_id: str, callers: int = 8) -> Dict[str, Dict]:
+    from app.core.storage import LocalStorage
+    from app.core.video_generation.renditions import RENDITIONS_TOTAL, RenditionService
+
+    storage = LocalStorage()
+    storage.delete_renditions(video_id)
+    before = RENDITIONS_TOTAL.value(format="gif", result="generated")
+
+    def first_request(_):
+        return RenditionService(storage).path_for(video_id, "gif")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        paths = set(pool.map(first_request, range(callers)))
+    elapsed = time.perf_counter() - start
+    assert len(paths) == 1, paths
+    encodes = RENDITIONS_TOTAL.value(format="gif", result="generated") - before
+    return {
+        "renditions.encodes_per_burst": metric(
+            encodes, "encodes", False, callers=callers, wall_ms=elapsed * 1000
+        )
+    }
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    video_id = _master(2 if quick else 6)
+    results = {}
+    results.update(bench_formats(video_id))
+    results.update(bench_coalescing(video_id))
+    return results
@@ -0,0 +1,230 @@
+"""
+Replays a recorded request trace (benchmarks/trace.jsonl, or the file named
+by BENCH_TRACE) against the full app on a real uvicorn server, with OpenAI,
+ElevenLabs and the OAuth providers replaced by local fake servers whose
+latency and error rate follow benchmarks/upstream_profiles.json (or
+BENCH_UPSTREAM_PROFILES). Reports throughput and p50/p95/p99 latency, overall
+and per route.
+
+One request per line: {"at": seconds after the start, "user": label,
+"method", "path", optional "json", "headers" and "auth": false}. Each label
+becomes a user of its own; "{user_id}", "{video_id}" (the user's latest
+video), "{email}" and "{password}" are filled in, in the path and in string
+values of the body. Requests are sent open-loop at their recorded time,
+divided by BENCH_TRACE_SPEED.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.common import latency_summary, metric
+from benchmarks.load import ServerThread
+
+
+TRACE_PATH = os.path.join(os.path.dirname(__file__), "trace.jsonl")
+PROFILES_PATH = os.path.join(os.path.dirname(__file__), "upstream_profiles.json")
+PASSWORD = "replay-password"
+
+
+def load_trace(path: Optional[str] = None) -> List[Dict]:
+    with open(path or os.environ.get("BENCH_TRACE") or TRACE_PATH) as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return sorted(entries, key=lambda entry: entry["at"])
+
+
+def load_profiles(path: Optional[str] = None) -> Dict:
+    from benchmarks.fakes import NetworkProfile
+
+    with open(path or os.environ.get("BENCH_UPSTREAM_PROFILES") or PROFILES_PATH) as f:
+        return {
+            name: NetworkProfile.from_dict(spec) for name, spec in json.load(f).items()
+        }
+
+
+class _ReplayUser:
+    def __init__(self, label: str, user_id: int, token: str, video_id: str):
+        self.label = label
+        self.user_id = user_id
+        self.token = token
+        self.email = f"replay-{label}@example.com"
+        # The latest video this user generated during the replay
+        self.video_id = video_id
+
+    def fill(self, value):
+        if isinstance(value, str):
+            return (
+                value.replace("{user_id}", str(self.user_id))
+                .replace("{video_id}", self.video_id)
+                .replace("{email}", self.email)
+                .replace("{password}", PASSWORD)
+            )
+        if isinstance(value, dict):
+            return {key: self.fill(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.fill(item) for item in value]
+        return value
+
+
+def _seed_users(labels: List[str]) -> Dict[str, _ReplayUser]:
+    """One user per trace label, each owning a completed video to download."""
+    from app.core.security import create_access_token, get_password_hash
+    from app.database.session import SessionLocal
+    from app.models.user import User
+    from app.models.video import GeneratedVideo
+    from benchmarks.fakes import make_video_service
+
+    service = make_video_service()
+    password_hash = get_password_hash(PASSWORD)
+    users = {}
+    db = SessionLocal()
+    try:
+        for label in labels:
+            email = f"replay-{label}@example.com"
+            user = db.query(User).filter(User.email == email).first()
+            if not user:
+                user = User(email=email, password_hash=password_hash)
+                db.add(user)
+                db.commit()
+                db.refresh(user)
+            # Downloads look the file up by video_id in storage
+            video_id = f"replay-seed-{label}"
+            rendered = service._create_simulated_video(
+                video_id=video_id,
+                prompt="A paper boat drifting down a rainy street",
+                duration=1,
+                width=320,
+                height=240,
+                fps=12,
+            )
+            if not db.query(GeneratedVideo).filter_by(video_id=video_id).first():
+                db.add(
+                    GeneratedVideo(
+                        video_id=video_id,
+                        user_id=user.id,
+                        prompt="A paper boat drifting down a rainy street",
+                        duration=1,
+                        resolution="320x240",
+                        fps=12,
+                        video_path=rendered,
+                        status="completed",
+                    )
+                )
+                db.commit()
+            users[label] = _ReplayUser(
+                label, user.id, create_access_token(data={"sub": email}), video_id
+            )
+    finally:
+        db.close()
+    return users
+
+
+async def _replay(
+    base_url: str, trace: List[Dict], users: Dict[str, _ReplayUser], speed: float
+) -> Tuple[Dict[str, List[Tuple[float, int]]], float]:
+    samples: Dict[str, List[Tuple[float, int]]] = {}
+
+    async def send(client, entry, scheduled):
+        user = users[entry["user"]]
+        headers = dict(entry.get("headers", {}))
+        if entry.get("auth", True):
+            headers["Authorization"] = f"Bearer {user.token}"
+        try:
+            response = await client.request(
+                entry["method"],
+                user.fill(entry["path"]),
+                json=user.fill(entry.get("json")),
+                headers=headers,
+            )
+            status = response.status_code
+            if status == 200 and entry["path"].endswith("/videos/generate"):
+                user.video_id = response.json()["video_id"]
+        except httpx.HTTPError:
+            status = 0
+        # From the scheduled time, so a server that falls behind is charged
+        # for the wait (no coordinated omission)
+        route = f"{entry['method']} {entry['path']}"
+        samples.setdefault(route, []).append((time.perf_counter() - scheduled, status))
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=64)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=300
+    ) as client:
+        start = time.perf_counter()
+        tasks = []
+        for entry in trace:
+            scheduled = start + entry["at"] / speed
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            tasks.append(asyncio.ensure_future(send(client, entry, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    return samples, elapsed
+
+
+def _errors(samples: List[Tuple[float, int]]) -> int:
+    return sum(1 for _, status in samples if not 200 <= status < 400)
+
+
+def _route_metrics(route: str, samples: List[Tuple[float, int]]) -> Dict[str, Dict]:
+    summary = latency_summary([latency for latency, _ in samples])
+    statuses = Counter(status for _, status in samples)
+    return {
+        f"replay.p99_ms[{route}]": metric(
+            summary["p99_ms"],
+            "ms",
+            False,
+            errors=_errors(samples),
+            # Status 0: the connection failed or timed out
+            statuses={str(status): count for status, count in statuses.items()},
+            **summary,
+        )
+    }
+
+
+def bench_trace(trace: List[Dict], profiles: Dict, speed: float) -> Dict[str, Dict]:
+    from app.main import app
+    from benchmarks.fakes import FakeUpstreams
+
+    with FakeUpstreams(profiles) as upstreams:
+        users = _seed_users(sorted({entry["user"] for entry in trace}))
+        with ServerThread(app) as server:
+            samples, elapsed = asyncio.run(
+                _replay(server.base_url, trace, users, speed)
+            )
+        upstream_stats = upstreams.stats()
+
+    every = [sample for route in samples.values() for sample in route]
+    summary = latency_summary([latency for latency, _ in every])
+    errors = _errors(every)
+    results = {
+        "replay.throughput": metric(
+            len(every) / elapsed,
+            "req/s",
+            True,
+            requests=len(every),
+            duration_s=elapsed,
+            speed=speed,
+            upstreams=upstream_stats,
+        )
+    }
+    for pct in ("p50", "p95", "p99"):
+        results[f"replay.{pct}_ms"] = metric(
+            summary[f"{pct}_ms"], "ms", False, errors=errors, **summary
+        )
+    for route, route_samples in sorted(samples.items()):
+        results.update(_route_metrics(route, route_samples))
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    trace = load_trace()
+    speed = float(os.environ.get("BENCH_TRACE_SPEED", "1.0"))
+    if quick:
+        # The first quarter of the trace, still at its recorded pace
+        trace = trace[: max(1, len(trace) // 4)]
+    return bench_trace(trace, load_profiles(), speed)
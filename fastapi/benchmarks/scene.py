@@ -0,0 +1,106 @@
+"""
+Scene engine throughput: each layer primitive on its own over an animated
+batch, then every preset as a whole.
+"""
+
+import time
+from typing import Callable, Dict, Sequence
+
+import numpy as np
+
+from benchmarks.common import metric
+
+
+PROMPT = "A slow cinematic dolly shot across a neon-lit harbour at dusk"
+
+
+def _primitives(width: int, height: int) -> Dict[str, Callable]:
+    from PIL import Image
+
+    from app.core.video_generation.scene import (
+        GradientLayer,
+        ImageLayer,
+        Keyframes,
+        ShapeLayer,
+        SolidLayer,
+        TextLayer,
+    )
+
+    sweep = Keyframes([(0.0, 0), (1.0, width // 2)])
+    logo = Image.new("RGBA", (width // 8, height // 8), (255, 80, 0, 160))
+    return {
+        "solid": lambda: SolidLayer(Keyframes([(0.0, (0, 0, 0)), (1.0, (255, 0, 0))])),
+        "gradient": lambda: GradientLayer(
+            start=(0, 0, 255), end=Keyframes([(0.0, (0, 0, 255)), (1.0, (255,) * 3)])
+        ),
+        "text": lambda: TextLayer(
+            PROMPT, y=height // 2, opacity=Keyframes([(0.0, 0.0), (1.0, 1.0)])
+        ),
+        "rect": lambda: ShapeLayer("rect", sweep, height // 4, width // 4, 40),
+        "ellipse": lambda: ShapeLayer(
+            "ellipse", sweep, height // 4, width // 4, height // 4
+        ),
+        "image": lambda: ImageLayer(logo, sweep, height // 8),
+    }
+
+
+def _throughput(render_batch: Callable, frames: np.ndarray, batches: int) -> float:
+    batch = len(frames)
+    progress = np.linspace(0.0, 1.0, batch * batches, endpoint=False)
+    render_batch(frames, progress[:batch])  # warm-up (lazy rasterisation)
+    start = time.perf_counter()
+    for i in range(batches):
+        render_batch(frames, progress[i * batch : (i + 1) * batch])
+    return batch * batches / (time.perf_counter() - start)
+
+
+def bench_primitives(
+    resolution: str = "1280x720", batch: int = 8, batches: int = 10
+) -> Dict[str, Dict]:
+    from app.core.video_generation.scene.layers import Viewport
+
+    width, height = map(int, resolution.split("x"))
+    frames = np.zeros((batch, height, width, 3), dtype=np.uint8)
+    # Full-frame viewport: the layer renders the whole canvas
+    viewport = Viewport(0, 0, width, height)
+    results = {}
+    for name, make_layer in _primitives(width, height).items():
+        layer = make_layer()
+        fps = _throughput(
+            lambda frames, progress: layer.render(frames, progress, viewport),
+            frames,
+            batches,
+        )
+        results[f"scene.layer_fps[{name}]"] = metric(
+            fps, "frames/s", True, resolution=resolution, batch=batch
+        )
+    return results
+
+
+def bench_presets(
+    resolutions: Sequence[str] = ("1280x720",), batch: int = 8, batches: int = 10
+) -> Dict[str, Dict]:
+    from app.core.video_generation.scene import PRESETS, build_scene
+
+    results = {}
+    for resolution in resolutions:
+        width, height = map(int, resolution.split("x"))
+        frames = np.zeros((batch, height, width, 3), dtype=np.uint8)
+        for style in PRESETS:
+            scene = build_scene(style, PROMPT, width, height)
+            fps = _throughput(scene.render_batch, frames, batches)
+            results[f"scene.preset_fps[{style}@{resolution}]"] = metric(
+                fps, "frames/s", True, batch=batch
+            )
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    results = {}
+    if quick:
+        results.update(bench_primitives("640x360", batches=3))
+        results.update(bench_presets(("640x360",), batches=3))
+    else:
+        results.update(bench_primitives())
+        results.update(bench_presets(("1280x720", "1920x1080")))
+    return results
@@ -0,0 +1,87 @@
+"""
+Serialization cost and payload size of a 10k-row video listing: FastAPI's
+default ORM path versus column rows through orjson, with gzip/brotli sizes.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from benchmarks.common import metric
+
+
+def _make_rows(count: int):
+    from app.models.video import GeneratedVideo
+
+    base = datetime(2026, 1, 1)
+    videos = []
+    for i in range(count):
+        videos.append(
+            GeneratedVideo(
+                id=i + 1,
+                video_id=f"{i:08x}-0000-4000-8000-000000000000",
+                user_id=1,
+                prompt=f"A cinematic shot of scene number {i} at golden hour",
+                duration=10,
+                resolution="1920x1080",
+                style="cinematic",
+                fps=30,
+                video_path=f"generated_videos/{i:08x}.mp4",
+                status="completed",
+                created_at=base + timedelta(seconds=i),
+                stage_timings={"enhance": 1.2, "render": 30.5, "encode": 12.1},
+            )
+        )
+    return videos
+
+
+def _timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(quick: bool = False, rows: int = 10_000) -> Dict[str, Dict]:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import ORJSONResponse
+    from app.api.v1.videos import VIDEO_LISTING_COLUMNS
+    from app.core.compression import brotli, compress
+
+    repeat = 2 if quick else 5
+    videos = _make_rows(rows)
+    column_rows: List[Dict] = [
+        {column.key: getattr(video, column.key) for column in VIDEO_LISTING_COLUMNS}
+        for video in videos
+    ]
+
+    def default_path():
+        # What FastAPI does for ORM objects without a response model
+        return json.dumps(jsonable_encoder(videos)).encode("utf-8")
+
+    def orjson_path():
+        return ORJSONResponse(column_rows).body
+
+    body = orjson_path()
+    results = {
+        f"serialize.default_ms[{rows}]": metric(
+            _timed(default_path, repeat) * 1000, "ms", False
+        ),
+        f"serialize.orjson_ms[{rows}]": metric(
+            _timed(orjson_path, repeat) * 1000, "ms", False
+        ),
+        f"serialize.bytes[{rows}]": metric(len(body), "bytes", False),
+    }
+
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    for encoding in encodings:
+        start = time.perf_counter()
+        compressed = compress(body, encoding)
+        elapsed = time.perf_counter() - start
+        results[f"serialize.{encoding}_bytes[{rows}]"] = metric(
+            len(compressed), "bytes", False, compress_ms=elapsed * 1000
+        )
+    return results
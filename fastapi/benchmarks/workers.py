@@ -0,0 +1,182 @@
+"""
+Multi-process render worker harness: throughput scaling with the number of
+workers and recovery after a worker is killed mid-render.
+
+Both scenarios run real worker processes against one database (SQLite by
+default, or BENCH_DATABASE_URL for a local Postgres where SKIP LOCKED applies).
+"""
+
+import multiprocessing
+import os
+import signal
+import time
+import uuid
+from typing import Dict, List
+
+from benchmarks.common import metric
+
+
+JOB = {
+    "prompt": "A lighthouse beam sweeping over a stormy sea",
+    "duration": 2,
+    "resolution": "320x240",
+    "fps": 12,
+}
+
+# Short leases so a killed worker's job is reclaimed within a few seconds
+WORKER_ENV = {
+    "WORKER_LEASE_SECONDS": "3",
+    "WORKER_HEARTBEAT_SECONDS": "1",
+    "WORKER_POLL_INTERVAL": "0.1",
+}
+
+
+def _worker_main(worker_id: str) -> None:
+    from app.core.video_generation.worker import RenderWorker
+    from benchmarks.fakes import make_video_service
+
+    RenderWorker(worker_id=worker_id, service_factory=make_video_service).run_forever()
+
+
+def _enqueue(count: int, **overrides) -> List[str]:
+    from app.database.session import SessionLocal
+    from app.models.schemas import VideoGenerationRequest
+    from app.services.render_queue import RenderQueueService
+
+    db = SessionLocal()
+    try:
+        queue = RenderQueueService(db)
+        request = VideoGenerationRequest(**{**JOB, **overrides})
+        return [
+            queue.enqueue(0, request, video_id=str(uuid.uuid4())).video_id
+            for _ in range(count)
+        ]
+    finally:
+        db.close()
+
+
+def _statuses(video_ids: List[str]) -> Dict[str, tuple]:
+    from app.database.session import SessionLocal
+    from app.models.video import GeneratedVideo
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(
+                GeneratedVideo.video_id,
+                GeneratedVideo.status,
+                GeneratedVideo.worker_id,
+                GeneratedVideo.attempts,
+            )
+            .filter(GeneratedVideo.video_id.in_(video_ids))
+            .all()
+        )
+        return {row.video_id: (row.status, row.worker_id, row.attempts) for row in rows}
+    finally:
+        db.close()
+
+
+def _wait_done(video_ids: List[str], timeout: float) -> Dict[str, tuple]:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        statuses = _statuses(video_ids)
+        if all(s[0] in ("completed", "failed") for s in statuses.values()):
+            return statuses
+        time.sleep(0.1)
+    raise TimeoutError("Render jobs did not finish in time")
+
+
+def _start_workers(count: int, prefix: str) -> List[multiprocessing.Process]:
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_main, args=(f"{prefix}-{i}",), daemon=True)
+        for i in range(count)
+    ]
+    for process in processes:
+        process.start()
+    return processes
+
+
+def _stop_workers(processes: List[multiprocessing.Process]) -> None:
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(timeout=10)
+
+
+def bench_scaling(worker_counts=(1, 2, 4), jobs: int = 8) -> Dict[str, Dict]:
+    results = {}
+    for count in worker_counts:
+        video_ids = _enqueue(jobs)
+        start = time.perf_counter()
+        processes = _start_workers(count, f"scale{count}")
+        try:
+            statuses = _wait_done(video_ids, timeout=600)
+        finally:
+            _stop_workers(processes)
+        elapsed = time.perf_counter() - start
+        failed = sum(1 for s in statuses.values() if s[0] != "completed")
+        results[f"workers.jobs_per_s[{count}]"] = metric(
+            jobs / elapsed, "jobs/s", True, jobs=jobs, failed=failed
+        )
+    return results
+
+
+def bench_kill_recovery(workers: int = 2, jobs: int = 4) -> Dict[str, Dict]:
+    # Longer jobs so the victim is reliably killed mid-render
+    video_ids = _enqueue(jobs, duration=6)
+    processes = _start_workers(workers, "recovery")
+    try:
+        victim_job = None
+        deadline = time.monotonic() + 60
+        while victim_job is None and time.monotonic() < deadline:
+            for video_id, (status, worker_id, _) in _statuses(video_ids).items():
+                if status == "processing" and worker_id == "recovery-0":
+                    victim_job = video_id
+                    break
+            time.sleep(0.05)
+        if victim_job is None:
+            raise RuntimeError("Worker recovery-0 never claimed a job")
+
+        os.kill(processes[0].pid, signal.SIGKILL)
+        killed_at = time.perf_counter()
+
+        # Keep the surviving workers running, wait for the orphan to complete
+        statuses = _wait_done(video_ids, timeout=600)
+        recovered_in = time.perf_counter() - killed_at
+    finally:
+        _stop_workers(processes)
+
+    status, worker_id, attempts = statuses[victim_job]
+    # A broken lease or reclaim path must fail the run, not just the metric
+    if status != "completed" or worker_id == "recovery-0":
+        raise RuntimeError(
+            f"Orphaned job {victim_job} was not recovered: "
+            f"status={status}, worker={worker_id}, attempts={attempts}"
+        )
+    unfinished = {
+        video_id: s[0] for video_id, s in statuses.items() if s[0] != "completed"
+    }
+    if unfinished:
+        raise RuntimeError(f"Jobs did not complete after the kill: {unfinished}")
+    return {
+        "workers.kill_recovery_s": metric(
+            recovered_in,
+            "s",
+            False,
+            recovered=True,
+            attempts=attempts,
+            all_completed=True,
+        )
+    }
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    os.environ.update(WORKER_ENV)
+    results = {}
+    results.update(
+        bench_scaling((1, 2) if quick else (1, 2, 4), jobs=4 if quick else 8)
+    )
+    results.update(bench_kill_recovery())
+    return results
@@ -0,0 +1,61 @@
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from app.database.session import SessionLocal
+from app.models.schemas import UserCreate
+from app.services.user_service import UserService
+
+
+logger = logging.getLogger("provision_users")
+
+
+def read_users(path: str) -> Iterator[UserCreate]:
+    """Accounts from a CSV (email,password header) or JSON lines file."""
+    with open(path, newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f)
+        for line, record in enumerate(records, start=1):
+            try:
+                yield UserCreate(email=record["email"], password=record["password"])
+            except (KeyError, ValidationError) as e:
+                logger.warning("Skipping record %d: %s", line, e)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-provision user accounts")
+    parser.add_argument("path", help="CSV (email,password) or .jsonl file")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Hashing threads")
+    parser.add_argument(
+        "--update-passwords",
+        action="store_true",
+        help="Overwrite the password of accounts that already exist",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        result = UserService(db).bulk_create_users(
+            read_users(args.path),
+            update_passwords=args.update_passwords,
+            chunk_size=args.chunk_size,
+            hash_workers=args.workers,
+        )
+    finally:
+        db.close()
+    print(
+        f"created={result.created} existing={result.existing} "
+        f"updated={result.updated} in {time.perf_counter() - start:.1f}s",
+        file=sys.stderr,
+    )
@@ -0,0 +1,20 @@
+import argparse
+import logging
+import signal
+import threading
+
+from app.services.retention import run_sweeper
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SlopEngine retention sweeper")
+    parser.add_argument(
+        "--once", action="store_true", help="Run a single sweep and exit (cron)"
+    )
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    logging.basicConfig(level=logging.INFO)
+    run_sweeper(stop, once=args.once)
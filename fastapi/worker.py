@@ -0,0 +1,76 @@
+import argparse
+import logging
+import multiprocessing
+import signal
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.core.metrics import registry
+from app.core.video_generation.autotune import WorkerPool
+from app.core.video_generation.worker import RenderWorker, default_worker_id
+
+
+def run_worker(worker_id: str) -> None:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    logging.basicConfig(level=logging.INFO)
+    RenderWorker(worker_id=worker_id).run_forever(stop)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port: int) -> None:
+    server = ThreadingHTTPServer(("", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SlopEngine render worker")
+    parser.add_argument(
+        "--processes", type=int, default=1, help="Worker processes on this node"
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        help="Size the pool from the queue, CPU load and memory (ignores --processes)",
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, default=None, help="Serve autotuner metrics"
+    )
+    parser.add_argument("--worker-id", default=None, help="Worker id prefix")
+    args = parser.parse_args()
+
+    prefix = args.worker_id or default_worker_id()
+    if args.autotune:
+        logging.basicConfig(level=logging.INFO)
+        if args.metrics_port:
+            serve_metrics(args.metrics_port)
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        signal.signal(signal.SIGINT, lambda *_: stop.set())
+        WorkerPool(run_worker, prefix).run(stop)
+    elif args.processes == 1:
+        run_worker(prefix)
+    else:
+        processes = [
+            multiprocessing.Process(target=run_worker, args=(f"{prefix}-{i}",))
+            for i in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        # Children receive SIGINT/SIGTERM themselves and drain their current job
+        signal.signal(signal.SIGTERM, lambda *_: [p.terminate() for p in processes])
+        for process in processes:
+            process.join()